@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('demo', '0002_formindexpage_customformsubmission_formpage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customformsubmission',
+            index=models.Index(fields=['page', 'submit_time', 'id'], name='demo_custom_page_id_46220f_idx'),
+        ),
+    ]
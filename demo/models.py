@@ -20,10 +20,11 @@ from wagtail.fields import RichTextField, StreamField
 from wagtail.models import GroupPagePermission, Page
 
 from wagtail_form_plugins import plugins
+from wagtail_form_plugins.outbox import QueuedEmailProvider
 from wagtail_form_plugins.plugins.emails.blocks import EmailsFormBlock, email_to_block
 from wagtail_form_plugins.plugins.emails.dicts import EmailsToSendBlockDict
 from wagtail_form_plugins.streamfield.plugin import WagtailFormPlugin
-from wagtail_form_plugins.utils import LocalBlocks, print_email
+from wagtail_form_plugins.utils import LocalBlocks, default_email_connection_provider, print_email
 
 from modelcluster.fields import ParentalManyToManyField
 from wagtailautocomplete.edit_handlers import AutocompletePanel
@@ -239,6 +240,12 @@ class CustomFormPage(*wfp.form_page_classes):
     token_validation_from_email = settings.FORMS_FROM_EMAIL
     token_validation_reply_to: ClassVar = [settings.FORMS_FROM_EMAIL]
     token_validation_expiration_delay = settings.FORMS_VALIDATION_EXPIRATION_DELAY
+    email_connection_provider = (
+        QueuedEmailProvider() if settings.FORMS_EMAIL_OUTBOX else default_email_connection_provider
+    )
+    index_submission_values = settings.FORMS_INDEX_SUBMISSION_VALUES
+    index_submission_text = settings.FORMS_INDEX_SUBMISSION_TEXT
+    collect_answer_statistics = settings.FORMS_COLLECT_ANSWER_STATISTICS
 
     def get_group_name(self) -> str:
         """Return the name of the form admin user group."""
@@ -250,19 +257,20 @@ class CustomFormPage(*wfp.form_page_classes):
         context["page"].outro = settings.FORMS_RGPD_TEXT.strip()
         return context
 
-    def send_action_email(self, email: EmailMultiAlternatives) -> None:
-        """Print the action e-mail instead sending it when debugging."""
+    def send_action_emails(self, emails: list[EmailMultiAlternatives]) -> None:
+        """Print the action e-mails instead sending them when debugging."""
         if settings.DEBUG and not settings.FORMS_DEV_SEND_MAIL:
-            print_email(email)
+            for email in emails:
+                print_email(email)
         else:
-            email.send()
+            super().send_action_emails(emails)
 
     def send_validation_email(self, email: EmailMultiAlternatives) -> None:
         """Print the validation e-mail instead sending it when debugging."""
         if settings.DEBUG and not settings.FORMS_DEV_SEND_MAIL:
             print_email(email)
         else:
-            email.send()
+            super().send_validation_email(email)
 
     def save(self, *args, **kwargs) -> None:
         """Save the form."""
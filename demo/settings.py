@@ -147,6 +147,10 @@ FORMS_FILE_UPLOAD_MAX_SIZE = 10 * 1024 * 1024
 FORMS_FILE_UPLOAD_AVAILABLE_EXTENSIONS = ["pdf", "jpg", "jpeg", "png"]
 FORMS_VALIDATION_EXPIRATION_DELAY = 60  # 1 hour
 FORMS_DEV_SEND_MAIL = False
+FORMS_EMAIL_OUTBOX = False  # store the emails, sent by the `send_queued_emails` command
+FORMS_INDEX_SUBMISSION_VALUES = True  # store typed values, to filter and sort the submissions
+FORMS_INDEX_SUBMISSION_TEXT = True  # index the text answers, to search the submissions
+FORMS_COLLECT_ANSWER_STATISTICS = True  # count the answers, to summarize them without exports
 FORMS_RGPD_TEXT = """
 Data collected in this form is stored by the IT team in order to process your request.
 """
@@ -0,0 +1,84 @@
+@django_db
+Feature: Clean forms in a single pass
+  Background:
+    Given the form index page exists
+      And a form named "Survey" exists
+      And the form "Survey" has the following fields
+        | type       | label  | slug   | required | rule    |
+        | email      | E-mail | email  | yes      |         |
+        | checkbox   | Minor  | minor  |          |         |
+        | singleline | School | school | yes      | minor c |
+
+  Scenario: Skip the validation of disabled fields
+     When I submit the form "Survey" with the following data
+        | slug   | value             |
+        | email  | alovelace@ex.com  |
+        | school |                   |
+     Then the form should be valid
+      And the field "email" should be cleaned 1 time
+      And the field "minor" should be cleaned 1 time
+      And the field "school" should be cleaned 0 times
+      And the field "school" should be set to none
+
+  Scenario: Clean enabled fields once
+     When I submit the form "Survey" with the following data
+        | slug   | value            |
+        | email  | alovelace@ex.com |
+        | minor  | on               |
+        | school |                  |
+     Then the form should have an error on "school"
+      And the field "email" should be cleaned 1 time
+      And the field "minor" should be cleaned 1 time
+      And the field "school" should be cleaned 1 time
+
+  Scenario: Report the errors of the fields used in rules
+    Given the form "Survey" has the following fields
+        | type       | label  | slug   | required | rule     |
+        | email      | E-mail | email  | yes      |          |
+        | checkbox   | Minor  | minor  |          |          |
+        | singleline | School | school | yes      | minor c  |
+        | singleline | Grade  | grade  |          | school c |
+     When I submit the form "Survey" with the following data
+        | slug   | value            |
+        | email  | alovelace@ex.com |
+        | minor  | on               |
+        | school |                  |
+        | grade  | A                |
+     Then the form should have an error on "school"
+      And the field "school" should be cleaned 1 time
+      And the field "grade" should be cleaned 0 times
+
+  Scenario: Report the errors of invalid values used in rules
+    Given the form "Survey" has the following fields
+        | type       | label  | slug   | required | rule      |
+        | number     | Age    | age    | yes      |           |
+        | singleline | School | school |          | age lt 18 |
+     When I submit the form "Survey" with the following data
+        | slug   | value    |
+        | age    | twelve   |
+        | school | Lovelace |
+     Then the form should have an error on "age"
+      And the field "age" should be cleaned 1 time
+      And the field "school" should be cleaned 0 times
+
+  Scenario Outline: Compare typed values in rules
+    Given the form "Survey" has the following fields
+        | type       | label    | slug     | required | rule                    |
+        | number     | Age      | age      |          |                         |
+        | date       | Birthday | birthday |          |                         |
+        | singleline | School   | school   | yes      | age lt 18               |
+        | singleline | Work     | work     | yes      | birthday bt 2000-01-01  |
+     When I submit the form "Survey" with the following data
+        | slug     | value      |
+        | age      | <age>      |
+        | birthday | <birthday> |
+        | school   |            |
+        | work     |            |
+     Then the field "school" should be cleaned <school> times
+      And the field "work" should be cleaned <work> times
+
+    Examples:
+        | age | birthday   | school | work |
+        | 12  | 2012-05-01 | 1      | 0    |
+        | 42  | 1982-05-01 | 0      | 1    |
+        |     |            | 0      | 0    |
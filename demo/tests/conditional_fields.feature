@@ -0,0 +1,124 @@
+@django_db
+Feature: Evaluate conditional fields with a dependency graph
+  Background:
+    Given the form index page exists
+      And a form named "Survey" exists
+      And the form "Survey" has the following fields
+        | type       | label  | slug   | required | rule     |
+        | singleline | Grade  | grade  | yes      | school c |
+        | checkbox   | Minor  | minor  |          |          |
+        | singleline | School | school |          | minor c  |
+
+  Scenario: Disable the fields depending on a disabled field
+     When I submit the form "Survey" with the following data
+        | slug   | value |
+        | school | MIT   |
+        | grade  |       |
+     Then the form should be valid
+      And the field "school" should be set to none
+      And the field "grade" should be cleaned 0 times
+
+  Scenario: Evaluate fields depending on a field declared after them
+     When I submit the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school | MIT   |
+        | grade  |       |
+     Then the form should have an error on "grade"
+
+  Scenario: Re-evaluate only the fields affected by a change
+     Then updating the enabled fields of the form "Survey" after a change on "minor" should match a full computation
+        | slug   | old value | new value |
+        | minor  | true      | false     |
+        | school | MIT       | MIT       |
+        | grade  | A         | A         |
+
+  Scenario: Accept rules without cycles
+     When I validate the following form fields
+        | type       | label  | slug   | rule     |
+        | singleline | Grade  | grade  | school c |
+        | checkbox   | Minor  | minor  |          |
+        | singleline | School | school | minor c  |
+     Then the form fields should be valid
+
+  Scenario: Reject rules forming a cycle
+     When I validate the following form fields
+        | type       | label  | slug   | rule     |
+        | singleline | Grade  | grade  | school c |
+        | checkbox   | Minor  | minor  |          |
+        | singleline | School | school | grade c  |
+     Then the field n°1 should have a "rule_cycle" error
+      And the field n°3 should have a "rule_cycle" error
+      And the field n°2 should not have errors
+
+  Scenario: Reject rules referring to a removed field
+     When I validate the following form fields
+        | type       | label  | slug   | rule      |
+        | checkbox   | Minor  | minor  |           |
+        | singleline | School | school | removed c |
+     Then the field n°2 should have a "unknown_field" error
+
+  Scenario: Validate a field and update its dependent fields
+    Given I am logged in as alovelace
+     When I validate the fields "school" of the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school |       |
+        | grade  |       |
+     Then the field "school" should not have validation errors
+      And the dependent field "grade" should be disabled
+
+  Scenario: Update only the fields affected by the validated fields
+    Given I am logged in as alovelace
+     When I validate the fields "school" after "minor,school,grade" were enabled of the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school |       |
+        | grade  | A     |
+     Then the field "school" should not have validation errors
+      And the dependent field "grade" should be disabled
+      And only the rules of the fields "school,grade" should have been evaluated
+
+  Scenario: Validate several fields
+    Given I am logged in as alovelace
+     When I validate the fields "school,grade" of the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school | MIT   |
+        | grade  |       |
+     Then the field "school" should not have validation errors
+      And the field "grade" should have a validation error
+      And the dependent field "grade" should be enabled
+
+  Scenario: Validate the fields of a public form with a validation token
+    Given I have a validation token for the form "Survey"
+     When I validate the fields "school" of the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school | MIT   |
+     Then the fields validation should be served
+
+  Scenario: Deny the fields validation of a public form without validation token
+     When I validate the fields "school" of the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school | MIT   |
+     Then the fields validation should be denied
+
+  Scenario: Deny the fields validation of a form already filled in
+    Given I am logged in as alovelace
+      And the form "Survey" accepts a single response per user
+     When I validate the fields "school" of the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school | MIT   |
+     Then the fields validation should be denied
+
+  Scenario: Apply the view restrictions of the page to the fields validation
+    Given the form "Survey" is restricted to logged in users
+      And I have a validation token for the form "Survey"
+     When I validate the fields "school" of the form "Survey" with the following data
+        | slug   | value |
+        | minor  | on    |
+        | school | MIT   |
+     Then the fields validation should be redirected to the login page
@@ -0,0 +1,41 @@
+@django_db
+Feature: Gather the form notifications in digests
+  Background:
+    Given the form index page exists
+      And a form named "Event Registration" exists
+      And the form "Event Registration" is created by the user admin (admin@example.com)
+
+  Scenario: Send a digest every N submissions
+    Given the author notification of "Event Registration" is sent in a digest every 2 submissions
+      And I am logged in as alovelace
+
+     When I visit "/forms/event-registration"
+      And I validate the form
+     Then I should receive at alovelace@example.com a confirmation email from noreply@example.com about the form "Event Registration"
+      And 1 submission should wait for a digest
+
+     When I send the due digests
+     Then I should have 0 email in my mailbox
+
+    Given I am logged in as cbabbage
+     When I visit "/forms/event-registration"
+      And I validate the form
+     Then I should receive at cbabbage@example.com a confirmation email from noreply@example.com about the form "Event Registration"
+
+     When I send the due digests
+     Then the form admin (admin@example.com) should receive a digest of 2 submissions about the form "Event Registration"
+      And 0 submission should wait for a digest
+
+  Scenario: Send a digest every N minutes
+    Given the author notification of "Event Registration" is sent in a digest every 10 minutes
+      And I am logged in as alovelace
+
+     When I visit "/forms/event-registration"
+      And I validate the form
+      And I send the due digests
+     Then I should receive at alovelace@example.com a confirmation email from noreply@example.com about the form "Event Registration"
+      And I should have 0 email in my mailbox
+
+     When 10 minutes have passed since the first submission
+      And I send the due digests
+     Then the form admin (admin@example.com) should receive a digest of 1 submission about the form "Event Registration"
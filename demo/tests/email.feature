@@ -9,3 +9,66 @@ Feature: Use form validation
      Then I should receive an email
       And I should receive an email
      Then I should have 0 email in my mailbox
+
+  Scenario: Send a batch of emails through a single connection
+    Given I count the email connections
+     When I send 3 test emails at once
+     Then I should have 3 emails in my mailbox
+      And 1 email connection should have been opened
+
+  Scenario: Reuse pooled email connections
+    Given I count the email connections
+     When I send 2 test emails at once through a pooled connection
+      And I send 2 test emails at once through a pooled connection
+     Then I should have 4 emails in my mailbox
+      And 1 email connection should have been opened
+
+  Scenario: Send the queued emails in a single connection
+    Given I count the email connections
+     When I queue 3 test emails in the outbox
+     Then I should have 0 email in my mailbox
+      And 3 queued emails should be pending
+
+     When I run the outbox worker
+     Then I should have 3 emails in my mailbox
+      And 3 queued emails should be sent
+      And 1 email connection should have been opened
+
+  Scenario: Keep the pooled connection when an email is refused
+    Given I count the email connections
+     When I queue 2 test emails in the outbox
+      And I run the outbox worker with a failing email backend through a pooled connection
+     Then 2 queued emails should be pending
+      And 1 email connection should be kept in the pool
+      And 1 email connection should have been opened
+
+  Scenario: Discard the pooled connection when it is lost
+    Given I count the email connections
+     When I queue 2 test emails in the outbox
+      And I run the outbox worker with a disconnected email backend through a pooled connection
+     Then 2 queued emails should be pending
+      And 0 email connection should be kept in the pool
+
+     When the queued emails are due
+      And I run the outbox worker through a pooled connection
+     Then 2 queued emails should be sent
+      And 2 email connections should have been opened
+
+  Scenario: Retry the queued emails that could not be sent
+     When I queue 2 test emails in the outbox
+      And I run the outbox worker with a failing email backend
+     Then I should have 0 email in my mailbox
+      And 2 queued emails should be pending
+      And the next attempt of the queued emails should be in 60 seconds
+
+     When I run the outbox worker
+     Then I should have 0 email in my mailbox
+
+     When the queued emails are due
+      And I run the outbox worker with a failing email backend
+     Then 2 queued emails should be pending
+      And the next attempt of the queued emails should be in 120 seconds
+
+     When the queued emails are due
+      And I run the outbox worker with a failing email backend
+     Then 2 queued emails should be failed
@@ -0,0 +1,25 @@
+Feature: Convert urls and email addresses into links
+
+  Scenario: Create links
+    Then the links should be created as follows
+        | text                                 | result                                                                                          |
+        | see https://example.com/page.        | see <a href="https://example.com/page">https://example.com/page</a>.                            |
+        | (see http://example.com/a_(b))       | (see <a href="http://example.com/a_%28b%29">http://example.com/a_(b)</a>)                       |
+        | write to john.doe@example.org!       | write to <a href="mailto:john.doe@example.org">john.doe@example.org</a>!                        |
+        | a@b, foo@@bar, http://localhost/     | a@b, foo@@bar, http://localhost/                                                                |
+        | &lt;b&gt; no link                    | &lt;b&gt; no link                                                                               |
+
+  Scenario Outline: Scan adversarial texts in linear time
+    Then creating links in "<pattern>" repeated <amount> times should take less than 0.5 seconds
+
+    Examples:
+        | pattern    | amount |
+        | a.         | 50000  |
+        | a          | 100000 |
+        | http://a   | 20000  |
+        | https://a% | 20000  |
+        | a@         | 50000  |
+        | x@y.       | 50000  |
+
+  Scenario: Leave the long texts as is
+    Then creating links in "http://example.com " repeated 10000 times should not create any link
@@ -0,0 +1,273 @@
+@django_db
+Feature: Format the form results
+  Background:
+    Given the form index page exists
+      And a form named "Survey" exists
+      And the form "Survey" has the following fields
+        | type       | label     | slug  | choices  |
+        | singleline | Name      | name  |          |
+        | number     | Age       | age   |          |
+        | dropdown   | Color     | color | Red,Blue |
+        | checkboxes | Languages | langs | Fr,En,De |
+        | checkbox   | Agree     | agree |          |
+        | date       | Birth     | birth |          |
+        | label      | Notes     | notes |          |
+      And the form "Survey" has the following submissions
+        | name      | age | color | langs | agree | birth      |
+        | Ada       | 36  | c1    | c1,c3 | yes   | 1815-12-10 |
+        | Charles   | 79  | c2    |       |       |            |
+      And I am logged in as admin with all permissions
+
+  Scenario: Export the results with a formatter per column
+     When I export the results of the form "Survey" as csv
+     Then the exported results should contain the following rows
+        | name    | age | color | langs      | agree | birth      |
+        | Ada     | 36  | Red   | • Fr • De  | ✔     | 10/12/1815 |
+        | Charles | 79  | Blue  | -          | ✘     | -          |
+      And the column formatters should have been built once
+      And the exported results should not have a "Notes" column
+      And the submissions should have been exported by chunks of 2000
+
+  Scenario: Stream the results as xlsx
+     When I export the results of the form "Survey" as xlsx
+     Then the exported results should contain the following rows
+        | name    | age | color | langs      | agree | birth      |
+        | Ada     | 36  | Red   | • Fr • De  | ✔     | 10/12/1815 |
+        | Charles | 79  | Blue  | -          | ✘     | -          |
+      And the exported results should not have a "Notes" column
+      And the submissions should have been exported by chunks of 2000
+
+  Scenario: Export the results as typed columns
+     When I export the results of the form "Survey" as parquet
+     Then the exported columns should have the following types
+        | slug        | type                                                |
+        | submit_time | timestamp[us, tz=UTC]                               |
+        | name        | string                                              |
+        | age         | double                                              |
+        | color       | dictionary<values=string, indices=int32, ordered=0> |
+        | langs       | list<element: string>                               |
+        | agree       | bool                                                |
+        | birth       | date32[day]                                         |
+      And the exported column "age" should contain [36.0, 79.0]
+      And the exported column "color" should contain ['Red', 'Blue']
+      And the exported column "langs" should contain [['Fr', 'De'], []]
+      And the exported column "agree" should contain [True, False]
+      And the exported column "birth" should contain [datetime.date(1815, 12, 10), None]
+      And the exported results should not have a "Notes" column
+      And the submissions should have been exported by chunks of 2000
+
+  Scenario: Display the results table in a single pass
+     When I visit the results of the form "Survey"
+     Then the results table should have the columns "Name, Age, Color, Languages, Agree, Birth, Edit"
+      And the results table should have 2 rows with an edit link
+
+  Scenario: Share the field value formatters between requests
+     Then the field value formatters of "Survey" should be shared between requests
+
+  Scenario: Browse the results table pages with cursors
+    Given the form "Survey" has 45 more submissions, half at the same time
+     When I browse the result pages of the form "Survey" forth and back
+     Then I should have seen 47 distinct submissions on 3 pages
+      And the same pages should have been seen when browsing back
+      And the result pages should have been fetched without offset
+
+  Scenario Outline: Filter and sort the results with the submission values
+    Given the submission values of the form "Survey" are indexed
+     Then the results of "Survey" filtered with "<query>" are "<names>"
+
+    Examples:
+      | query                                | names        |
+      | value.color=Blue                     | Charles      |
+      | value.color=c1                       | Ada          |
+      | value.langs=Fr&value.age__gte=30     | Ada          |
+      | value.age__gt=40                     | Charles      |
+      | value.birth__gt=1815-12-09           | Ada          |
+      | value.agree=no                       | Charles      |
+      | value.name__icontains=char           | Charles      |
+      | value.color=Green                    |              |
+      | value.age__gt=old                    |              |
+      | order_by=age                         | Ada, Charles |
+      | order_by=-age                        | Charles, Ada |
+      | order_by=color&value.age__lt=100     | Ada, Charles |
+
+  Scenario: Keep the submission values in sync with the submissions
+     When I process a submission of the form "Survey" with the following data
+        | slug  | value      |
+        | name  | Grace      |
+        | age   | 85         |
+        | color | c2         |
+        | langs | c2         |
+        | birth | 1906-12-09 |
+     Then the results of "Survey" filtered with "value.langs=En" are "Grace"
+     When I edit the submission of "Grace" in "Survey" with the following data
+        | slug  | value      |
+        | name  | Grace      |
+        | age   | 85         |
+        | color | c1         |
+        | langs | c1         |
+        | birth | 1906-12-09 |
+     Then the results of "Survey" filtered with "value.langs=En" are ""
+      And the results of "Survey" filtered with "value.langs=Fr&value.color=Red" are "Grace"
+     When I delete the submission of "Grace" in "Survey"
+     Then the deleted submission should not have values anymore
+
+  Scenario Outline: Search the results in the text answers
+    Given the submission texts of the form "Survey" are indexed
+     Then the results of "Survey" filtered with "<query>" are "<names>"
+
+    Examples:
+      | query                      | names   |
+      | q=ada                      | Ada     |
+      | q=CHARLES                  | Charles |
+      | q=ada charles              |         |
+      | q=ada&value.age__gt=40     |         |
+      | q=char                     |         |
+      | q="ada                     | Ada     |
+      | q=Blue                     |         |
+
+  Scenario: Keep the search index in sync with the submissions
+     When I process a submission of the form "Survey" with the following data
+        | slug  | value        |
+        | name  | Grace Hopper |
+        | age   | 85           |
+        | color | c2           |
+        | langs | c2           |
+     Then the results of "Survey" filtered with "q=hopper" are "Grace Hopper"
+     When I edit the submission of "Grace Hopper" in "Survey" with the following data
+        | slug  | value        |
+        | name  | Grace Murray |
+        | age   | 85           |
+        | color | c2           |
+        | langs | c2           |
+     Then the results of "Survey" filtered with "q=hopper" are ""
+      And the results of "Survey" filtered with "q=murray" are "Grace Murray"
+     When I delete the submission of "Grace Murray" in "Survey"
+     Then the deleted submission should not be searchable anymore
+
+  Scenario: Read the answer statistics without the submissions
+    Given the answer statistics of the form "Survey" are counted
+     Then the answer statistics of "Survey" should be read in 1 queries
+        | slug        | statistics               |
+        | submissions | 2                        |
+        | age         | 115 36 79 57.5           |
+        | color       | Red: 1, Blue: 1          |
+        | langs       | Fr: 1, En: 0, De: 1      |
+        | agree       | Oui: 1, Non: 1            |
+      And the answer statistics page of "Survey" should show "2 submissions"
+
+  Scenario: Keep the answer statistics in sync with the submissions
+    Given the answer statistics of the form "Survey" are counted
+     When I process a submission of the form "Survey" with the following data
+        | slug  | value |
+        | name  | Grace |
+        | age   | 85    |
+        | color | c2    |
+        | langs | c2    |
+     Then the answer statistics of "Survey" should be read in 1 queries
+        | slug        | statistics               |
+        | submissions | 3                        |
+        | age         | 200 36 85 66.6667        |
+        | color       | Red: 1, Blue: 2          |
+        | langs       | Fr: 1, En: 1, De: 1      |
+        | agree       | Oui: 1, Non: 2            |
+     When I edit the submission of "Grace" in "Survey" with the following data
+        | slug  | value |
+        | name  | Grace |
+        | age   | 20    |
+        | color | c1    |
+        | langs | c1    |
+     Then the answer statistics of "Survey" should be read in 1 queries
+        | slug        | statistics               |
+        | submissions | 3                        |
+        | age         | 135 20 79 45             |
+        | color       | Red: 2, Blue: 1          |
+        | langs       | Fr: 2, En: 0, De: 1      |
+     When I delete the submission of "Ada" in "Survey"
+     Then the answer statistics of "Survey" should be read in 1 queries
+        | slug        | statistics               |
+        | submissions | 2                        |
+        | age         | 99 20 79 49.5            |
+        | color       | Red: 1, Blue: 1          |
+        | langs       | Fr: 1, En: 0, De: 0      |
+        | agree       | Oui: 0, Non: 2            |
+
+  Scenario: Update the answer statistics once when deleting submissions at once
+    Given the answer statistics of the form "Survey" are counted
+     When I process a submission of the form "Survey" with the following data
+        | slug  | value |
+        | name  | Grace |
+        | age   | 85    |
+        | color | c2    |
+     When I process a submission of the form "Survey" with the following data
+        | slug  | value |
+        | name  | Alan  |
+        | age   | 20    |
+        | color | c1    |
+     When I delete the submissions of "Ada", "Grace", "Alan" in "Survey" at once
+     Then the submissions should have been read 2 times during the deletion
+      And the answer statistics of "Survey" should be read in 1 queries
+        | slug        | statistics               |
+        | submissions | 1                        |
+        | age         | 79 79 79 79              |
+        | color       | Red: 0, Blue: 1          |
+        | langs       | Fr: 0, En: 0, De: 0      |
+
+  Scenario: Delete the answer statistics with their form
+    Given the answer statistics of the form "Survey" are counted
+     When I delete the form "Survey"
+     Then the deleted form should not have answer statistics anymore
+
+  Scenario Outline: Compute the analytics of the number and date answers with the <backend> backend
+    Given the analytics are computed with the <backend> backend
+     When I load the analytics of "Survey" without cache
+     Then the submission columns should have been read 1 time
+      And the submission columns should be cached in the configured directory
+      And the analytics should contain the following values
+        | path                            | value                      |
+        | fields.age.count                | 2                          |
+        | fields.age.minimum              | 36.0                       |
+        | fields.age.maximum              | 79.0                       |
+        | fields.age.mean                 | 57.5                       |
+        | fields.age.percentiles.10       | 40.3                       |
+        | fields.age.percentiles.50       | 57.5                       |
+        | fields.age.histogram.counts     | [1, 0, 0, 0, 0, 0, 0, 0, 0, 1] |
+        | fields.birth.count              | 1                          |
+        | fields.birth.percentiles.90     | 1815-12-10                 |
+        | fields.birth.series             | {'1815-12-10': 1}          |
+     When I load the analytics of "Survey"
+     Then the submission columns should have been read 0 times
+     When I process a submission of the form "Survey" with the following data
+        | slug  | value      |
+        | name  | Grace      |
+        | age   | 85         |
+        | color | c2         |
+        | birth | 1906-12-09 |
+      And I load the analytics of "Survey"
+     Then the submission columns should have been read 1 time
+      And the analytics should contain the following values
+        | path                            | value                      |
+        | fields.age.count                | 3                          |
+        | fields.age.percentiles.50       | 79.0                       |
+        | fields.birth.minimum            | 1815-12-10                 |
+        | fields.birth.maximum            | 1906-12-09                 |
+     When I edit the submission of "Grace" in "Survey" with the following data
+        | slug  | value      |
+        | name  | Grace      |
+        | age   | 20         |
+        | color | c2         |
+        | birth | 1906-12-09 |
+      And I load the analytics of "Survey"
+     Then the analytics should contain the following values
+        | path                            | value                      |
+        | fields.age.minimum              | 20.0                       |
+        | fields.age.percentiles.50       | 36.0                       |
+
+    Examples:
+        | backend |
+        | array   |
+        | numpy   |
+
+  Scenario: Render the results table without a query per row
+     Then the results of "Survey" should be rendered in 13 queries with 2 rows
+    Given the form "Survey" has 40 more submissions from distinct users
+     Then the results of "Survey" should be rendered in 13 queries with 20 rows
@@ -0,0 +1,33 @@
+@django_db
+Feature: Share the form schema between requests
+  Background:
+    Given the form index page exists
+      And a form named "Survey" exists
+      And the form "Survey" has the following fields
+        | type       | label      | slug       |
+        | singleline | First name | first_name |
+        | number     | Age        | age        |
+      And I am logged in as alovelace
+
+  Scenario: Cache the form schema of a published form
+     When I visit "/forms/survey"
+     Then I should see the form page "Survey"
+      And the form schema of "Survey" should be cached
+      And the form schema of "Survey" should have 2 fields
+
+  Scenario: Invalidate the form schema when the form is published
+     When I visit "/forms/survey"
+      And I publish the form "Survey"
+     Then the form schema of "Survey" should not be cached
+
+  Scenario: Memoize the enabled fields during a request
+     Then the enabled fields of "Survey" should be computed once per request
+
+  Scenario: Share the form class between requests
+     When I visit "/forms/survey"
+     Then the form class of "Survey" should be shared between requests
+
+  Scenario: Share the email render plans between requests
+     When I visit "/forms/survey"
+     Then the email render plans of "Survey" should be shared between requests
+      And the email render plans of "Survey" should have 2 text messages without html
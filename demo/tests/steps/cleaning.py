@@ -0,0 +1,45 @@
+"""Step definitions related to form cleaning."""
+
+# ruff: noqa: D103, ANN201, PT009
+from django.contrib.auth.models import AnonymousUser
+from django.http import QueryDict
+
+from demo.models import FormPage
+from demo.tests.environment import Context
+
+from behave import then, use_step_matcher, when
+
+use_step_matcher("re")
+
+
+@when(r'I submit the form "(?P<form_title>.+?)" with the following data')
+def submit_form(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    data = QueryDict(mutable=True)
+    for row in context.table:
+        data.appendlist(row["slug"], row["value"])
+
+    context.form = form_page.get_form(data, page=form_page, user=AnonymousUser())
+    context.form_is_valid = context.form.is_valid()
+    context.test.assertEqual(context.form.is_valid(), context.form_is_valid)
+
+
+@then(r"the form should be valid")
+def check_form_valid(context: Context):
+    context.test.assertTrue(context.form_is_valid, context.form.errors.as_text())
+
+
+@then(r'the form should have an error on "(?P<slug>\w+)"')
+def check_form_error(context: Context, slug: str):
+    context.test.assertFalse(context.form_is_valid)
+    context.test.assertIn(slug, context.form.errors)
+
+
+@then(r'the field "(?P<slug>\w+)" should be cleaned (?P<amount>\d+) times?')
+def check_field_cleaned(context: Context, slug: str, amount: str):
+    context.test.assertEqual(context.form.clean_counter[slug], int(amount))
+
+
+@then(r'the field "(?P<slug>\w+)" should be set to none')
+def check_field_none(context: Context, slug: str):
+    context.test.assertIsNone(context.form.cleaned_data[slug])
@@ -0,0 +1,148 @@
+"""Step definitions related to the conditional fields plugin."""
+
+# ruff: noqa: D103, ANN201, PT009
+from collections.abc import Iterable
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import patch
+
+from wagtail.blocks import StreamBlockValidationError
+from wagtail.models import PageViewRestriction
+
+from demo.models import FormPage
+from demo.tests.environment import Context
+from demo.tests.steps.form import build_form_fields_data
+from demo.tests.steps.page import BASE_URL
+from wagtail_form_plugins.plugins.token_validation.models import ValidationToken
+
+from behave import given, then, use_step_matcher, when
+
+use_step_matcher("re")
+
+
+def parse_value(value: str) -> Any:  # noqa: ANN401
+    return {"true": True, "false": False, "": None}.get(value, value)
+
+
+@when(r"I validate the following form fields")
+def validate_form_fields(context: Context):
+    stream_block = FormPage.form_fields.field.stream_block
+    stream_value = stream_block.to_python(build_form_fields_data(context.table))
+    context.validation_error = None
+    try:
+        stream_block.clean(stream_value)
+    except StreamBlockValidationError as err:
+        context.validation_error = err
+
+
+@then(r"the form fields should be valid")
+def check_form_fields_valid(context: Context):
+    context.test.assertIsNone(context.validation_error)
+
+
+@then(r'the field n°(?P<number>\d+) should have a "(?P<code>\w+)" error')
+def check_form_field_error(context: Context, number: str, code: str):
+    context.test.assertIsNotNone(context.validation_error)
+    error = context.validation_error.block_errors.get(int(number) - 1)
+    context.test.assertIsNotNone(error)
+    context.test.assertEqual(error.code, code)
+
+
+@then(r"the field n°(?P<number>\d+) should not have errors")
+def check_form_field_no_error(context: Context, number: str):
+    context.test.assertNotIn(int(number) - 1, context.validation_error.block_errors)
+
+
+@then(
+    r'updating the enabled fields of the form "(?P<form_title>.+?)" after a change on '
+    r'"(?P<slug>\w+)" should match a full computation'
+)
+def check_update_enabled_fields(context: Context, form_title: str, slug: str):
+    form_page = FormPage.objects.get(title=form_title)
+    old_data = {row["slug"]: parse_value(row["old value"]) for row in context.table}
+    new_data = {row["slug"]: parse_value(row["new value"]) for row in context.table}
+
+    old_enabled_fields = form_page.compute_enabled_fields(old_data)
+    updated_enabled_fields = form_page.update_enabled_fields(new_data, old_enabled_fields, [slug])
+    context.test.assertEqual(updated_enabled_fields, form_page.compute_enabled_fields(new_data))
+    context.test.assertNotEqual(updated_enabled_fields, old_enabled_fields)
+
+
+@when(
+    r'I validate the fields "(?P<slugs>[\w,]+)"(?: after "(?P<enabled>[\w,]+)" were enabled)? '
+    r'of the form "(?P<form_title>.+?)" with the following data'
+)
+def validate_fields(context: Context, slugs: str, form_title: str, enabled: str | None = None):
+    form_page = FormPage.objects.get(title=form_title)
+    data = {row["slug"]: row["value"] for row in context.table}
+    if token_value := getattr(context, "token_value", None):
+        data["wfp_token"] = token_value
+    url = f"{BASE_URL}{form_page.url}?validate={slugs}"
+    if enabled:
+        url += f"&enabled={enabled}"
+
+    evaluated_rules = []
+    evaluate_rules = FormPage.evaluate_rules
+
+    def recording_evaluate_rules(
+        page: FormPage, form_data: dict, enabled_fields: set, field_slugs: Iterable[str]
+    ) -> None:
+        field_slugs = list(field_slugs)
+        evaluated_rules.extend(field_slugs)
+        evaluate_rules(page, form_data, enabled_fields, field_slugs)
+
+    with patch.object(FormPage, "evaluate_rules", recording_evaluate_rules):
+        context.response = context.test.client.post(url, data)
+    context.evaluated_rules = evaluated_rules
+    if context.response.status_code == HTTPStatus.OK:
+        context.validation = context.response.json()
+
+
+@given(r'I have a validation token for the form "(?P<form_title>.+?)"')
+def create_validation_token(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    context.token_value = ValidationToken.create(form_page, "grace@example.com")
+
+
+@given(r'the form "(?P<form_title>.+?)" accepts a single response per user')
+def set_unique_response(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    form_page.unique_response = True
+    form_page.save_revision().publish()
+    form_page.get_submission_class().objects.create(page=form_page, form_data={}, user=context.user)
+
+
+@given(r'the form "(?P<form_title>.+?)" is restricted to logged in users')
+def restrict_form(_context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    PageViewRestriction.objects.create(page=form_page, restriction_type=PageViewRestriction.LOGIN)
+
+
+@then(r"the fields validation should be (?P<state>served|denied|redirected to the login page)")
+def check_validation_status(context: Context, state: str):
+    status_codes = {
+        "served": HTTPStatus.OK,
+        "denied": HTTPStatus.FORBIDDEN,
+        "redirected to the login page": HTTPStatus.FOUND,
+    }
+    context.test.assertEqual(context.response.status_code, status_codes[state])
+
+
+@then(r'the field "(?P<slug>\w+)" should have a validation error')
+def check_validation_error(context: Context, slug: str):
+    context.test.assertIn(slug, context.validation["errors"])
+
+
+@then(r'the field "(?P<slug>\w+)" should not have validation errors')
+def check_no_validation_error(context: Context, slug: str):
+    context.test.assertNotIn(slug, context.validation["errors"])
+
+
+@then(r'the dependent field "(?P<slug>\w+)" should be (?P<state>enabled|disabled)')
+def check_dependent_field(context: Context, slug: str, state: str):
+    context.test.assertIn(slug, context.validation[f"{state}_fields"])
+
+
+@then(r'only the rules of the fields "(?P<slugs>[\w,]+)" should have been evaluated')
+def check_evaluated_rules(context: Context, slugs: str):
+    context.test.assertEqual(set(context.evaluated_rules), set(slugs.split(",")))
@@ -3,19 +3,51 @@
 # ruff: noqa: D103, ANN201, PT009
 import logging
 import re
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException, SMTPServerDisconnected
 
 from django.core import mail
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
 
+from demo.models import CustomFormPage, FormPage
 from demo.tests.environment import Context
+from wagtail_form_plugins.outbox import OutboxWorker, QueuedEmail, QueuedEmailProvider
+from wagtail_form_plugins.plugins.emails import DigestEntry
+from wagtail_form_plugins.utils import (
+    EmailConnectionProvider,
+    PooledEmailConnectionProvider,
+    default_email_connection_provider,
+)
 
-from behave import then, use_step_matcher, when
+from behave import given, then, use_step_matcher, when
 
 use_step_matcher("re")
 
 LOGGER = logging.getLogger(__name__)
 
 
+class FailingEmailBackend(BaseEmailBackend):
+    """An email backend that can not send any email."""
+
+    def send_messages(self, _email_messages: list[EmailMessage]) -> int:
+        """Fail to send the emails."""
+        msg = "the mail server is not available"
+        raise SMTPException(msg)
+
+
+class DisconnectedEmailBackend(BaseEmailBackend):
+    """An email backend whose connection to the server is lost."""
+
+    def send_messages(self, _email_messages: list[EmailMessage]) -> int:
+        """Fail to send the emails."""
+        msg = "connection unexpectedly closed"
+        raise SMTPServerDisconnected(msg)
+
+
 @when("I send a test email")
 def step_test_emails(context: Context):
     email = EmailMultiAlternatives("A test email", "Hello", "from@example.com", ["to@example.com"])
@@ -94,3 +126,139 @@ def step_see_email_details(context: Context):
         if mimetype == "text/html":
             LOGGER.info("\nBody (html):\n%s", content)
     LOGGER.info("=====================")
+
+
+@given("I count the email connections")
+def count_email_connections(context: Context):
+    context.email_connections = 0
+    open_connection = EmailConnectionProvider.open_connection
+
+    def counted_open_connection(provider: EmailConnectionProvider) -> BaseEmailBackend:
+        context.email_connections += 1
+        return open_connection(provider)
+
+    EmailConnectionProvider.open_connection = counted_open_connection  # ty: ignore invalid-assignment
+    context.add_cleanup(setattr, EmailConnectionProvider, "open_connection", open_connection)
+
+
+@when(r"I send (?P<amount>\d+) test emails at once(?P<pooled> through a pooled connection)?")
+def send_test_emails(context: Context, amount: str, pooled: str = ""):
+    if pooled and not hasattr(context, "email_provider"):
+        context.email_provider = PooledEmailConnectionProvider()
+    provider = context.email_provider if pooled else default_email_connection_provider
+
+    emails = build_test_emails(int(amount))
+    context.test.assertEqual(provider.send_messages(emails), int(amount))
+
+
+@then(r"(?P<amount>\d+) email connections? should have been opened")
+def check_email_connections(context: Context, amount: str):
+    context.test.assertEqual(context.email_connections, int(amount))
+
+
+def build_test_emails(amount: int) -> list[EmailMultiAlternatives]:
+    return [
+        EmailMultiAlternatives(f"Test email {idx}", "Hello", "from@example.com", ["to@example.com"])
+        for idx in range(amount)
+    ]
+
+
+@when(r"I queue (?P<amount>\d+) test emails? in the outbox")
+def queue_test_emails(context: Context, amount: str):
+    emails = build_test_emails(int(amount))
+    context.test.assertEqual(QueuedEmailProvider().send_messages(emails), int(amount))
+
+
+@when(
+    r"I run the outbox worker(?: with a (?P<backend>failing|disconnected) email backend)?"
+    r"(?P<pooled> through a pooled connection)?"
+)
+def run_outbox_worker(context: Context, backend: str = "", pooled: str = ""):
+    backend_kwargs = {"backend": f"{__name__}.{backend.title()}EmailBackend"} if backend else {}
+    if pooled:
+        context.email_provider = PooledEmailConnectionProvider(**backend_kwargs)
+        OutboxWorker(context.email_provider, max_attempts=3).run_once()
+        return
+
+    provider = EmailConnectionProvider(**backend_kwargs) if backend else None
+    worker = OutboxWorker(provider, max_attempts=3)
+    worker.run_once()
+    worker.close()
+
+
+@then(r"(?P<amount>\d+) email connections? should be kept in the pool")
+def check_pooled_connections(context: Context, amount: str):
+    context.test.assertEqual(len(context.email_provider.idle_connections), int(amount))
+
+
+@given("the form emails are stored in the outbox")
+def use_email_outbox(context: Context):
+    provider = CustomFormPage.email_connection_provider
+    CustomFormPage.email_connection_provider = QueuedEmailProvider()
+    context.add_cleanup(setattr, CustomFormPage, "email_connection_provider", provider)
+
+
+@when("I send the queued emails")
+def send_queued_emails(_context: Context):
+    call_command("send_queued_emails", stdout=StringIO())
+
+
+@when("the queued emails are due")
+def make_queued_emails_due(_context: Context):
+    QueuedEmail.objects.update(next_attempt_at=timezone.now())
+
+
+@then(r"(?P<amount>\d+) queued emails? should be (?P<status>pending|sent|failed)")
+def check_queued_emails(context: Context, amount: str, status: str):
+    context.test.assertEqual(QueuedEmail.objects.filter(status=status).count(), int(amount))
+
+
+@then(r"the next attempt of the queued emails should be in (?P<delay>\d+) seconds")
+def check_next_attempt(context: Context, delay: str):
+    for queued_email in QueuedEmail.objects.all():
+        expected = timezone.now() + timedelta(seconds=int(delay))
+        context.test.assertAlmostEqual(
+            queued_email.next_attempt_at, expected, delta=timedelta(seconds=5)
+        )
+
+
+@given(
+    r'the author notification of "(?P<form_title>.+?)" is sent in a digest every '
+    r"(?P<amount>\d+) (?P<unit>submissions|minutes)"
+)
+def set_digest(context: Context, form_title: str, amount: str, unit: str):
+    form_page = FormPage.objects.get(title=form_title)
+    email_block = form_page.emails_to_send[0]
+    email_block.value["digest_size" if unit == "submissions" else "digest_interval"] = int(amount)
+    form_page.save_revision().publish()
+    context.test.assertTrue(
+        FormPage.objects.get(title=form_title).get_email_render_plans()[0].is_digest
+    )
+
+
+@when("I send the due digests")
+def send_due_digests(_context: Context):
+    call_command("send_digest_emails", stdout=StringIO())
+
+
+@when(r"(?P<amount>\d+) minutes have passed since the first submission")
+def age_digest_entries(_context: Context, amount: str):
+    created_at = timezone.now() - timedelta(minutes=int(amount))
+    DigestEntry.objects.update(created_at=created_at)
+
+
+@then(r"(?P<amount>\d+) submissions? should wait for a digest")
+def check_digest_entries(context: Context, amount: str):
+    context.test.assertEqual(DigestEntry.objects.count(), int(amount))
+
+
+@then(
+    r"the form admin \((?P<recipient>\S+@\S+)\) should receive a digest of (?P<amount>\d+) "
+    r'submissions? about the form "(?P<form_title>.+?)"'
+)
+def check_digest_email(context: Context, recipient: str, amount: str, form_title: str):
+    check_email(context)
+    check_email_subject(context, f'New entry for form "{form_title}"')
+    check_email_to(context, recipient)
+    context.test.assertEqual(str(context.last_email.body).count("•"), int(amount))
+    context.test.assertEqual(len(mail.outbox), 0)
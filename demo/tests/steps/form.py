@@ -1,7 +1,9 @@
 """Step definitions related to forms checks."""
 
 # ruff: noqa: D103, ANN201, PT009, E501
-from typing import cast
+import re
+import uuid
+from typing import Any, cast
 
 from wagtail.models import Page
 
@@ -11,6 +13,7 @@ from demo.tests.steps import email as step_email
 from demo.tests.steps import page as step_page
 
 from behave import given, then, use_step_matcher, when
+from behave.model import Table
 from bs4 import BeautifulSoup, Tag
 
 use_step_matcher("re")
@@ -44,6 +47,71 @@ def set_form_owner(context: Context, form_title: str, username: str, email: str)
     context.test.assertEqual(form_page.owner.email, email)
 
 
+def build_rule_data(rule: str, block_ids: dict[str, str]) -> list[dict[str, Any]]:
+    target, operator, value = [*rule.split(" ", 2), ""][:3]
+    is_number = value.lstrip("-").isdigit()
+    is_date = re.fullmatch(r"\d{4}-\d{2}-\d{2}", value) is not None
+    rule_value = {
+        "field": block_ids.get(target) or str(uuid.uuid4()),
+        "operator": operator,
+        "value_char": "" if is_number or is_date else value,
+        "value_number": int(value) if is_number else None,
+        "value_dropdown": "",
+        "value_date": value if is_date else None,
+        "value_time": None,
+        "value_datetime": None,
+        "rules": [],
+    }
+    return [{"type": "item", "id": str(uuid.uuid4()), "value": rule_value}]
+
+
+def build_field_data(row: dict[str, str], block_ids: dict[str, str]) -> dict[str, Any]:
+    value = {
+        "label": row["label"],
+        "slug": row["slug"],
+        "help_text": row.get("help_text", ""),
+        "is_required": row.get("required", "") == "yes",
+        "disabled": False,
+        "rule": build_rule_data(row["rule"], block_ids) if row.get("rule") else [],
+    }
+    if row.get("choices"):
+        value["choices"] = row["choices"].replace(",", "\n")
+    if row.get("initial"):
+        value["initial"] = row["initial"]
+    return {"type": row["type"], "id": block_ids[row["slug"]], "value": value}
+
+
+def build_form_fields_data(table: Table) -> list[dict[str, Any]]:
+    block_ids = {row["slug"]: str(uuid.uuid4()) for row in table}
+    return [build_field_data(row.as_dict(), block_ids) for row in table]
+
+
+@given(r'the form "(?P<form_title>.+?)" has the following fields')
+def set_form_fields(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    form_fields = build_form_fields_data(context.table)
+    form_page.form_fields = form_fields  # ty: ignore invalid-assignment
+    form_page.save_revision().publish()
+    context.test.assertEqual(len(form_page.get_form_fields()), len(context.table.rows))
+
+
+@given(r"I am logged in as (?P<username>\w+)(?P<superuser> with all permissions)?")
+def log_in(context: Context, username: str, superuser: str = ""):
+    create_user = (
+        CustomUser.objects.create_superuser if superuser else CustomUser.objects.create_user
+    )
+    user = create_user(username, f"{username}@example.com", "password")
+    context.test.client.force_login(user)
+    context.user = user
+
+
+@when(r'I publish the form "(?P<form_title>.+?)"')
+def publish_form(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    form_page.save_revision().publish()
+    context.test.assertFalse(FormPage.objects.get(title=form_title).has_unpublished_changes)
+
+
 @when(r'I fill the "(?P<input_name>.+?)" input with "(?P<input_value>.+?)"')
 def fill_form(context: Context, input_name: str, input_value: str):
     context.form_data[input_name] = input_value
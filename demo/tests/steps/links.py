@@ -0,0 +1,39 @@
+"""Step definitions related to the links creation."""
+
+# ruff: noqa: D103, ANN201, PT009
+from time import perf_counter
+
+from django.test import override_settings
+
+from demo.tests.environment import Context
+from wagtail_form_plugins.utils import create_links
+
+from behave import then, use_step_matcher
+
+use_step_matcher("re")
+
+
+@then("the links should be created as follows")
+def check_created_links(context: Context):
+    for row in context.table:
+        context.test.assertEqual(create_links(row["text"]), row["result"])
+
+
+@then(
+    r'creating links in "(?P<pattern>.+?)" repeated (?P<amount>\d+) times '
+    r"should take less than (?P<duration>[\d.]+) seconds"
+)
+def check_links_duration(context: Context, pattern: str, amount: str, duration: str):
+    start = perf_counter()
+    create_links(pattern * int(amount))
+    context.test.assertLess(perf_counter() - start, float(duration))
+
+
+@then(
+    r'creating links in "(?P<pattern>.+?)" repeated (?P<amount>\d+) times '
+    r"should not create any link"
+)
+def check_links_max_length(context: Context, pattern: str, amount: str):
+    text = pattern * int(amount)
+    with override_settings(FORMS_LINKIFY_MAX_LENGTH=len(text) - 1):
+        context.test.assertNotIn("<a ", create_links(text))
@@ -0,0 +1,503 @@
+"""Step definitions related to the form results."""
+
+# ruff: noqa: D103, ANN201, PT009
+import csv
+from base64 import b64encode
+from io import BytesIO, StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from demo.models import CustomFormSubmission, CustomUser, FormPage
+from demo.tests.environment import Context
+from wagtail_form_plugins.streamfield import analytics
+from wagtail_form_plugins.streamfield.search import SubmissionText
+from wagtail_form_plugins.streamfield.statistics import AnswerStatistic
+from wagtail_form_plugins.streamfield.values import SubmissionValue
+from wagtail_form_plugins.streamfield.views import ColumnFormatter, StreamFieldSubmissionsListView
+
+from behave import given, then, use_step_matcher, when
+from bs4 import BeautifulSoup
+from openpyxl import load_workbook
+from pyarrow import parquet
+
+use_step_matcher("re")
+
+
+def parse_cell(field_type: str, cell: str) -> Any:  # noqa: ANN401
+    if field_type in ["checkboxes", "multiselect"]:
+        return cell.split(",") if cell else []
+    if field_type == "checkbox":
+        return cell == "yes"
+    return cell or None
+
+
+@given(r'the form "(?P<form_title>.+?)" has the following submissions')
+def create_submissions(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    fields = form_page.get_form_fields_dict()
+    for row in context.table:
+        form_data = {slug: parse_cell(fields[slug].type, cell) for slug, cell in row.items()}
+        CustomFormSubmission.objects.create(page=form_page, form_data=form_data)
+    context.test.assertEqual(
+        form_page.get_submission_class().objects.count(), len(context.table.rows)
+    )
+
+
+def read_export(content: bytes, export_format: str) -> list[list[str]]:
+    if export_format == "csv":
+        return list(csv.reader(StringIO(content.decode("utf-8-sig"))))
+    if export_format == "parquet":
+        table = parquet.read_table(BytesIO(content))
+        header = [field.metadata[b"label"].decode() for field in table.schema]
+        return [header, *([str(value) for value in row.values()] for row in table.to_pylist())]
+    worksheet = load_workbook(BytesIO(content), read_only=True).active
+    return [["" if cell is None else str(cell) for cell in row] for row in worksheet.values]
+
+
+@when(r'I export the results of the form "(?P<form_title>.+?)" as (?P<export_format>\w+)')
+def export_results(context: Context, form_title: str, export_format: str):
+    form_page = FormPage.objects.get(title=form_title)
+    context.column_formatter_calls = 0
+    get_column_formatter = StreamFieldSubmissionsListView.get_column_formatter
+
+    def counted_get_column_formatter(
+        view: StreamFieldSubmissionsListView, *args, **kwargs
+    ) -> ColumnFormatter:
+        context.column_formatter_calls += 1
+        return get_column_formatter(view, *args, **kwargs)
+
+    StreamFieldSubmissionsListView.get_column_formatter = counted_get_column_formatter  # ty: ignore invalid-assignment
+    context.add_cleanup(
+        setattr, StreamFieldSubmissionsListView, "get_column_formatter", get_column_formatter
+    )
+
+    context.iterator_chunk_sizes = []
+    iterator = QuerySet.iterator
+
+    def recorded_iterator(queryset: QuerySet, chunk_size: int | None = None) -> Any:  # noqa: ANN401
+        context.iterator_chunk_sizes.append(chunk_size)
+        return iterator(queryset, chunk_size=chunk_size)
+
+    QuerySet.iterator = recorded_iterator  # ty: ignore invalid-assignment
+    context.add_cleanup(setattr, QuerySet, "iterator", iterator)
+
+    url = reverse("wagtailforms:list_submissions", args=[form_page.pk])
+    response = context.test.client.get(f"{url}?export={export_format}")
+    context.test.assertEqual(response.status_code, 200)
+    context.test.assertTrue(response.streaming)
+
+    content = b"".join(response.streaming_content)
+    response.close()
+    if export_format == "parquet":
+        context.export_table = parquet.read_table(BytesIO(content))
+    labels = {field.label: field.slug for field in form_page.get_form_fields()}
+    rows = read_export(content, export_format)
+    context.export_header = rows[0]
+    context.exported_rows = [
+        {labels.get(heading, heading): cell for heading, cell in zip(rows[0], row, strict=True)}
+        for row in rows[1:]
+    ]
+
+
+@then("the exported results should contain the following rows")
+def check_exported_rows(context: Context):
+    exported_rows = sorted(context.exported_rows, key=lambda row: row["name"])
+    context.test.assertEqual(len(exported_rows), len(context.table.rows))
+    for exported_row, expected_row in zip(exported_rows, context.table, strict=True):
+        for slug, expected in expected_row.items():
+            context.test.assertEqual(" ".join(exported_row[slug].split()), expected)
+
+
+@then("the column formatters should have been built once")
+def check_column_formatters_built_once(context: Context):
+    context.test.assertEqual(context.column_formatter_calls, len(context.export_header))
+
+
+@then(r"the submissions should have been exported by chunks of (?P<chunk_size>\d+)")
+def check_export_chunks(context: Context, chunk_size: str):
+    context.test.assertEqual(context.iterator_chunk_sizes, [int(chunk_size)])
+
+
+@then(r"the exported columns should have the following types")
+def check_exported_column_types(context: Context):
+    for row in context.table:
+        column_type = context.export_table.schema.field(row["slug"]).type
+        context.test.assertEqual(str(column_type), row["type"])
+
+
+@then(r'the exported column "(?P<slug>.+?)" should contain (?P<values>.+)')
+def check_exported_column_values(context: Context, slug: str, values: str):
+    column_values = context.export_table.column(slug).to_pylist()
+    context.test.assertEqual(repr(column_values), values)
+
+
+@then(r'the field value formatters of "(?P<form_title>.+?)" should be shared between requests')
+def check_field_value_formatters_shared(context: Context, form_title: str):
+    formatters = FormPage.objects.get(title=form_title).get_field_value_formatters(in_html=False)
+    other_formatters = FormPage.objects.get(title=form_title).get_field_value_formatters(
+        in_html=False
+    )
+    context.test.assertIs(other_formatters, formatters)
+    context.test.assertIsNot(
+        FormPage.objects.get(title=form_title).get_field_value_formatters(in_html=True), formatters
+    )
+
+
+@then(r'the exported results should not have a "(?P<label>.+?)" column')
+def check_exported_column_hidden(context: Context, label: str):
+    context.test.assertNotIn(label, context.export_header)
+
+
+@when(r'I visit the results of the form "(?P<form_title>.+?)"')
+def visit_results(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    url = reverse("wagtailforms:list_submissions", args=[form_page.pk])
+    context.response = context.test.client.get(url)
+    context.test.assertEqual(context.response.status_code, 200)
+    context.soup = BeautifulSoup(context.response.text, "html.parser")
+
+
+@then(r'the results table should have the columns "(?P<labels>.+?)"')
+def check_results_columns(context: Context, labels: str):
+    headings = [th.get_text(strip=True) for th in context.soup.select("table thead th")]
+    context.test.assertEqual([h for h in headings if h in labels.split(", ")], labels.split(", "))
+    context.test.assertNotIn("Notes", headings)
+
+
+@then(r"the results table should have (?P<amount>\d+) rows with an edit link")
+def check_results_edit_links(context: Context, amount: str):
+    edit_links = context.soup.select("table tbody tr a[href*='?edit=']")
+    context.test.assertEqual(len(edit_links), int(amount))
+
+
+@given(
+    r'the form "(?P<form_title>.+?)" has (?P<amount>\d+) more submissions, half at the same time'
+)
+def create_many_submissions(_context: Context, form_title: str, amount: str):
+    form_page = FormPage.objects.get(title=form_title)
+    submissions = CustomFormSubmission.objects.bulk_create(
+        CustomFormSubmission(page=form_page, form_data={"name": f"Name {idx}"})
+        for idx in range(int(amount))
+    )
+    same_time_ids = [submission.pk for submission in submissions[::2]]
+    CustomFormSubmission.objects.filter(pk__in=same_time_ids).update(
+        submit_time=submissions[0].submit_time
+    )
+
+
+@given(r'the form "(?P<form_title>.+?)" has (?P<amount>\d+) more submissions from distinct users')
+def create_user_submissions(_context: Context, form_title: str, amount: str):
+    form_page = FormPage.objects.get(title=form_title)
+    users = CustomUser.objects.bulk_create(
+        CustomUser(username=f"user{idx}", email=f"user{idx}@example.com", first_name=f"U{idx}")
+        for idx in range(int(amount))
+    )
+    CustomFormSubmission.objects.bulk_create(
+        CustomFormSubmission(page=form_page, user=user, form_data={"name": user.first_name})
+        for user in users
+    )
+
+
+@then(
+    r'the results of "(?P<form_title>.+?)" should be rendered in (?P<amount>\d+) queries'
+    r" with (?P<rows>\d+) rows"
+)
+def check_results_queries(context: Context, form_title: str, amount: str, rows: str):
+    form_page = FormPage.objects.get(title=form_title)
+    url = reverse("wagtailforms:list_submissions", args=[form_page.pk])
+    context.test.client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = context.test.client.get(url)
+    context.test.assertEqual(response.status_code, 200)
+
+    soup = BeautifulSoup(response.text, "html.parser")
+    context.test.assertEqual(len(soup.select("input.select-submission")), int(rows))
+    sql = "\n".join(query["sql"] for query in queries.captured_queries)
+    context.test.assertEqual(len(queries.captured_queries), int(amount), sql)
+
+
+def get_results_page(context: Context, url: str) -> BeautifulSoup:
+    with CaptureQueriesContext(connection) as queries:
+        response = context.test.client.get(url)
+    context.test.assertEqual(response.status_code, 200)
+    context.results_queries += [query["sql"] for query in queries.captured_queries]
+    return BeautifulSoup(response.text, "html.parser")
+
+
+def browse_results(context: Context, url: str, link_selector: str) -> list[list[str]]:
+    pages = []
+    while url:
+        soup = get_results_page(context, url)
+        pages.append([cb["value"] for cb in soup.select("input.select-submission")])
+        link = soup.select_one(link_selector)
+        url = link["href"] if link and link.has_attr("href") else None
+    return pages
+
+
+@when(r'I browse the result pages of the form "(?P<form_title>.+?)" forth and back')
+def browse_result_pages(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    url = reverse("wagtailforms:list_submissions", args=[form_page.pk])
+    context.results_queries = []
+    context.result_pages = browse_results(context, url, "nav.pagination li.next a")
+
+    soup = get_results_page(context, url)
+    last_page_url = url
+    while link := soup.select_one("nav.pagination li.next a[href]"):
+        last_page_url = link["href"]
+        soup = get_results_page(context, last_page_url)
+    backward_pages = browse_results(context, last_page_url, "nav.pagination li.prev a")
+    context.backward_result_pages = backward_pages[::-1]
+
+
+@then(r"I should have seen (?P<amount>\d+) distinct submissions on (?P<pages>\d+) pages")
+def check_result_pages(context: Context, amount: str, pages: str):
+    submission_ids = [pk for page in context.result_pages for pk in page]
+    context.test.assertEqual(len(context.result_pages), int(pages))
+    context.test.assertEqual(len(set(submission_ids)), int(amount))
+    context.test.assertEqual(len(submission_ids), int(amount))
+
+    expected_ids = CustomFormSubmission.objects.order_by("-submit_time", "-id")
+    context.test.assertEqual(
+        submission_ids, [str(pk) for pk in expected_ids.values_list("pk", flat=True)]
+    )
+
+
+@then("the same pages should have been seen when browsing back")
+def check_backward_result_pages(context: Context):
+    context.test.assertEqual(context.backward_result_pages, context.result_pages)
+
+
+@then("the result pages should have been fetched without offset")
+def check_result_pages_without_offset(context: Context):
+    submission_table = CustomFormSubmission._meta.db_table  # noqa: SLF001
+    submission_queries = [sql for sql in context.results_queries if submission_table in sql]
+    context.test.assertTrue(submission_queries)
+    context.test.assertFalse([sql for sql in submission_queries if "OFFSET" in sql])
+
+
+@given(r'the submission values of the form "(?P<form_title>.+?)" are indexed')
+def index_submission_values(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    call_command("index_submission_values", page=[form_page.pk], stdout=StringIO())
+    context.test.assertTrue(SubmissionValue.objects.filter(page=form_page).exists())
+
+
+@given(r'the submission texts of the form "(?P<form_title>.+?)" are indexed')
+def index_submission_text(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    SubmissionText.objects.filter(page=form_page).delete()
+    call_command("index_submission_text", page=[form_page.pk], stdout=StringIO())
+    context.test.assertTrue(SubmissionText.objects.filter(page=form_page).exists())
+
+
+@given(r'the answer statistics of the form "(?P<form_title>.+?)" are counted')
+def index_answer_statistics(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    call_command("index_answer_statistics", page=[form_page.pk], stdout=StringIO())
+    context.test.assertTrue(AnswerStatistic.objects.filter(page=form_page).exists())
+
+
+def get_form_data(context: Context) -> QueryDict:
+    data = QueryDict(mutable=True)
+    for row in context.table:
+        data.appendlist(row["slug"], row["value"])
+    data["wfp_token"] = f"{b64encode(b'grace@example.com').decode()}-token"
+    return data
+
+
+@when(r'I process a submission of the form "(?P<form_title>.+?)" with the following data')
+def process_submission(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    form = form_page.get_form(get_form_data(context), page=form_page, user=AnonymousUser())
+    context.test.assertTrue(form.is_valid(), form.errors.as_text())
+    form_page.process_form_submission(form)
+
+
+@when(r'I edit the submission of "(?P<name>.+?)" in "(?P<form_title>.+?)" with the following data')
+def edit_submission(context: Context, name: str, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    submission = CustomFormSubmission.objects.get(page=form_page, form_data__name=name)
+    data = get_form_data(context)
+    data["edit"] = str(submission.pk)
+    response = context.test.client.post(form_page.url, data)
+    context.test.assertEqual(response.status_code, 302)
+
+
+@when(r'I delete the submission of "(?P<name>.+?)" in "(?P<form_title>.+?)"')
+def delete_submission(context: Context, name: str, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    submission = CustomFormSubmission.objects.get(page=form_page, form_data__name=name)
+    context.deleted_submission_id = submission.pk
+    submission.delete()
+
+
+@when(r'I delete the submissions of (?P<names>.+?) in "(?P<form_title>.+?)" at once')
+def delete_submissions(context: Context, names: str, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    submissions = CustomFormSubmission.objects.filter(
+        page=form_page, form_data__name__in=[name.strip('" ') for name in names.split(",")]
+    )
+    with CaptureQueriesContext(connection) as queries:
+        submissions.delete()
+    context.deletion_queries = [query["sql"] for query in queries.captured_queries]
+
+
+@then(r"the submissions should have been read (?P<amount>\d+) times? during the deletion")
+def check_deletion_reads(context: Context, amount: str):
+    submission_table = CustomFormSubmission._meta.db_table  # noqa: SLF001
+    reads = [
+        sql
+        for sql in context.deletion_queries
+        if sql.startswith("SELECT") and f'FROM "{submission_table}"' in sql
+    ]
+    context.test.assertEqual(len(reads), int(amount), "\n".join(reads))
+
+
+@when(r'I delete the form "(?P<form_title>.+?)"')
+def delete_form(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    context.deleted_page_id = form_page.pk
+    form_page.delete()
+
+
+@then("the deleted form should not have answer statistics anymore")
+def check_deleted_form_statistics(context: Context):
+    statistics = AnswerStatistic.objects.filter(page_id=context.deleted_page_id)
+    context.test.assertFalse(statistics.exists())
+
+
+@then("the deleted submission should not have values anymore")
+def check_deleted_submission_values(context: Context):
+    values = SubmissionValue.objects.filter(submission_id=context.deleted_submission_id)
+    context.test.assertFalse(values.exists())
+
+
+@then("the deleted submission should not be searchable anymore")
+def check_deleted_submission_text(context: Context):
+    texts = SubmissionText.objects.filter(submission_id=context.deleted_submission_id)
+    context.test.assertFalse(texts.exists())
+
+
+@then(r'the results of "(?P<form_title>.+?)" filtered with "(?P<query>.*?)" are "(?P<names>.*?)"')
+def check_filtered_results(context: Context, form_title: str, query: str, names: str):
+    form_page = FormPage.objects.get(title=form_title)
+    url = reverse("wagtailforms:list_submissions", args=[form_page.pk])
+    response = context.test.client.get(f"{url}?{query}")
+    context.test.assertEqual(response.status_code, 200)
+
+    soup = BeautifulSoup(response.text, "html.parser")
+    submission_ids = [int(cb["value"]) for cb in soup.select("input.select-submission")]
+    submissions = CustomFormSubmission.objects.in_bulk(submission_ids)
+    found_names = [submissions[pk].form_data["name"] for pk in submission_ids]
+    context.test.assertEqual(", ".join(found_names), names)
+
+
+def format_statistics(field_statistics: dict[str, Any]) -> str:
+    if field_statistics["type"] == "number":
+        bounds = [field_statistics[key] for key in ("total", "minimum", "maximum", "mean")]
+        return " ".join("-" if value is None else f"{value:g}" for value in bounds)
+    return ", ".join(
+        f"{choice['label']}: {choice['count']}" for choice in field_statistics["choices"]
+    )
+
+
+@then(r'the answer statistics of "(?P<form_title>.+?)" should be read in (?P<amount>\d+) queries')
+def check_answer_statistics(context: Context, form_title: str, amount: str):
+    form_page = FormPage.objects.get(title=form_title)
+    url = reverse("wagtail_form_plugins:statistics_json", args=[form_page.pk])
+    context.test.client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = context.test.client.get(url)
+    context.test.assertEqual(response.status_code, 200)
+
+    statistics_queries = [
+        query for query in queries.captured_queries if "answerstatistic" in query["sql"]
+    ]
+    context.test.assertEqual(len(statistics_queries), int(amount))
+    context.test.assertFalse(
+        any("customformsubmission" in query["sql"] for query in queries.captured_queries)
+    )
+
+    statistics = response.json()
+    for row in context.table:
+        if row["slug"] == "submissions":
+            context.test.assertEqual(str(statistics["submissions"]), row["statistics"])
+            continue
+        field_statistics = statistics["fields"][row["slug"]]
+        context.test.assertEqual(format_statistics(field_statistics), row["statistics"])
+
+
+@then(r'the answer statistics page of "(?P<form_title>.+?)" should show "(?P<text>.+?)"')
+def check_answer_statistics_page(context: Context, form_title: str, text: str):
+    form_page = FormPage.objects.get(title=form_title)
+    url = reverse("wagtail_form_plugins:statistics", args=[form_page.pk])
+    response = context.test.client.get(url)
+    context.test.assertEqual(response.status_code, 200)
+    context.test.assertIn(text, BeautifulSoup(response.text, "html.parser").get_text(" "))
+
+
+def get_analytics(context: Context, form_title: str) -> dict[str, Any]:
+    form_page = FormPage.objects.get(title=form_title)
+    url = reverse("wagtail_form_plugins:analytics_json", args=[form_page.pk])
+    with CaptureQueriesContext(connection) as queries:
+        response = context.test.client.get(url)
+    context.test.assertEqual(response.status_code, 200)
+    context.analytics_queries = [query["sql"] for query in queries.captured_queries]
+    return response.json()
+
+
+@given(r"the analytics are computed with the (?P<name>array|numpy) backend")
+def use_analytics_backend(context: Context, name: str):
+    backends = {"array": analytics.ArrayBackend, "numpy": analytics.NumpyBackend}
+    context.add_cleanup(setattr, analytics, "backend", analytics.backend)
+    analytics.backend = backends[name]()
+
+    cache_directory = TemporaryDirectory()
+    context.add_cleanup(cache_directory.cleanup)
+    cache_settings = override_settings(FORMS_ANALYTICS_CACHE_DIR=cache_directory.name)
+    cache_settings.enable()
+    context.add_cleanup(cache_settings.disable)
+    context.analytics_cache_directory = cache_directory.name
+
+
+@then(r"the submission columns should be cached in the configured directory")
+def check_analytics_cache_directory(context: Context):
+    column_files = list(Path(context.analytics_cache_directory).glob("*.f64"))
+    context.test.assertTrue(column_files)
+    context.test.assertFalse(list(Path(context.analytics_cache_directory).glob("*.tmp")))
+
+
+@when(r'I load the analytics of "(?P<form_title>.+?)" without cache')
+def load_analytics_without_cache(context: Context, form_title: str):
+    FormPage.objects.get(title=form_title).get_analytics().invalidate()
+    context.analytics = get_analytics(context, form_title)
+
+
+@when(r'I load the analytics of "(?P<form_title>.+?)"')
+def load_analytics(context: Context, form_title: str):
+    context.analytics = get_analytics(context, form_title)
+
+
+@then("the analytics should contain the following values")
+def check_analytics(context: Context):
+    for row in context.table:
+        value = context.analytics
+        for key in row["path"].split("."):
+            value = value[key]
+        context.test.assertEqual(str(value), row["value"])
+
+
+@then(r"the submission columns should have been read (?P<amount>\d+) times?")
+def check_analytics_columns_read(context: Context, amount: str):
+    reads = [sql for sql in context.analytics_queries if "form_data" in sql]
+    context.test.assertEqual(len(reads), int(amount))
@@ -0,0 +1,82 @@
+"""Step definitions related to the form schema cache."""
+
+# ruff: noqa: D103, ANN201, PT009
+from demo.models import FormPage
+from demo.tests.environment import Context
+from wagtail_form_plugins.streamfield.schema import form_schema_cache
+
+from behave import then, use_step_matcher
+
+use_step_matcher("re")
+
+
+@then(r'the form schema of "(?P<form_title>.+?)" should (?P<neg>not )?be cached')
+def check_form_schema_cached(context: Context, form_title: str, neg: str = ""):
+    form_page = FormPage.objects.get(title=form_title)
+    key = form_page.get_form_schema_key()
+    is_cached = key is not None and key in form_schema_cache.schemas
+    context.test.assertEqual(is_cached, not neg)
+
+
+@then(r'the form schema of "(?P<form_title>.+?)" should have (?P<amount>\d+) fields?')
+def check_form_schema_fields(context: Context, form_title: str, amount: str):
+    schema = FormPage.objects.get(title=form_title).get_form_schema()
+    context.test.assertEqual(len(schema.fields), int(amount))
+    context.test.assertEqual(list(schema.fields_dict), [field.slug for field in schema.fields])
+
+
+@then(r'the enabled fields of "(?P<form_title>.+?)" should be computed once per request')
+def check_enabled_fields_memoized(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    calls = []
+    compute_enabled_fields = form_page.compute_enabled_fields
+
+    def counted_compute_enabled_fields(form_data: dict) -> list[str]:
+        calls.append(form_data)
+        return compute_enabled_fields(form_data)
+
+    form_page.compute_enabled_fields = counted_compute_enabled_fields  # ty: ignore invalid-assignment
+    form_data = {field.slug: "" for field in form_page.get_form_fields()}
+
+    with form_page.use_form_context():
+        for _ in range(3):
+            form_page.get_enabled_fields(dict(form_data))
+    context.test.assertEqual(len(calls), 1)
+
+    with form_page.use_form_context():
+        form_page.get_enabled_fields(form_data)
+    context.test.assertEqual(len(calls), 2)
+
+    form_page.get_enabled_fields(form_data)
+    form_page.get_enabled_fields(form_data)
+    context.test.assertEqual(len(calls), 4)
+    context.test.assertIsNone(form_page.active_form_context)
+
+
+@then(r'the form class of "(?P<form_title>.+?)" should be shared between requests')
+def check_form_class_shared(context: Context, form_title: str):
+    form_class = FormPage.objects.get(title=form_title).get_form_class()
+    context.test.assertIs(FormPage.objects.get(title=form_title).get_form_class(), form_class)
+
+    for form_field in FormPage.objects.get(title=form_title).get_form_fields():
+        widget_attrs = form_class.base_fields[form_field.slug].widget.attrs
+        context.test.assertEqual(widget_attrs["id"], form_field.block_id)
+        context.test.assertEqual(widget_attrs["data-type"], form_field.type)
+
+
+@then(r'the email render plans of "(?P<form_title>.+?)" should be shared between requests')
+def check_email_render_plans_shared(context: Context, form_title: str):
+    plans = FormPage.objects.get(title=form_title).get_email_render_plans()
+    context.test.assertIs(FormPage.objects.get(title=form_title).get_email_render_plans(), plans)
+
+
+@then(
+    r'the email render plans of "(?P<form_title>.+?)" should have (?P<amount>\d+) text messages? '
+    r"without html"
+)
+def check_email_render_plans_text(context: Context, form_title: str, amount: str):
+    plans = FormPage.objects.get(title=form_title).get_email_render_plans()
+    context.test.assertEqual(len(plans), int(amount))
+    for plan in plans:
+        context.test.assertNotIn("<p>", plan.message_text)
+        context.test.assertIn("<p>", plan.message_html)
@@ -0,0 +1,134 @@
+"""Step definitions related to the templating plugin."""
+
+# ruff: noqa: D103, ANN201, PT009
+from collections import Counter
+from typing import Any
+
+from django.contrib.auth.models import User
+
+from demo.models import FormPage
+from demo.tests.environment import Context
+from wagtail_form_plugins.plugins.templating import compile_template
+
+from behave import then, use_step_matcher
+
+use_step_matcher("re")
+
+
+@then(r'the templates should be formatted for the form "(?P<form_title>.+?)" as follows')
+def check_formatted_templates(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    formatter = form_page.templating_formatter_class(form_page, context.user)
+    for row in context.table:
+        context.test.assertEqual(formatter.format(row["template"]), row["result"])
+
+
+def create_submission(form_title: str, slug: str, value: str) -> tuple[FormPage, Any]:
+    form_page = FormPage.objects.get(title=form_title)
+    form_data = {field.slug: "" for field in form_page.get_form_fields()}
+    form_data[slug] = value
+    submission = form_page.get_submission_class().objects.create(
+        page=form_page, form_data=form_data
+    )
+    return form_page, submission
+
+
+@then(
+    r'the templates should be formatted for a submission of the form "(?P<form_title>.+?)" '
+    r'where "(?P<slug>\w+)" is "(?P<value>.*?)" as follows'
+)
+def check_submission_templates(context: Context, form_title: str, slug: str, value: str):
+    form_page, submission = create_submission(form_title, slug, value)
+    with form_page.use_form_context():
+        formatter = form_page.templating_formatter_class(form_page, context.user, submission)
+        for row in context.table:
+            context.test.assertEqual(formatter.format(row["template"]), row["result"])
+
+
+@then(
+    r'the template values of a submission of the form "(?P<form_title>.+?)" where '
+    r'"(?P<slug>\w+)" is "(?P<value>.*?)" should not contain "(?P<key>.+?)"'
+)
+def check_submission_values(context: Context, form_title: str, slug: str, value: str, key: str):
+    form_page, submission = create_submission(form_title, slug, value)
+    with form_page.use_form_context():
+        formatter = form_page.templating_formatter_class(form_page, context.user, submission)
+        context.test.assertNotIn(key, formatter.get_values())
+
+
+@then(
+    r'a formatter of the form "(?P<form_title>.+?)" adding a "(?P<prefix>\w+)" data should '
+    r'format "(?P<template>.+?)" as "(?P<result>.+?)"'
+)
+def check_overridden_data(
+    context: Context, form_title: str, prefix: str, template: str, result: str
+):
+    form_page = FormPage.objects.get(title=form_title)
+
+    class GreetingFormatter(form_page.templating_formatter_class):
+        def get_data(self) -> dict:
+            return {**super().get_data(), prefix: {"text": "Hello"}}
+
+    formatter = GreetingFormatter(form_page, context.user)
+    context.test.assertEqual(formatter.format(template), result)
+
+
+@then(r'the template "(?P<template>.+?)" should be compiled once')
+def check_template_compiled_once(context: Context, template: str):
+    compile_template.cache_clear()
+    first_template = compile_template(template)
+    context.test.assertIs(compile_template(template), first_template)
+    context.test.assertEqual(compile_template.cache_info().misses, 1)
+
+
+@then(
+    r'formatting "(?P<template>.+?)" for the form "(?P<form_title>.+?)" should only compute '
+    r"the (?P<prefixes>[\w, ]+) data"
+)
+def check_computed_prefixes(context: Context, template: str, form_title: str, prefixes: str):
+    form_page = FormPage.objects.get(title=form_title)
+    formatter = form_page.templating_formatter_class(form_page, context.user)
+    formatter.format(template)
+    formatter.format(template)
+    context.test.assertEqual(set(formatter.prefix_data), set(prefixes.split(", ")))
+    placeholders = {placeholder.raw for placeholder in compile_template(template).placeholders}
+    context.test.assertEqual(set(formatter.resolved_values), placeholders)
+
+
+@then(
+    r"formatting the following templates in text and html for a submission of the form "
+    r'"(?P<form_title>.+?)" should compute the shared data once'
+)
+def check_shared_data(context: Context, form_title: str):
+    form_page = FormPage.objects.get(title=form_title)
+    form_data = {field.slug: "42" for field in form_page.get_form_fields()}
+    submission = form_page.get_submission_class().objects.create(
+        page=form_page, form_data=form_data
+    )
+
+    calls = Counter()
+    formatter_class = form_page.templating_formatter_class
+
+    class CountingFormatter(formatter_class):
+        def get_user_data(self, user: User) -> dict:
+            calls["user"] += 1
+            return super().get_user_data(user)
+
+        def get_form_data(self) -> dict:
+            calls["form"] += 1
+            return super().get_form_data()
+
+    compute_enabled_fields = form_page.compute_enabled_fields
+
+    def counted_compute_enabled_fields(form_data: dict) -> list[str]:
+        calls["enabled_fields"] += 1
+        return compute_enabled_fields(form_data)
+
+    form_page.compute_enabled_fields = counted_compute_enabled_fields  # ty: ignore invalid-assignment
+    with form_page.use_form_context():
+        for in_html in (False, True):
+            formatter = CountingFormatter(form_page, context.user, submission, in_html=in_html)
+            for row in context.table:
+                formatter.format(row["template"])
+
+    context.test.assertEqual(calls, {"user": 1, "form": 1, "enabled_fields": 1})
@@ -6,7 +6,9 @@ from demo.tests.steps import email as step_email
 from demo.tests.steps import form as step_form
 from demo.tests.steps import page as step_page
 
-from behave import then, when
+from behave import then, use_step_matcher, when
+
+use_step_matcher("re")
 
 
 @when("I click on the validation link")
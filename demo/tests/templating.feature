@@ -0,0 +1,47 @@
+@django_db
+Feature: Format templates
+  Background:
+    Given the form index page exists
+      And a form named "Survey" exists
+      And the form "Survey" has the following fields
+        | type   | label | slug |
+        | number | Age   | age  |
+      And I am logged in as alovelace
+
+  Scenario: Replace the template variables
+    Then the templates should be formatted for the form "Survey" as follows
+        | template                                | result                           |
+        | Hello {user.login}!                     | Hello alovelace!                 |
+        | {form.title}: {user.login} {form.title} | Survey: alovelace Survey         |
+        | {field_label.age} is {field_value.age}  | Age is ---                       |
+        | {{form.title}}                          | {Survey}                         |
+        | {unknown.key} and {form.unknown}        | {unknown.key} and {form.unknown} |
+        | no template here                        | no template here                 |
+
+  Scenario: Cache compiled templates
+    Then the template "Hello {user.login}!" should be compiled once
+
+  Scenario: Only compute the data of the used variables
+    Then formatting "{form.title}" for the form "Survey" should only compute the form data
+     And formatting "{user.login} {field_label.age}" for the form "Survey" should only compute the user, field_label data
+
+  Scenario: Share the template data between the formatters of a submission
+    Then formatting the following templates in text and html for a submission of the form "Survey" should compute the shared data once
+        | template                          |
+        | {form.title}: {field_value.age}   |
+        | {user.login} <{user.email}>       |
+        | {result.data}                     |
+
+  Scenario: Format the variables of the disabled fields
+    Given the form "Survey" has the following fields
+        | type       | label  | slug   | rule    |
+        | checkbox   | Minor  | minor  |         |
+        | singleline | School | school | minor c |
+    Then the templates should be formatted for a submission of the form "Survey" where "school" is "MIT" as follows
+        | template                                     | result       |
+        | {field_label.school}: {field_value.school}   | School: ---  |
+        | {field_label.minor}: {field_value.minor}     | Minor: ✘     |
+     And the template values of a submission of the form "Survey" where "school" is "MIT" should not contain "field_label.school"
+
+  Scenario: Use the template data of a formatter overriding get_data
+    Then a formatter of the form "Survey" adding a "greeting" data should format "{greeting.text} {user.login}" as "Hello alovelace"
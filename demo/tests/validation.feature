@@ -6,6 +6,7 @@ Feature: Use form validation
   Scenario: Validate a form
     Given a form named "Event Registration" exists
       And the form "Event Registration" is created by the user admin (admin@example.com)
+      And I count the email connections
 
      When I visit "/forms/event-registration"
      Then I should see the form validation page of "Event Registration"
@@ -26,3 +27,29 @@ Feature: Use form validation
       And the page should contain a form-thank-you element
       And I should receive at hello@example.com a confirmation email from noreply@example.com about the form "Event Registration"
       And the form admin (admin@example.com) should receive an information email from noreply@example.com about the form "Event Registration"
+      And 2 email connections should have been opened
+
+  Scenario: Send the form emails through the outbox
+    Given a form named "Event Registration" exists
+      And the form "Event Registration" is created by the user admin (admin@example.com)
+      And the form emails are stored in the outbox
+
+     When I visit "/forms/event-registration"
+      And I fill the "validation_email" input with "hello@example.com"
+      And I validate the form
+     Then I should have 0 email in my mailbox
+      And 1 queued email should be pending
+
+     When I send the queued emails
+     Then I should receive at hello@example.com a validation email from noreply@example.com
+
+     When I click on the validation link
+      And I validate the form
+     Then I should see the form landing page "Event Registration"
+      And I should have 0 email in my mailbox
+      And 2 queued emails should be pending
+
+     When I send the queued emails
+     Then I should receive at hello@example.com a confirmation email from noreply@example.com about the form "Event Registration"
+      And the form admin (admin@example.com) should receive an information email from noreply@example.com about the form "Event Registration"
+      And 3 queued emails should be sent
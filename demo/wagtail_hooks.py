@@ -14,8 +14,11 @@ from wagtail.contrib.forms.wagtail_hooks import FormsMenuItem
 from wagtail.models import Page
 
 from demo.models import CustomFormSubmission, FormPage, wfp
+from wagtail_form_plugins.streamfield import register_statistics_urls, serve_fields_validation
 
 hooks.register("insert_global_admin_css", wfp.injected_admin_css)
+hooks.register("on_serve_page", serve_fields_validation, order=1)
+hooks.register("register_admin_urls", register_statistics_urls)
 
 
 @hooks.register("register_page_listing_buttons")
@@ -0,0 +1,7 @@
+"""Email digests: gather the form submissions to send them later in a single email."""
+
+from .models import DigestEntry
+
+__all__ = [
+    "DigestEntry",
+]
@@ -0,0 +1,36 @@
+"""Models definition for the email digests, storing the submissions waiting to be sent."""
+
+from datetime import datetime
+
+from django.db import models
+from django.utils import timezone
+
+from wagtail.models import Page
+
+
+class DigestEntry(models.Model):
+    """A form submission waiting to be sent in the digest of an email block."""
+
+    page = models.ForeignKey(Page, on_delete=models.CASCADE)
+    block_id = models.CharField(max_length=64)
+    submission_id = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        """Return the string representation of the digest entry."""
+        return f"submission {self.submission_id} of {self.page.title} for email {self.block_id}"
+
+    @staticmethod
+    def send_due_digests(now: datetime | None = None) -> int:
+        """Send the digests that are due, for all the forms. Return the amount of sent digests."""
+        now = now or timezone.now()
+        digests = list(DigestEntry.objects.values_list("page_id", "block_id").distinct())
+        pages = Page.objects.filter(pk__in={page_id for page_id, _ in digests}).specific()
+        pages_by_id = {page.pk: page for page in pages}
+
+        sent = 0
+        for page_id, block_id in digests:
+            send_digest_email = getattr(pages_by_id.get(page_id), "send_digest_email", None)
+            if send_digest_email is not None and send_digest_email(block_id, now):
+                sent += 1
+        return sent
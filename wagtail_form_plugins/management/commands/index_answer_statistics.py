@@ -0,0 +1,34 @@
+"""Define the `index_answer_statistics` Django command, rebuilding the answer statistics."""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from wagtail.models import Page
+
+from wagtail_form_plugins.streamfield.models import StreamFieldFormPage
+from wagtail_form_plugins.streamfield.statistics import AnswerStatistic
+
+
+class Command(BaseCommand):
+    """The management command class."""
+
+    help = "Rebuild the answer statistics from the submissions, for the forms collecting them."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("--page", type=int, action="append", help="Id of a form page.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Submissions per batch.")
+
+    def handle(self, *_args, **options) -> None:
+        """Handle the "index_answer_statistics" command."""
+        pages = Page.objects.specific()
+        if options["page"]:
+            pages = pages.filter(pk__in=options["page"])
+
+        for page in pages:
+            if isinstance(page, StreamFieldFormPage) and page.collect_answer_statistics:
+                amount = AnswerStatistic.rebuild(
+                    page.pk, page.get_form_fields(), page.get_submissions(), options["batch_size"]
+                )
+                self.stdout.write(f"{amount} submission(s) counted for {page.title}.")
@@ -0,0 +1,59 @@
+"""Define the `index_submission_text` Django command, rebuilding the submissions search index."""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from wagtail.models import Page
+
+from wagtail_form_plugins.streamfield.models import StreamFieldFormPage
+from wagtail_form_plugins.streamfield.search import FTS_TABLE, SubmissionText
+
+
+class Command(BaseCommand):
+    """The management command class."""
+
+    help = "Rebuild the full-text search index of the submissions, for the forms indexing them."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("--page", type=int, action="append", help="Id of a form page.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Submissions per batch.")
+
+    def handle(self, *_args, **options) -> None:
+        """Handle the "index_submission_text" command."""
+        pages = Page.objects.specific()
+        if options["page"]:
+            pages = pages.filter(pk__in=options["page"])
+
+        for page in pages:
+            if isinstance(page, StreamFieldFormPage) and page.index_submission_text:
+                amount = self.index_page(page, options["batch_size"])
+                self.stdout.write(f"{amount} submission(s) indexed for {page.title}.")
+
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")  # noqa: S608
+
+    def index_page(self, page: StreamFieldFormPage, batch_size: int) -> int:
+        """Rebuild the search index of a form page, return the amount of submissions."""
+        form_fields = page.get_form_fields()
+        formatters = page.get_field_value_formatters(in_html=False)
+        submissions = page.get_submission_class().objects.filter(page=page)
+
+        with transaction.atomic():
+            SubmissionText.objects.filter(page=page).delete()
+            amount = 0
+            texts: list[SubmissionText] = []
+            for submission in submissions.iterator(chunk_size=batch_size):
+                content = SubmissionText.get_content(form_fields, formatters, submission.form_data)
+                texts.append(
+                    SubmissionText(page=page, submission_id=submission.pk, content=content)
+                )
+                amount += 1
+                if len(texts) >= batch_size:
+                    SubmissionText.objects.bulk_create(texts)
+                    texts = []
+            SubmissionText.objects.bulk_create(texts)
+        return amount
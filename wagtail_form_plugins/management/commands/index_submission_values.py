@@ -0,0 +1,53 @@
+"""Define the `index_submission_values` Django command, rebuilding the submission values table."""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wagtail.models import Page
+
+from wagtail_form_plugins.streamfield.models import StreamFieldFormPage
+from wagtail_form_plugins.streamfield.values import SubmissionValue
+
+
+class Command(BaseCommand):
+    """The management command class."""
+
+    help = "Rebuild the typed values of the submissions, for the forms indexing them."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("--page", type=int, action="append", help="Id of a form page.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Submissions per batch.")
+
+    def handle(self, *_args, **options) -> None:
+        """Handle the "index_submission_values" command."""
+        pages = Page.objects.specific()
+        if options["page"]:
+            pages = pages.filter(pk__in=options["page"])
+
+        for page in pages:
+            if isinstance(page, StreamFieldFormPage) and page.index_submission_values:
+                amount = self.index_page(page, options["batch_size"])
+                self.stdout.write(f"{amount} submission(s) indexed for {page.title}.")
+
+    def index_page(self, page: StreamFieldFormPage, batch_size: int) -> int:
+        """Rebuild the submission values of a form page, return the amount of submissions."""
+        form_fields = page.get_form_fields()
+        submissions = page.get_submission_class().objects.filter(page=page)
+
+        with transaction.atomic():
+            SubmissionValue.objects.filter(page=page).delete()
+            amount = 0
+            values: list[SubmissionValue] = []
+            for submission in submissions.iterator(chunk_size=batch_size):
+                values += SubmissionValue.from_form_data(
+                    page.pk, submission.pk, form_fields, submission.form_data
+                )
+                amount += 1
+                if len(values) >= batch_size:
+                    SubmissionValue.objects.bulk_create(values)
+                    values = []
+            SubmissionValue.objects.bulk_create(values)
+        return amount
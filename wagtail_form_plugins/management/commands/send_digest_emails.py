@@ -0,0 +1,29 @@
+"""Define the `send_digest_emails` Django command, sending the due digests of the form emails."""
+
+from argparse import ArgumentParser
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from wagtail_form_plugins.digest import DigestEntry
+
+
+class Command(BaseCommand):
+    """The management command class."""
+
+    help = "Send the digests of the form e-mails that are due."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("--loop", action="store_true", help="Keep waiting for new digests.")
+        parser.add_argument("--interval", type=float, default=60, help="Seconds between loops.")
+
+    def handle(self, *_args, **options) -> None:
+        """Handle the "send_digest_emails" command."""
+        while True:
+            sent = DigestEntry.send_due_digests()
+            if sent:
+                self.stdout.write(f"{sent} digest(s) sent.")
+            if not options["loop"]:
+                break
+            sleep(options["interval"])
@@ -0,0 +1,38 @@
+"""Define the `send_queued_emails` Django command, sending the emails stored in the outbox."""
+
+from argparse import ArgumentParser
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from wagtail_form_plugins.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    """The management command class."""
+
+    help = "Send the e-mails stored in the outbox, retrying the failed ones later."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("--batch-size", type=int, default=50, help="E-mails sent per batch.")
+        parser.add_argument("--max-attempts", type=int, default=5, help="Attempts per e-mail.")
+        parser.add_argument("--loop", action="store_true", help="Keep waiting for new e-mails.")
+        parser.add_argument("--interval", type=float, default=10, help="Seconds between loops.")
+
+    def handle(self, *_args, **options) -> None:
+        """Handle the "send_queued_emails" command."""
+        worker = OutboxWorker(
+            batch_size=options["batch_size"], max_attempts=options["max_attempts"]
+        )
+
+        try:
+            while True:
+                sent = worker.run_once()
+                if sent:
+                    self.stdout.write(f"{sent} e-mail(s) sent.")
+                if not options["loop"]:
+                    break
+                sleep(options["interval"])
+        finally:
+            worker.close()
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_form_plugins', '0004_digestentry'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_id', models.PositiveBigIntegerField()),
+                ('slug', models.CharField(max_length=255)),
+                ('number', models.FloatField(null=True)),
+                ('date', models.DateTimeField(null=True)),
+                ('text', models.CharField(blank=True, max_length=255)),
+                ('choice', models.CharField(blank=True, max_length=32)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='wagtailcore.page')),
+            ],
+            options={
+                'verbose_name': 'submission value',
+                'indexes': [models.Index(fields=['page', 'submission_id'], name='wagtail_for_page_id_72845d_idx'), models.Index(fields=['page', 'slug', 'number', 'submission_id'], name='wagtail_for_page_id_da0963_idx'), models.Index(fields=['page', 'slug', 'date', 'submission_id'], name='wagtail_for_page_id_896a71_idx'), models.Index(fields=['page', 'slug', 'text', 'submission_id'], name='wagtail_for_page_id_443ad6_idx'), models.Index(fields=['page', 'slug', 'choice', 'submission_id'], name='wagtail_for_page_id_434b69_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLE = 'wagtail_form_plugins_submissiontext'
+FTS_TABLE = 'wagtail_form_plugins_submissiontext_fts'
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        content, content='{TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRESQL_CREATE = [
+    f"CREATE INDEX {FTS_TABLE} ON {TABLE} USING gin (to_tsvector('simple', content))",
+]
+
+POSTGRESQL_DROP = [
+    f"DROP INDEX IF EXISTS {FTS_TABLE}",
+]
+
+
+def create_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRESQL_CREATE}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRESQL_DROP}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_form_plugins', '0005_submissionvalue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_id', models.PositiveBigIntegerField()),
+                ('content', models.TextField(blank=True)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='wagtailcore.page')),
+            ],
+            options={
+                'verbose_name': 'submission text',
+                'constraints': [models.UniqueConstraint(fields=('page', 'submission_id'), name='unique_submission_text')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
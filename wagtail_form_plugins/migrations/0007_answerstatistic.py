@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_form_plugins', '0006_submissiontext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.CharField(blank=True, max_length=255)),
+                ('key', models.CharField(blank=True, max_length=32)),
+                ('count', models.BigIntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('minimum', models.FloatField(null=True)),
+                ('maximum', models.FloatField(null=True)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='wagtailcore.page')),
+            ],
+            options={
+                'verbose_name': 'answer statistic',
+                'constraints': [models.UniqueConstraint(fields=('page', 'slug', 'key'), name='unique_answer_statistic')],
+            },
+        ),
+    ]
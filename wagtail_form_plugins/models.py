@@ -0,0 +1,9 @@
+"""Models of the app that are not defined by the form pages, registered when the app is loaded."""
+
+from .digest.models import DigestEntry
+from .outbox.models import QueuedEmail
+
+__all__ = [
+    "DigestEntry",
+    "QueuedEmail",
+]
@@ -0,0 +1,10 @@
+"""Email outbox: store the emails to send in the database, then send them from a worker."""
+
+from .models import QueuedEmail, QueuedEmailProvider
+from .worker import OutboxWorker
+
+__all__ = [
+    "OutboxWorker",
+    "QueuedEmail",
+    "QueuedEmailProvider",
+]
@@ -0,0 +1,86 @@
+"""Models definition for the email outbox, used to send emails outside of the request."""
+
+from collections.abc import Sequence
+from typing import Any, ClassVar
+
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from wagtail_form_plugins.utils import EmailConnectionProvider
+
+
+class QueuedEmail(models.Model):
+    """An email waiting to be sent by an outbox worker."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENDING = "sending", _("Sending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    message = models.JSONField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes: ClassVar = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self) -> str:
+        """Return the string representation of the queued email."""
+        return f"{self.message.get('subject', '')} to {', '.join(self.message.get('to', []))}"
+
+    @classmethod
+    def from_email_message(cls, email: EmailMessage) -> "QueuedEmail":
+        """Build a queued email from an email message, without saving it."""
+        message: dict[str, Any] = {
+            "subject": str(email.subject),
+            "body": email.body,
+            "from_email": email.from_email,
+            "to": list(email.to),
+            "cc": list(email.cc),
+            "bcc": list(email.bcc),
+            "reply_to": list(email.reply_to),
+            "headers": dict(email.extra_headers),
+            "alternatives": [
+                [str(content), mimetype] for content, mimetype in getattr(email, "alternatives", [])
+            ],
+        }
+        return cls(message=message)
+
+    def to_email_message(self) -> EmailMultiAlternatives:
+        """Rebuild the email message to send."""
+        message = self.message
+        return EmailMultiAlternatives(
+            subject=message["subject"],
+            body=message["body"],
+            from_email=message["from_email"],
+            to=message["to"],
+            cc=message["cc"],
+            bcc=message["bcc"],
+            reply_to=message["reply_to"],
+            headers=message["headers"],
+            alternatives=[tuple(alternative) for alternative in message["alternatives"]],
+        )
+
+
+class QueuedEmailProvider(EmailConnectionProvider):
+    """
+    An email connection provider that stores the emails in the outbox instead of sending them.
+
+    The emails are saved in the current transaction, so they are only sent by an outbox worker if
+    the submission that produced them is saved.
+    """
+
+    transactional = True
+
+    def send_messages(self, emails: Sequence[EmailMessage]) -> int:
+        """Add the emails to the outbox and return the amount of queued emails."""
+        queued_emails = [QueuedEmail.from_email_message(email) for email in emails]
+        return len(QueuedEmail.objects.bulk_create(queued_emails))
@@ -0,0 +1,148 @@
+"""The outbox worker, sending the queued emails in batches and retrying the failed ones."""
+
+from datetime import timedelta
+from smtplib import SMTPException, SMTPServerDisconnected
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from wagtail_form_plugins.utils import (
+    EmailConnectionProvider,
+    PooledEmailConnectionProvider,
+    get_logger,
+)
+
+from .models import QueuedEmail
+
+LOGGER = get_logger(__file__)
+
+
+def is_connection_error(error: Exception) -> bool:
+    """Return True if the error broke the connection, rather than being specific to an email."""
+    if isinstance(error, SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, SMTPException)
+
+
+class OutboxWorker:
+    """Claim the due queued emails, send them and schedule retries with an exponential backoff."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        provider: EmailConnectionProvider | None = None,
+        *,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        backoff_base: float = 60,
+        backoff_max: float = 3600,
+        lease_time: float = 300,
+    ) -> None:
+        self.provider = provider or PooledEmailConnectionProvider()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_time = lease_time
+
+    def get_backoff_delay(self, attempts: int) -> timedelta:
+        """Return the delay before the next attempt, doubled after each failed attempt."""
+        return timedelta(seconds=min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max))
+
+    def claim(self) -> list[QueuedEmail]:
+        """
+        Lock a batch of due emails for this worker.
+
+        Rows locked by other workers are skipped where the database supports it. Emails claimed by
+        a worker that stopped before the end of its lease are claimed again.
+        """
+        now = timezone.now()
+        due = Q(status=QueuedEmail.Status.PENDING, next_attempt_at__lte=now) | Q(
+            status=QueuedEmail.Status.SENDING, locked_until__lt=now
+        )
+        skip_locked = connection.features.has_select_for_update_skip_locked
+
+        with transaction.atomic():
+            queued_emails = list(
+                QueuedEmail.objects.select_for_update(skip_locked=skip_locked)
+                .filter(due)
+                .order_by("next_attempt_at", "pk")[: self.batch_size]
+            )
+            QueuedEmail.objects.filter(pk__in=[email.pk for email in queued_emails]).update(
+                status=QueuedEmail.Status.SENDING,
+                locked_until=now + timedelta(seconds=self.lease_time),
+            )
+
+        return queued_emails
+
+    def send(self, queued_emails: list[QueuedEmail]) -> int:
+        """
+        Send the given emails through a single connection, return the amount of sent emails.
+
+        An email refused by the server is retried later on its own, while a connection error fails
+        the rest of the batch, so the broken connection is not reused.
+        """
+        if not queued_emails:
+            return 0
+
+        results: dict[int, Exception | None] = {}
+        try:
+            with self.provider.connection() as email_connection:
+                for queued_email in queued_emails:
+                    try:
+                        email_connection.send_messages([queued_email.to_email_message()])
+                        results[queued_email.pk] = None
+                    except Exception as err:  # noqa: PERF203
+                        results[queued_email.pk] = err
+                        if is_connection_error(err):  # the pool must discard the connection
+                            raise
+        except Exception as err:  # noqa: BLE001 - the connection could not be opened, or broke
+            for queued_email in queued_emails:
+                results.setdefault(queued_email.pk, err)
+
+        for queued_email in queued_emails:
+            self.save_result(queued_email, results[queued_email.pk])
+
+        return sum(error is None for error in results.values())
+
+    def save_result(self, queued_email: QueuedEmail, error: Exception | None) -> None:
+        """Mark the email as sent, or schedule its next attempt if it failed."""
+        now = timezone.now()
+        queued_email.attempts += 1
+        queued_email.locked_until = None
+
+        if error is None:
+            queued_email.status = QueuedEmail.Status.SENT
+            queued_email.sent_at = now
+            queued_email.last_error = ""
+        else:
+            LOGGER.warning("failed to send queued email %s: %s", queued_email.pk, error)
+            queued_email.last_error = f"{type(error).__name__}: {error}"
+            if queued_email.attempts >= self.max_attempts:
+                queued_email.status = QueuedEmail.Status.FAILED
+            else:
+                queued_email.status = QueuedEmail.Status.PENDING
+                queued_email.next_attempt_at = now + self.get_backoff_delay(queued_email.attempts)
+
+        queued_email.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "locked_until",
+                "sent_at",
+                "last_error",
+                "next_attempt_at",
+            ]
+        )
+
+    def close(self) -> None:
+        """Close the email connections kept open by the worker."""
+        if isinstance(self.provider, PooledEmailConnectionProvider):
+            self.provider.close()
+
+    def run_once(self) -> int:
+        """Send all the due emails, batch after batch, and return the amount of sent emails."""
+        sent = 0
+        while queued_emails := self.claim():
+            sent += self.send(queued_emails)
+        return sent
@@ -8,7 +8,9 @@ from wagtail_form_plugins.streamfield.plugin import Plugin
 from .blocks import ConditionalFieldsFormBlock
 from .dicts import FormattedRuleDict, RuleBlockDict, RuleBlockValueDict
 from .form_field import ConditionalFieldsFormField
+from .graph import RuleGraph
 from .models import ConditionalFieldsFormPage
+from .rules import CompiledRule
 
 
 class ConditionalFields(Plugin):
@@ -25,10 +27,12 @@ class ConditionalFields(Plugin):
 
 
 __all__ = [
+    "CompiledRule",
     "ConditionalFieldsFormBlock",
     "ConditionalFieldsFormField",
     "ConditionalFieldsFormPage",
     "FormattedRuleDict",
     "RuleBlockDict",
     "RuleBlockValueDict",
+    "RuleGraph",
 ]
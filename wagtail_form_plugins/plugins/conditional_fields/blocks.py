@@ -1,5 +1,6 @@
 """Block-related classes for conditional fields plugin."""
 
+from collections.abc import Iterable
 from uuid import UUID
 
 from django.core.exceptions import ValidationError
@@ -9,11 +10,13 @@ from django.utils.translation import gettext_lazy as _
 
 from wagtail import blocks
 from wagtail.admin.telepath import register as register_adapter
-from wagtail.blocks import struct_block
+from wagtail.blocks import StreamValue, StructValue, struct_block
 
 from wagtail_form_plugins.streamfield import blocks as streamfield_blocks
 from wagtail_form_plugins.utils import LocalBlocks
 
+from .graph import RuleGraph
+
 
 class ChoiceError(ValidationError):
     """A validation error used when the selected choice is not available."""
@@ -26,6 +29,17 @@ class ChoiceError(ValidationError):
         )
 
 
+def get_rule_block_targets(rules: Iterable[StructValue]) -> set[str]:
+    """Return the block ids of the fields used in the given rule block values, recursively."""
+    targets = set()
+    for rule in rules:
+        if rule["field"] in ["and", "or"]:
+            targets |= get_rule_block_targets(rule.get("rules", []))
+        elif rule["field"]:
+            targets.add(rule["field"])
+    return targets
+
+
 def validate_field(value: str) -> None:
     """Validate a field input used in rules, which can be either a and/or, or the field id."""
     if value in ["and", "or"]:
@@ -171,3 +185,37 @@ class ConditionalFieldsFormBlock(streamfield_blocks.StreamFieldFormBlock):
         local_blocks.append(("rule", rule))
 
         return local_blocks
+
+    def clean(self, value: StreamValue, *args, **kwargs) -> StreamValue:
+        """Reject rules that refer to unknown fields or that form a dependency cycle."""
+        cleaned = super().clean(value, *args, **kwargs)
+
+        indexes = {child.id: idx for idx, child in enumerate(cleaned) if child.id}
+        graph = RuleGraph(
+            {
+                child.id: get_rule_block_targets(child.value.get("rule", []))
+                for child in cleaned
+                if child.id
+            }
+        )
+        errors = {}
+
+        for block_id, targets in graph.get_unknown_targets().items():
+            errors[indexes[block_id]] = ValidationError(
+                _("The visibility condition refers to a field that does not exist (%(ids)s)."),
+                "unknown_field",
+                {"ids": ", ".join(sorted(targets))},
+            )
+
+        cycle = graph.find_cycle()
+        for block_id in cycle:
+            errors[indexes[block_id]] = ValidationError(
+                _("The visibility conditions of fields %(fields)s depend on each other."),
+                "rule_cycle",
+                {"fields": ", ".join(f"n°{indexes[cycle_id] + 1}" for cycle_id in cycle)},
+            )
+
+        if errors:
+            raise blocks.StreamBlockValidationError(block_errors=errors)
+
+        return cleaned
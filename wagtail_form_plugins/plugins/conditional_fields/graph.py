@@ -0,0 +1,61 @@
+"""Dependency graph between conditional fields, used to evaluate and validate their rules."""
+
+from collections.abc import Iterable, Mapping
+from functools import cached_property
+from graphlib import CycleError, TopologicalSorter
+
+
+class RuleGraph:
+    """A directed graph where each field points to the fields used in its visibility condition."""
+
+    def __init__(self, dependencies: Mapping[str, Iterable[str]]) -> None:
+        self.dependencies = {node: frozenset(targets) for node, targets in dependencies.items()}
+
+    @cached_property
+    def dependents(self) -> dict[str, set[str]]:
+        """Return the fields whose visibility condition directly use each field."""
+        dependents: dict[str, set[str]] = {}
+        for node, targets in self.dependencies.items():
+            for target in targets:
+                dependents.setdefault(target, set()).add(node)
+        return dependents
+
+    @cached_property
+    def order(self) -> tuple[str, ...]:
+        """Return the fields sorted so that each field comes after the fields it depends on."""
+        try:
+            return tuple(TopologicalSorter(self.dependencies).static_order())
+        except CycleError:  # the form was published before cycles were rejected
+            return tuple(self.dependencies)
+
+    @cached_property
+    def positions(self) -> dict[str, int]:
+        """Return the position of each field in the topological order."""
+        return {node: position for position, node in enumerate(self.order)}
+
+    def find_cycle(self) -> list[str]:
+        """Return the fields involved in a dependency cycle, or an empty list if there is none."""
+        try:
+            TopologicalSorter(self.dependencies).prepare()
+        except CycleError as err:
+            return list(dict.fromkeys(err.args[1]))
+        return []
+
+    def get_unknown_targets(self) -> dict[str, set[str]]:
+        """Return the targets that are not in the graph, indexed by the fields that use them."""
+        unknown = {
+            node: set(targets - self.dependencies.keys())
+            for node, targets in self.dependencies.items()
+        }
+        return {node: targets for node, targets in unknown.items() if targets}
+
+    def get_affected(self, node: str) -> list[str]:
+        """Return the given field and all the fields depending on it, in topological order."""
+        affected = {node}
+        pending = [node]
+        while pending:
+            for dependent in self.dependents.get(pending.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return sorted(affected, key=lambda affected_node: self.positions.get(affected_node, -1))
@@ -1,108 +1,133 @@
 """Models definition for the Conditional Fields form plugin."""
 
 import json
-from collections.abc import Callable
+from collections.abc import Iterable
 from typing import Any
 
-from django.contrib.auth.models import User
-from django.forms import BaseForm
+from django.forms import Field
 
 from wagtail_form_plugins.streamfield.models import StreamFieldFormPage
 
-from .dicts import FormattedRuleDict
 from .form_field import ConditionalFieldsFormField
-
-Operation = Callable[[Any, Any], bool]
-
-
-OPERATIONS: dict[str, Operation] = {
-    "eq": lambda a, b: a == b,
-    "neq": lambda a, b: a != b,
-    "is": lambda a, b: a == b,
-    "nis": lambda a, b: a != b,
-    "lt": lambda a, b: isinstance(a, int) and isinstance(b, int) and a < b,
-    "lte": lambda a, b: isinstance(a, int) and isinstance(b, int) and a <= b,
-    "ut": lambda a, b: isinstance(a, int) and isinstance(b, int) and a > b,
-    "ute": lambda a, b: isinstance(a, int) and isinstance(b, int) and a >= b,
-    "bt": lambda a, b: isinstance(a, int) and isinstance(b, int) and a < b,
-    "bte": lambda a, b: isinstance(a, int) and isinstance(b, int) and a <= b,
-    "at": lambda a, b: isinstance(a, int) and isinstance(b, int) and a > b,
-    "ate": lambda a, b: isinstance(a, int) and isinstance(b, int) and a >= b,
-    "ct": lambda a, b: isinstance(a, list) and b in a,
-    "nct": lambda a, b: isinstance(a, list) and b not in a,
-    "c": lambda a, _b: bool(a),
-    "nc": lambda a, _b: not a,
-}
+from .graph import RuleGraph
+from .rules import CompiledRule
 
 
 class ConditionalFieldsFormPage(StreamFieldFormPage):
     """Form page used to add conditional fields functionnality to a form."""
 
-    def get_form(self, *args, page: StreamFieldFormPage, user: User, **kwargs) -> BaseForm:
-        """Build and return the form instance."""
-        form = super().get_form(*args, page=page, user=user, **kwargs)
-
-        form_fields: dict[str, ConditionalFieldsFormField] = self.get_form_fields_dict()  # ty: ignore[ invalid-assignment]
-
-        for field_slug, field_value in form.fields.items():
-            form_field = form_fields[field_slug]
-            if form_field.rule:
-                field_value.widget.attrs["data-rule"] = json.dumps(form_field.rule)
-
-        form.full_clean()
-        return form
-
-    def process_rule(
+    def prepare_form_field(self, form_field: ConditionalFieldsFormField, field: Field) -> None:  # ty: ignore invalid-method-override
+        """Add the rule as json in the widget attributes, used to hide the field on client side."""
+        super().prepare_form_field(form_field, field)
+
+        if form_field.rule:
+            field.widget.attrs["data-rule"] = json.dumps(form_field.rule)
+
+    def get_compiled_rules(self) -> dict[str, CompiledRule]:
+        """Return the rules of the form fields compiled into predicates, indexed by field slug."""
+        schema = self.get_form_schema()
+
+        def compile_rules() -> dict[str, CompiledRule]:
+            fields: list[ConditionalFieldsFormField] = list(schema.fields)  # ty: ignore[invalid-assignment]
+            return {
+                fld.slug: CompiledRule.from_rule(fld.rule, schema.fields_by_block_id)
+                for fld in fields
+                if fld.rule
+            }
+
+        return schema.derive("compiled_rules", compile_rules)
+
+    def get_rule_graph(self) -> RuleGraph:
+        """Return the dependency graph of the form fields, indexed by slug."""
+        schema = self.get_form_schema()
+
+        def build_graph() -> RuleGraph:
+            compiled_rules = self.get_compiled_rules()
+            return RuleGraph(
+                {
+                    fld.slug: rule.targets if (rule := compiled_rules.get(fld.slug)) else ()
+                    for fld in schema.fields
+                }
+            )
+
+        return schema.derive("rule_graph", build_graph)
+
+    def get_enabled_fields_dependencies(self) -> set[str]:
+        """Return the slugs of the fields used in the rules of the form fields."""
+        compiled_rules = self.get_compiled_rules()
+        rule_dependencies = {slug for rule in compiled_rules.values() for slug in rule.targets}
+        return super().get_enabled_fields_dependencies() | rule_dependencies
+
+    def get_dependent_fields(self, field_slugs: list[str]) -> list[str]:
+        """Return the slugs of the fields whose rule depends on the given fields, transitively."""
+        graph = self.get_rule_graph()
+        dependent_fields = {
+            slug
+            for field_slug in field_slugs
+            if field_slug in graph.dependencies
+            for slug in graph.get_affected(field_slug)
+            if slug != field_slug
+        }
+        return [
+            *super().get_dependent_fields(field_slugs),
+            *sorted(dependent_fields, key=graph.positions.__getitem__),
+        ]
+
+    def evaluate_rules(
         self,
-        fields: dict[str, ConditionalFieldsFormField],
         form_data: dict[str, Any],
-        rule: FormattedRuleDict,
-    ) -> bool:
-        """Process the rule by applying the operator with left and right operands."""
-        if "bool_opr" in rule and "subrules" in rule:
-            results = [self.process_rule(fields, form_data, sr) for sr in rule["subrules"]]
-            return all(results) if rule["bool_opr"] == "and" else any(results)
-
-        if "entry" not in rule:
-            msg = "Either an entry or a bool_opr + subrules should be stored in the rule dict."
-            raise ValueError(msg)
-
-        entry = rule["entry"]
-        target_id = entry["target"] if "entry" in rule else None
-        target_field = next(field for field in fields.values() if field.block_id == target_id)
-        this_value = form_data[target_field.slug]
-        that_value = entry["val"]
-
-        func = OPERATIONS[entry["opr"]]
-
-        try:
-            return func(this_value, that_value)
-        except Exception as err:
-            msg = f"error when solving rule: {this_value} {entry['opr']} {that_value}"
-            raise ArithmeticError(msg) from err
-
-    def get_enabled_fields(self, form_data: dict[str, Any]) -> list[str]:
+        enabled_fields: set[str],
+        field_slugs: Iterable[str],
+    ) -> None:
+        """
+        Update the enabled fields set by evaluating the rules of the given fields, in order.
+
+        The fields must be sorted topologically, so a field disabled by its rule also disables the
+        fields depending on it.
+        """
+        compiled_rules = self.get_compiled_rules()
+        for field_slug in field_slugs:
+            rule = compiled_rules.get(field_slug)
+            if rule is not None and not rule.predicate(form_data, enabled_fields):
+                enabled_fields.discard(field_slug)
+
+    def compute_enabled_fields(self, form_data: dict[str, Any]) -> list[str]:
         """Return the fields slug list where the computed conditional value of the field is true."""
-        enabled_fields = super().get_enabled_fields(form_data)
-        fields_dict: dict[str, ConditionalFieldsFormField] = self.get_form_fields_dict()  # ty: ignore[invalid-assignment]
-
-        new_enabled_fields = []
-        for field_slug in enabled_fields:
-            field = fields_dict[field_slug]
+        base_enabled_fields = super().compute_enabled_fields(form_data)
+        enabled_fields = set(base_enabled_fields)
+        self.evaluate_rules(form_data, enabled_fields, self.get_rule_graph().order)
+        return [slug for slug in base_enabled_fields if slug in enabled_fields]
 
-            if field.rule is None:
-                new_enabled_fields.append(field_slug)
-                continue
-
-            is_rule_true = self.process_rule(fields_dict, form_data, field.rule)
-            target = field.rule["entry"]["target"] if "entry" in field.rule else None
-            matches = [fld for fld in fields_dict.values() if fld.block_id == target]
-            is_rule_field_enabled = "bool_opr" in field.rule or matches[0].slug in enabled_fields
-
-            if is_rule_true and is_rule_field_enabled:
-                new_enabled_fields.append(field_slug)
-
-        return new_enabled_fields
+    def update_enabled_fields(
+        self,
+        form_data: dict[str, Any],
+        enabled_fields: list[str],
+        changed_fields: list[str],
+    ) -> list[str]:
+        """
+        Return the enabled fields after a change on the given fields, based on the previous ones.
+
+        Only the changed fields and the fields depending on them, directly or not, are re-evaluated.
+        """
+        graph = self.get_rule_graph()
+        positions = graph.positions
+        affected_fields = sorted(
+            {
+                slug
+                for changed_field in changed_fields
+                for slug in graph.get_affected(changed_field)
+            },
+            key=lambda slug: positions.get(slug, -1),
+        )
+        new_enabled_fields = set(enabled_fields)
+        for field_slug in affected_fields:
+            if form_data.get(field_slug) is None:
+                new_enabled_fields.discard(field_slug)
+            else:
+                new_enabled_fields.add(field_slug)
+
+        self.evaluate_rules(form_data, new_enabled_fields, affected_fields)
+        return [fld.slug for fld in self.get_form_schema().fields if fld.slug in new_enabled_fields]
 
     class Meta:
         abstract = True
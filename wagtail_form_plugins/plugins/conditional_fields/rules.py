@@ -0,0 +1,160 @@
+"""Compile the conditional fields rules into predicates evaluated against the form data."""
+
+from collections.abc import Callable, Mapping
+from collections.abc import Set as AbstractSet
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from wagtail_form_plugins.streamfield.form_field import StreamFieldFormField
+
+from .dicts import FormattedRuleDict
+from .utils import date_to_timestamp, datetime_to_timestamp, time_to_timestamp
+
+Operation = Callable[[Any, Any], bool]
+Coercer = Callable[[Any], Any]
+Predicate = Callable[[Mapping[str, Any], AbstractSet[str]], bool]
+
+
+def is_number(value: Any) -> bool:  # noqa: ANN401
+    """Return True if the value is a number that can be ordered, excluding booleans."""
+    return isinstance(value, int | float | Decimal) and not isinstance(value, bool)
+
+
+def is_ordered(opr: Callable[[Any, Any], bool]) -> Operation:
+    """Return an operation applying the given comparison only if both operands are numbers."""
+    return lambda a, b: is_number(a) and is_number(b) and opr(a, b)
+
+
+OPERATIONS: dict[str, Operation] = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "is": lambda a, b: a == b,
+    "nis": lambda a, b: a != b,
+    "lt": is_ordered(lambda a, b: a < b),
+    "lte": is_ordered(lambda a, b: a <= b),
+    "ut": is_ordered(lambda a, b: a > b),
+    "ute": is_ordered(lambda a, b: a >= b),
+    "bt": is_ordered(lambda a, b: a < b),
+    "bte": is_ordered(lambda a, b: a <= b),
+    "at": is_ordered(lambda a, b: a > b),
+    "ate": is_ordered(lambda a, b: a >= b),
+    "ct": lambda a, b: isinstance(a, list) and b in a,
+    "nct": lambda a, b: isinstance(a, list) and b not in a,
+    "c": lambda a, _b: bool(a),
+    "nc": lambda a, _b: not a,
+}
+
+
+def coerce_number(value: Any) -> Decimal | None:  # noqa: ANN401
+    """Return the value as a decimal, such as a cleaned or serialized number field value."""
+    if value is None or value == "":
+        return None
+    try:
+        return value if isinstance(value, Decimal) else Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def coerce_timestamp(to_timestamp: Callable[[str], int]) -> Coercer:
+    """Return a function converting a date, time or datetime value to a timestamp, like the JS."""
+
+    def coerce(value: date | time | datetime | str | None) -> int | None:
+        if not value:
+            return None
+        str_value = value if isinstance(value, str) else value.isoformat()
+        try:
+            return to_timestamp(str_value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    return coerce
+
+
+COERCERS: dict[str, Coercer] = {
+    "number": coerce_number,
+    "date": coerce_timestamp(date_to_timestamp),
+    "time": coerce_timestamp(time_to_timestamp),
+    "datetime": coerce_timestamp(datetime_to_timestamp),
+}
+
+
+def compile_entry(target: StreamFieldFormField, opr: str, that_value: Any) -> Predicate:  # noqa: ANN401
+    """
+    Compile a rule entry into a predicate, with the target slug and operands resolved.
+
+    As on the client side, the entry is false when its target field is disabled.
+    """
+    func = OPERATIONS[opr]
+    slug = target.slug
+    coerce = COERCERS.get(target.type)
+    if coerce is not None and opr not in ("c", "nc"):
+        that_value = coerce_number(that_value) if is_number(that_value) else coerce(that_value)
+
+    def predicate(form_data: Mapping[str, Any], enabled_fields: AbstractSet[str]) -> bool:
+        if slug not in enabled_fields:
+            return False
+        this_value = form_data.get(slug)
+        if coerce is not None:
+            this_value = coerce(this_value)
+        try:
+            return func(this_value, that_value)
+        except Exception as err:
+            msg = f"error when solving rule: {this_value} {opr} {that_value}"
+            raise ArithmeticError(msg) from err
+
+    return predicate
+
+
+def compile_rule(
+    rule: FormattedRuleDict,
+    fields_by_block_id: Mapping[str, StreamFieldFormField],
+) -> Predicate:
+    """Recursively compile a formatted rule into a short-circuiting predicate."""
+    if "bool_opr" in rule and "subrules" in rule:
+        predicates = [compile_rule(sub_rule, fields_by_block_id) for sub_rule in rule["subrules"]]
+        if rule["bool_opr"] == "and":
+            return lambda form_data, enabled: all(pred(form_data, enabled) for pred in predicates)
+        return lambda form_data, enabled: any(pred(form_data, enabled) for pred in predicates)
+
+    if "entry" not in rule:
+        msg = "Either an entry or a bool_opr + subrules should be stored in the rule dict."
+        raise ValueError(msg)
+
+    entry = rule["entry"]
+    target = fields_by_block_id.get(entry["target"])
+    if target is None:  # the target field has been removed from the form
+        return lambda _form_data, _enabled: False
+
+    return compile_entry(target, entry["opr"], entry["val"])
+
+
+def get_rule_targets(rule: FormattedRuleDict) -> set[str]:
+    """Return the block ids of the fields used in the given rule."""
+    if "entry" in rule:
+        return {rule["entry"]["target"]}
+    return {
+        target for sub_rule in rule.get("subrules", []) for target in get_rule_targets(sub_rule)
+    }
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A field rule compiled into a predicate, along with the slugs of the fields it depends on."""
+
+    predicate: Predicate
+    targets: frozenset[str]
+
+    @classmethod
+    def from_rule(
+        cls,
+        rule: FormattedRuleDict,
+        fields_by_block_id: Mapping[str, StreamFieldFormField],
+    ) -> "CompiledRule":
+        """Compile a field rule, resolving its targets to slugs."""
+        targets = [fields_by_block_id.get(target) for target in get_rule_targets(rule)]
+        return cls(
+            predicate=compile_rule(rule, fields_by_block_id),
+            targets=frozenset(target.slug for target in targets if target),
+        )
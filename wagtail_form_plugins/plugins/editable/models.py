@@ -2,6 +2,7 @@
 
 from typing import Any
 
+from django.db import transaction
 from django.forms.fields import CharField
 from django.forms.widgets import FileInput, HiddenInput, TextInput
 from django.http import HttpRequest, HttpResponseRedirect
@@ -10,6 +11,7 @@ from django.template.response import TemplateResponse
 from django.urls import reverse
 
 from wagtail_form_plugins.streamfield.models import StreamFieldFormPage
+from wagtail_form_plugins.streamfield.side_tables import sync_side_tables
 
 
 class EditableFormPage(StreamFieldFormPage):
@@ -25,7 +27,6 @@ class EditableFormPage(StreamFieldFormPage):
         for field in form_fields:
             if isinstance(field.widget, FileInput):
                 field.required = False
-        form.full_clean()
 
         if form.is_valid():
             file_fields = [
@@ -38,9 +39,13 @@ class EditableFormPage(StreamFieldFormPage):
                 k: v if (k not in file_fields or v) else submission.form_data[k]
                 for k, v in submission_data["form_data"].items()
             }
+            old_form_data = submission.form_data
             for attr_key, attr_value in submission_data.items():
                 setattr(submission, attr_key, attr_value)
-            submission.save()
+            with transaction.atomic():
+                submission.save()
+                sync_side_tables(self, submission, old_form_data)
+            self.get_analytics().invalidate()
             redirect_args = {"page_id": self.pk}
             return reverse("wagtailforms:list_submissions", kwargs=redirect_args)
 
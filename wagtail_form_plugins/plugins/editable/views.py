@@ -2,11 +2,10 @@
 
 from django.utils.html import format_html
 
-from wagtail_form_plugins.streamfield.dicts import (
-    SubmissionContextData,
-    SubmissionContextDataHeading,
-)
-from wagtail_form_plugins.streamfield.views import StreamFieldSubmissionsListView
+from wagtail.contrib.forms.models import FormSubmission
+
+from wagtail_form_plugins.streamfield.dicts import SubmissionContextDataHeading
+from wagtail_form_plugins.streamfield.views import ColumnFormatter, StreamFieldSubmissionsListView
 
 from .models import StreamFieldFormPage
 
@@ -16,26 +15,16 @@ class EditableSubmissionsListView(StreamFieldSubmissionsListView):
 
     form_page: StreamFieldFormPage
 
-    def get_context_data(self, **kwargs) -> SubmissionContextData:
-        """Alter submission context data to format results."""
-        context_data = super().get_context_data(**kwargs)
-
-        if self.is_export:
-            return context_data
-
-        header: SubmissionContextDataHeading = {"name": "edit_btn", "label": "Edit", "order": None}
-        context_data["data_headings"].append(header)
-
-        submissions = self.get_submissions(context_data)
-
-        for row_idx, row in enumerate(context_data["data_rows"]):
-            submission = submissions[row["model_id"]]
+    def get_added_columns(self) -> list[tuple[SubmissionContextDataHeading, ColumnFormatter]]:
+        """Add a column containing a link to edit each submission."""
+        form_url = self.form_page_url
+        heading: SubmissionContextDataHeading = {"name": "edit_btn", "label": "Edit", "order": None}
 
-            link_html = format_html(
+        def format_edit_cell(submission: FormSubmission, _cell_value: None) -> str:
+            return format_html(
                 '<a class="w-header-button button" href="{url}?edit={submission_id}">edit</a>',
-                url=submission.page.url,
-                submission_id=row["model_id"],
+                url=form_url,
+                submission_id=submission.pk,
             )
-            context_data["data_rows"][row_idx]["fields"].append(link_html)
 
-        return context_data
+        return [*super().get_added_columns(), (heading, format_edit_cell)]
@@ -3,11 +3,13 @@
 from django.templatetags.static import static
 from django.utils.html import format_html
 
+from wagtail_form_plugins.digest import DigestEntry
 from wagtail_form_plugins.streamfield.plugin import Plugin
 
 from .blocks import EmailsFormBlock, EmailsToSendStructBlock, email_to_block
 from .dicts import EmailsToSendBlockDict
 from .models import EmailActionsFormPage
+from .plan import EmailRenderPlan
 
 
 class EmailActions(Plugin):
@@ -25,8 +27,10 @@ class EmailActions(Plugin):
 
 
 __all__ = [
+    "DigestEntry",
     "EmailActions",
     "EmailActionsFormPage",
+    "EmailRenderPlan",
     "EmailsFormBlock",
     "EmailsToSendBlockDict",
     "EmailsToSendStructBlock",
@@ -53,6 +53,23 @@ class EmailsToSendStructBlock(blocks.StructBlock):
         help_text=_("The body of the e-mail."),
     )
 
+    digest_interval = blocks.IntegerBlock(
+        required=False,
+        min_value=1,
+        label=_("Digest interval"),
+        help_text=_(
+            "Gather the submissions in a digest sent every N minutes, instead of sending an "
+            "e-mail for each submission."
+        ),
+    )
+
+    digest_size = blocks.IntegerBlock(
+        required=False,
+        min_value=1,
+        label=_("Digest size"),
+        help_text=_("Gather the submissions in a digest sent every N submissions."),
+    )
+
     class Meta:
         label = _("E-mail to send")
 
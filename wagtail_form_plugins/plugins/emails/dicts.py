@@ -4,6 +4,8 @@ from typing import TypedDict
 
 from wagtail.rich_text import RichText
 
+from typing_extensions import NotRequired
+
 
 class EmailsToSendBlockDict(TypedDict):
     """A typed dict containing field values in an email form block."""
@@ -13,3 +15,5 @@ class EmailsToSendBlockDict(TypedDict):
     reply_to: str
     subject: str
     message: str | RichText
+    digest_interval: NotRequired[int | None]
+    digest_size: NotRequired[int | None]
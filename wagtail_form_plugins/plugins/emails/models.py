@@ -1,19 +1,29 @@
 """Models definition for the Emails form plugin."""
 
+from collections.abc import Sequence
+from datetime import datetime
 from typing import TYPE_CHECKING
 
+from django.contrib.auth.models import AnonymousUser
 from django.core.mail import EmailMultiAlternatives
+from django.db import connection, transaction
 from django.http import HttpRequest, HttpResponseRedirect
 from django.template.response import TemplateResponse
+from django.utils import timezone
 
+from wagtail_form_plugins.digest import DigestEntry
 from wagtail_form_plugins.streamfield.models import (
     StreamFieldFormatter,
     StreamFieldFormPage,
     StreamFieldFormSubmission,
 )
-from wagtail_form_plugins.utils import build_email, multiline_to_html
+from wagtail_form_plugins.utils import (
+    EmailConnectionProvider,
+    default_email_connection_provider,
+)
 
 from .dicts import EmailsToSendBlockDict
+from .plan import EmailRenderPlan
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import User
@@ -23,9 +33,16 @@ class EmailActionsFormPage(StreamFieldFormPage):
     """Form page for the EmailActions plugin, allowing to send emails when submitting a form."""
 
     emails_field_attr_name = "emails_to_send"
+    email_connection_provider: EmailConnectionProvider = default_email_connection_provider
 
     def serve(self, request: HttpRequest, *args, **kwargs) -> TemplateResponse:
         """Serve the form page."""
+        # the submission and its emails are saved together when the emails are stored in database
+        with self.email_connection_provider.atomic():
+            return self.serve_with_emails(request, *args, **kwargs)
+
+    def serve_with_emails(self, request: HttpRequest, *args, **kwargs) -> TemplateResponse:
+        """Serve the form page, then build and send the e-mails of the submission if any."""
         response = super().serve(request, *args, **kwargs)
 
         if (
@@ -49,12 +66,30 @@ class EmailActionsFormPage(StreamFieldFormPage):
                 text_formatter = None
                 html_formatter = None
 
-            for raw_email in getattr(form_page, self.emails_field_attr_name, []):
-                email = self.build_action_email(raw_email.value, text_formatter, html_formatter)
-                self.send_action_email(email)
+            plans = self.get_email_render_plans()
+            emails = [
+                plan.render(text_formatter, html_formatter) for plan in plans if not plan.is_digest
+            ]
+            submission = response.context_data["form_submission"]
+            self.add_digest_entries(submission, [plan for plan in plans if plan.is_digest])
+            self.send_action_emails(emails)
 
         return response
 
+    def get_email_render_plans(self) -> tuple[EmailRenderPlan, ...]:
+        """Return the render plans of the emails to send, built once per form revision."""
+        return self.get_form_schema().derive(
+            "email_render_plans",
+            lambda: tuple(
+                EmailRenderPlan.from_block_value(
+                    raw_email.value,
+                    templating=hasattr(self, "templating_formatter_class"),
+                    block_id=raw_email.id,
+                )
+                for raw_email in getattr(self, self.emails_field_attr_name, [])
+            ),
+        )
+
     def build_action_email(
         self,
         email_value: EmailsToSendBlockDict,
@@ -62,25 +97,73 @@ class EmailActionsFormPage(StreamFieldFormPage):
         html_formatter: StreamFieldFormatter | None,
     ) -> EmailMultiAlternatives:
         """Build the action email based on the value in an email form block."""
+        templating = hasattr(self, "templating_formatter_class")
+        plan = EmailRenderPlan.from_block_value(email_value, templating=templating)
+        return plan.render(text_formatter, html_formatter)
+
+    def add_digest_entries(
+        self, submission: StreamFieldFormSubmission, plans: Sequence[EmailRenderPlan]
+    ) -> None:
+        """Add the submission to the digests of the given email render plans."""
+        DigestEntry.objects.bulk_create(
+            DigestEntry(page=self, block_id=plan.block_id, submission_id=submission.pk)
+            for plan in plans
+        )
 
-        def format_text(text: str) -> str:
-            return text_formatter.format(text) if text_formatter else text
-
-        def format_html(text: str) -> str:
-            return html_formatter.format(text) if html_formatter else multiline_to_html(text)
+    def send_digest_email(self, block_id: str, now: datetime | None = None) -> bool:
+        """
+        Send the digest of an email block if it is due, and return True if it has been sent.
 
-        return build_email(
-            subject=format_text(email_value["subject"]),
-            message=format_text(str(email_value["message"])),
-            from_email=format_text(email_value["from_email"]),
-            recipient_list=format_text(email_value["recipient_list"]),
-            reply_to=format_text(email_value["reply_to"]),
-            html_message=format_html(str(email_value["message"])),
+        The digest entries are locked until the digest is sent, so concurrent workers skip them.
+        """
+        plan = next(
+            (plan for plan in self.get_email_render_plans() if plan.block_id == block_id), None
         )
-
-    def send_action_email(self, email: EmailMultiAlternatives) -> None:
-        """Send an e-mail. Can be overrided to change behaviour."""
-        email.send()
+        if plan is None:  # the email block has been removed
+            DigestEntry.objects.filter(page=self, block_id=block_id).delete()
+            return False
+
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        with transaction.atomic():
+            entries = list(
+                DigestEntry.objects.select_for_update(skip_locked=skip_locked)
+                .filter(page=self, block_id=block_id)
+                .order_by("created_at")
+            )
+            now = now or timezone.now()
+            if not entries or not plan.is_digest_due(len(entries), entries[0].created_at, now):
+                return False
+
+            submissions = list(
+                self.get_submission_class()
+                .objects.filter(pk__in=[entry.submission_id for entry in entries])
+                .order_by("submit_time")
+            )
+            if submissions:
+                self.send_action_emails([self.build_digest_email(plan, submissions)])
+            DigestEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+
+        return bool(submissions)
+
+    def build_digest_email(
+        self, plan: EmailRenderPlan, submissions: Sequence[StreamFieldFormSubmission]
+    ) -> EmailMultiAlternatives:
+        """Build the digest email of a batch of submissions, from the render plan of its block."""
+        if not hasattr(self, "templating_formatter_class"):
+            return plan.render(None, None)
+
+        fmt_class: type[StreamFieldFormatter] = self.templating_formatter_class  # ty: ignore invalid-assignment
+        user = AnonymousUser()
+        last_submission = submissions[-1]
+        with self.use_form_context():
+            return plan.render(
+                fmt_class(self, user, last_submission, in_html=False, batch=submissions),  # ty: ignore unknown-argument
+                fmt_class(self, user, last_submission, in_html=True, batch=submissions),  # ty: ignore unknown-argument
+            )
+
+    def send_action_emails(self, emails: list[EmailMultiAlternatives]) -> None:
+        """Send the e-mails of a submission through a single connection. Can be overrided."""
+        self.email_connection_provider.send_messages(emails)
 
     class Meta:
         abstract = True
@@ -0,0 +1,91 @@
+"""Email render plans, holding the parts of an email that do not depend on the submission."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.core.mail import EmailMultiAlternatives
+from django.utils.html import strip_tags
+
+from wagtail_form_plugins.streamfield.models import StreamFieldFormatter
+from wagtail_form_plugins.utils import build_email, multiline_to_html
+
+from .dicts import EmailsToSendBlockDict
+
+
+def html_to_text(html: str) -> str:
+    """Convert the html message of an email to its text alternative."""
+    return strip_tags(html.replace("</p>", "\n"))
+
+
+@dataclass(frozen=True)
+class EmailRenderPlan:
+    """
+    An email block converted once per form revision.
+
+    The rich text message is expanded, converted to text and, without templating, to linkified
+    html. When templating is enabled, the parts are templates whose variables are replaced at
+    send time, so only the submission values are formatted for each email.
+    """
+
+    subject: str
+    message_text: str
+    message_html: str
+    from_email: str
+    recipient_list: str
+    reply_to: str
+    block_id: str = ""
+    digest_interval: int | None = None
+    digest_size: int | None = None
+
+    @classmethod
+    def from_block_value(
+        cls, email_value: EmailsToSendBlockDict, *, templating: bool, block_id: str = ""
+    ) -> "EmailRenderPlan":
+        """Build the render plan of an email form block value."""
+        message = str(email_value["message"])
+        return cls(
+            block_id=block_id,
+            digest_interval=email_value.get("digest_interval"),
+            digest_size=email_value.get("digest_size"),
+            subject=email_value["subject"],
+            message_text=html_to_text(message),
+            message_html=message if templating else multiline_to_html(message),
+            from_email=email_value["from_email"],
+            recipient_list=email_value["recipient_list"],
+            reply_to=email_value["reply_to"],
+        )
+
+    @property
+    def is_digest(self) -> bool:
+        """Return True if the submissions are gathered in a digest instead of sent one by one."""
+        return bool(self.digest_interval or self.digest_size)
+
+    def is_digest_due(self, size: int, first_entry_date: datetime, now: datetime) -> bool:
+        """Return True if a digest of the given size, started at the given date, should be sent."""
+        if not self.is_digest:
+            return True
+        if self.digest_size and size >= self.digest_size:
+            return True
+        interval = timedelta(minutes=self.digest_interval) if self.digest_interval else None
+        return interval is not None and first_entry_date + interval <= now
+
+    def render(
+        self,
+        text_formatter: StreamFieldFormatter | None,
+        html_formatter: StreamFieldFormatter | None,
+    ) -> EmailMultiAlternatives:
+        """Build the email of a submission, replacing the template variables with its values."""
+
+        def format_text(text: str) -> str:
+            return text_formatter.format(text) if text_formatter else text
+
+        return build_email(
+            subject=format_text(self.subject),
+            message=html_formatter.format(self.message_html)
+            if html_formatter
+            else self.message_html,
+            from_email=format_text(self.from_email),
+            recipient_list=format_text(self.recipient_list),
+            reply_to=format_text(self.reply_to),
+            text_message=format_text(self.message_text),
+        )
@@ -1,7 +1,7 @@
 """Models definition for the File Input form plugin."""
 
 import uuid
-from datetime import date, datetime, time, timezone
+from datetime import datetime, timezone
 from pathlib import Path
 
 from django.conf import settings
@@ -10,7 +10,7 @@ from django.forms import BaseForm
 
 from wagtail_form_plugins.streamfield.dicts import SubmissionData
 from wagtail_form_plugins.streamfield.forms import StreamFieldFormField
-from wagtail_form_plugins.streamfield.models import StreamFieldFormPage
+from wagtail_form_plugins.streamfield.models import FieldValueFormatter, StreamFieldFormPage
 
 from .views import FileInputSubmissionsListView
 
@@ -72,20 +72,17 @@ class FileInputFormPage(StreamFieldFormPage):
 
         return submission_data
 
-    def format_field_value(
+    def get_field_value_formatter(
         self,
         form_field: StreamFieldFormField,
-        value: str | list | date | time | datetime | None,
         *,
         in_html: bool,
-    ) -> str | None:
-        """Format the field value. Used to display user-friendly values in result table."""
-        fmt_value = super().format_field_value(form_field, value, in_html=in_html)
-
+    ) -> FieldValueFormatter:
+        """Return a function formatting the values of a form field, such as file urls."""
         if form_field.type == "file":
-            return (settings.WAGTAILADMIN_BASE_URL + fmt_value) if value else None
+            return lambda value: (settings.WAGTAILADMIN_BASE_URL + value) if value else None
 
-        return fmt_value
+        return super().get_field_value_formatter(form_field, in_html=in_html)
 
     class Meta:
         abstract = True
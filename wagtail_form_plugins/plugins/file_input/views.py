@@ -1,33 +1,29 @@
 """View classes for the File Input plugin."""
 
+from typing import Any
+
 from django.utils.html import format_html
 
-from wagtail_form_plugins.streamfield.dicts import SubmissionContextData
-from wagtail_form_plugins.streamfield.views import StreamFieldSubmissionsListView
+from wagtail.contrib.forms.models import FormSubmission
+
+from wagtail_form_plugins.streamfield.views import ColumnFormatter, StreamFieldSubmissionsListView
 
 
 class FileInputSubmissionsListView(StreamFieldSubmissionsListView):
     """Customize lists submissions view, such as adding a link on file fields for each row."""
 
-    def get_context_data(self, **kwargs) -> SubmissionContextData:
-        """Alter submission context data to display a link to the file."""
-        context_data = super().get_context_data(**kwargs)
-
-        if self.is_export:
-            return context_data
-
-        header = self.get_header(context_data)
-        fields = self.form_page.get_form_fields_dict()
+    def get_column_formatter(self, column: str, *, in_html: bool) -> ColumnFormatter:
+        """Return a function formatting the cells of a column, displaying a link to the files."""
+        formatter = super().get_column_formatter(column, in_html=in_html)
+        field = self.form_page.get_form_fields_dict().get(column)
+        if not in_html or field is None or field.type != "file":
+            return formatter
 
-        for row_idx, row in enumerate(context_data["data_rows"]):
-            for col_idx, value in enumerate(row["fields"]):
-                field_slug = header[col_idx]
-                is_file = field_slug in fields and fields[field_slug].type == "file"
-                if is_file and isinstance(value, str) and value != "-":
-                    file_link = self.get_file_link(value, to_html=True)
-                    context_data["data_rows"][row_idx]["fields"][col_idx] = file_link
+        def format_file_cell(submission: FormSubmission, cell_value: Any) -> Any:  # noqa: ANN401
+            file_url = formatter(submission, cell_value)
+            return self.get_file_link(file_url, to_html=True) if file_url else file_url
 
-        return context_data
+        return format_file_cell
 
     @staticmethod
     def get_file_link(file_url: str, *, to_html: bool) -> str:
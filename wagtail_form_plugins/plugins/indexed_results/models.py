@@ -33,7 +33,7 @@ class IndexedResultsFormSubmission(StreamFieldFormSubmission):
 
         return super().save(*args, **kwargs)
 
-    class Meta:
+    class Meta(StreamFieldFormSubmission.Meta):
         abstract = True
 
 
@@ -4,6 +4,7 @@ from wagtail_form_plugins.streamfield.plugin import Plugin
 
 from .models import AuthFormPage, AuthFormSubmission
 from .panels import UniqueResponseFieldPanel
+from .views import AuthFormSubmissionsListView
 
 
 class AuthForm(Plugin):
@@ -15,11 +16,13 @@ class AuthForm(Plugin):
 
     form_page_class = AuthFormPage
     form_submission_class = AuthFormSubmission
+    submission_list_view_class = AuthFormSubmissionsListView
 
 
 __all__ = [
     "AuthForm",
     "AuthFormPage",
     "AuthFormSubmission",
+    "AuthFormSubmissionsListView",
     "UniqueResponseFieldPanel",
 ]
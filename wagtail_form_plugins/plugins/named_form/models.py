@@ -35,7 +35,7 @@ class AuthFormSubmission(StreamFieldFormSubmission):
             "email": self.user.email if self.user else "-",
         }
 
-    class Meta:
+    class Meta(StreamFieldFormSubmission.Meta):
         abstract = True
 
 
@@ -83,13 +83,20 @@ class AuthFormPage(StreamFieldFormPage):
 
         return submission_data
 
-    def serve(self, request: HttpRequest, *args, **kwargs) -> TemplateResponse:
-        """Serve the form page."""
-        response = super().serve(request, *args, **kwargs)
-
+    def check_unique_response(self, request: HttpRequest) -> None:
+        """Raise PermissionDenied if the form has a unique response already given by the user."""
         if self.unique_response and self.get_user_submissions_qs(request.user).exists():
             raise PermissionDenied(_("You have already filled in this form."))
 
+    def check_form_access(self, request: HttpRequest) -> None:
+        """Raise PermissionDenied if the user may not fill in the form."""
+        super().check_form_access(request)
+        self.check_unique_response(request)
+
+    def serve(self, request: HttpRequest, *args, **kwargs) -> TemplateResponse:
+        """Serve the form page."""
+        response = super().serve(request, *args, **kwargs)
+        self.check_unique_response(request)
         return response
 
     class Meta:
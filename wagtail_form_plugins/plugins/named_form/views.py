@@ -0,0 +1,11 @@
+"""View classes for the Named Form plugin."""
+
+from wagtail_form_plugins.streamfield.views import StreamFieldSubmissionsListView
+
+
+class AuthFormSubmissionsListView(StreamFieldSubmissionsListView):
+    """Customize lists submissions view, fetching the submission users along with them."""
+
+    def get_select_related(self) -> list[str]:
+        """Fetch the users displayed in the user and email columns, in the submissions query."""
+        return [*super().get_select_related(), "user"]
@@ -35,7 +35,7 @@ class NavButtonsSubmissionsListView(StreamFieldSubmissionsListView):
             ),
             HeaderButton(
                 label=__("View form"),
-                url=self.form_page.url,
+                url=self.form_page_url,
                 classname="forms-btn-secondary",
                 icon_name="view",
                 attrs={"target": "_blank"},
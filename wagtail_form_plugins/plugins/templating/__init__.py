@@ -9,6 +9,7 @@ from .blocks import TemplatingFormBlock
 from .dicts import DataDict, FormDataDict, ResultDataDict, UserDataDict
 from .formatter import TemplatingFormatter
 from .models import TemplatingFormPage
+from .template import CompiledTemplate, Placeholder, compile_template
 
 
 class Templating(Plugin):
@@ -27,12 +28,15 @@ class Templating(Plugin):
 
 
 __all__ = [
+    "CompiledTemplate",
     "DataDict",
     "FormDataDict",
+    "Placeholder",
     "ResultDataDict",
     "Templating",
     "TemplatingFormBlock",
     "TemplatingFormPage",
     "TemplatingFormatter",
     "UserDataDict",
+    "compile_template",
 ]
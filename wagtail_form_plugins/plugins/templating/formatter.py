@@ -1,5 +1,8 @@
 """Classes and variables used to format the template syntax."""
 
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from typing import Any, ClassVar
+
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser, User
 from django.utils.html import format_html
@@ -8,30 +11,90 @@ from django.utils.translation import gettext as _
 from wagtail.admin.admin_url_finder import AdminURLFinder
 from wagtail.admin.panels import RichText
 
-from wagtail_form_plugins.streamfield.models import StreamFieldFormatter
+from wagtail_form_plugins.streamfield.context import freeze
+from wagtail_form_plugins.streamfield.models import StreamFieldFormatter, StreamFieldFormSubmission
 from wagtail_form_plugins.utils import format_list, validate_slug
 
 from .dicts import DataDict, FormDataDict, ResultDataDict, UserDataDict
+from .template import TMPL_SEP_LEFT, TMPL_SEP_RIGHT, Placeholder, compile_template
 
-TMPL_SEP_LEFT = "{"
-TMPL_SEP_RIGHT = "}"
 TMPL_DYNAMIC_PREFIXES = ["field_label", "field_value"]
 
 
 class TemplatingFormatter(StreamFieldFormatter):
-    """Class used to format the template syntax."""
+    """
+    Class used to format the template syntax.
+
+    Template data is computed lazily by prefix, only for the variables used in the formatted
+    messages, and memoized on the formatter instance. The data of the prefixes that do not depend
+    on the html mode is also shared in the form context, between the formatters of a submission.
+    Override `get_data_getters` to customize the template lazily, or `get_data` to compute all the
+    template data at once.
+
+    When a batch of submissions is given, the `result` variables describe the whole batch, which
+    is used to format digests.
+    """
+
+    shared_prefixes: ClassVar[tuple[str, ...]] = ("user", "author", "form")
+
+    def __init__(self, *args, batch: Sequence[StreamFieldFormSubmission] = (), **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.batch = tuple(batch)
+        self.prefix_data: dict[str, Mapping[str, Any] | None] = {}
+        self.resolved_values: dict[str, str | None] = {}
+        self.overridden_data: DataDict | None = None
+
+    def get_data_getters(self) -> dict[str, Callable[[], Mapping[str, Any] | None]]:
+        """Return the functions computing the template data of each key prefix."""
+        return {
+            "user": lambda: self.get_user_data(self.user),
+            "author": lambda: self.get_user_data(self.form_page.owner),
+            "form": self.get_form_data,
+            "result": lambda: (
+                self.get_batch_result_data()
+                if self.batch
+                else self.get_result_data(self.get_formated_fields())
+            ),
+            "field_label": lambda: {
+                slug: label for slug, (label, _value) in self.get_formated_fields().items()
+            },
+            "field_value": lambda: {
+                slug: value for slug, (_label, value) in self.get_formated_fields().items()
+            },
+        }
+
+    def get_prefix_data(self, prefix: str) -> Mapping[str, Any] | None:
+        """Return the template data of the given key prefix, computing it on first access."""
+        if prefix not in self.prefix_data:
+            getter = self.get_data_getters().get(prefix)
+            if getter is None:
+                self.prefix_data[prefix] = None
+            elif prefix in self.shared_prefixes:
+                shared_key = self.get_shared_data_key(prefix)
+                self.prefix_data[prefix] = self.form_page.form_context.get_or_compute(
+                    shared_key, getter
+                )
+            else:
+                self.prefix_data[prefix] = getter()
+        return self.prefix_data[prefix]
+
+    def get_shared_data_key(self, prefix: str) -> Hashable:
+        """Return the key used to share the data of a prefix between the formatters."""
+        submission_id = self.submission.pk if self.submission else None
+        return ("template_data", type(self), prefix, getattr(self.user, "pk", None), submission_id)
 
     def get_data(self) -> DataDict:
         """Return the template data. Override to customize template."""
-        formated_fields = self.get_formated_fields()
-        return {
-            "user": self.get_user_data(self.user),
-            "author": self.get_user_data(self.form_page.owner),
-            "form": self.get_form_data(),
-            "result": self.get_result_data(formated_fields),
-            "field_label": {f_id: f_label for f_id, [f_label, f_value] in formated_fields.items()},
-            "field_value": {f_id: f_value for f_id, [f_label, f_value] in formated_fields.items()},
-        }
+        return {prefix: self.get_prefix_data(prefix) for prefix in self.get_data_getters()}  # ty: ignore[invalid-return-type]
+
+    def get_template_data(self, prefix: str) -> Mapping[str, Any] | None:
+        """Return the data of a key prefix, from `get_data` if a subclass overrides it."""
+        if type(self).get_data is TemplatingFormatter.get_data:
+            return self.get_prefix_data(prefix)
+
+        if self.overridden_data is None:
+            self.overridden_data = self.get_data()
+        return self.overridden_data.get(prefix)
 
     def get_values(self) -> dict[str, str]:
         """Return a dict containing all formatter values on the root level."""
@@ -44,19 +107,30 @@ class TemplatingFormatter(StreamFieldFormatter):
 
         return values
 
-    def get_formated_fields(self) -> dict[str, tuple[str, str]]:
+    def get_formated_fields(
+        self, submission: StreamFieldFormSubmission | None = None
+    ) -> dict[str, tuple[str, str]]:
         """Return a dict containing a tuple of label and formatted value for each form field."""
-        if not self.submission:
+        submission = submission or self.submission
+        if not submission:
             return {}
 
+        form_data = submission.form_data
+        return self.form_page.form_context.get_or_compute(
+            ("formated_fields", freeze(form_data), self.in_html),
+            lambda: self.compute_formated_fields(form_data),
+        )
+
+    def compute_formated_fields(self, form_data: dict[str, Any]) -> dict[str, tuple[str, str]]:
+        """Compute the label and formatted value of each enabled field of the given form data."""
         fmt_fields = {}
-        enabled_fields = self.form_page.get_enabled_fields(self.submission.form_data)
+        enabled_fields = set(self.form_page.get_enabled_fields(form_data))
 
         for field in self.form_page.get_form_fields():
             if field.slug not in enabled_fields:
                 continue
 
-            value = self.submission.form_data[field.slug]
+            value = form_data[field.slug]
             fmt_value = self.form_page.format_field_value(field, value, in_html=self.in_html)
             if fmt_value is not None:
                 fmt_fields[field.slug] = (field.label, fmt_value)
@@ -92,37 +166,62 @@ class TemplatingFormatter(StreamFieldFormatter):
         if not self.submission:
             return None
 
-        values = [
-            format_html("{lbl}: {val}", lbl=lbl, val=val) for lbl, val in formated_fields.values()
-        ]
-        fmt_list = format_list(values, "◦", in_html=self.in_html)
-
         return {
-            "data": fmt_list,
+            "data": self.format_result_fields(formated_fields),
             "publish_date": self.submission.submit_time.strftime("%d/%m/%Y"),
             "publish_time": self.submission.submit_time.strftime("%H:%M"),
         }
 
+    def get_batch_result_data(self) -> ResultDataDict:
+        """Return a dict used to format template variables related to a batch of submissions."""
+        items = []
+        for submission in self.batch:
+            title = submission.submit_time.strftime("%d/%m/%Y %H:%M")
+            data = self.format_result_fields(self.get_formated_fields(submission))
+            if self.in_html:
+                items.append(format_html("{title}{data}", title=title, data=data))
+            else:
+                items.append(title + data.replace("\n", "\n  "))
+
+        last_submission = self.batch[-1]
+        return {
+            "data": format_list(items, "•", in_html=self.in_html),
+            "publish_date": last_submission.submit_time.strftime("%d/%m/%Y"),
+            "publish_time": last_submission.submit_time.strftime("%H:%M"),
+        }
+
+    def format_result_fields(self, formated_fields: dict[str, tuple[str, str]]) -> str:
+        """Format the labels and values of the fields of a submission as a list."""
+        values = [
+            format_html("{lbl}: {val}", lbl=lbl, val=val) for lbl, val in formated_fields.values()
+        ]
+        return format_list(values, "◦", in_html=self.in_html)
+
     def format(self, message: str | RichText) -> str:
         """Format the message template by replacing template variables."""
-        fmt_message = str(message)
-        for val_key, value in self.get_values().items():
-            look_for = TMPL_SEP_LEFT + val_key + TMPL_SEP_RIGHT
-            if look_for in fmt_message:
-                replaced = "" if value is None else str(value)
-                fmt_message = fmt_message.replace(look_for, replaced)
+        return compile_template(str(message)).render(self.resolve)
 
-        # handle disabled fields
-        for field in self.form_page.get_form_fields():
-            look_for = TMPL_SEP_LEFT + "field_value." + field.slug + TMPL_SEP_RIGHT
-            if look_for in fmt_message:
-                fmt_message = fmt_message.replace(look_for, "---")
+    def resolve(self, placeholder: Placeholder) -> str | None:
+        """Return the value of a template variable, or None if it is not a known variable."""
+        if placeholder.raw not in self.resolved_values:
+            self.resolved_values[placeholder.raw] = self.compute_value(placeholder)
+        return self.resolved_values[placeholder.raw]
 
-            look_for = TMPL_SEP_LEFT + "field_label." + field.slug + TMPL_SEP_RIGHT
-            if look_for in fmt_message:
-                fmt_message = fmt_message.replace(look_for, field.label)
+    def compute_value(self, placeholder: Placeholder) -> str | None:
+        """Compute the value of a template variable from the data of its prefix."""
+        data = self.get_template_data(placeholder.prefix)
+        if data is not None and placeholder.suffix in data:
+            value = data[placeholder.suffix]
+            return "" if value is None else str(value)
+
+        # handle disabled fields
+        fields = self.form_page.get_form_fields_dict()
+        if placeholder.prefix == "field_value" and placeholder.suffix in fields:
+            return "---"
+        if placeholder.prefix == "field_label" and placeholder.suffix in fields:
+            return fields[placeholder.suffix].label
 
-        return fmt_message
+        return None
 
     @classmethod
     def doc(cls) -> dict[str, dict[str, tuple[str, str]]]:
@@ -183,20 +282,16 @@ class TemplatingFormatter(StreamFieldFormatter):
     @classmethod
     def contains_template(cls, text: str) -> bool:
         """Return True if the given text contain a template, False otherwise."""
-        for tmpl_prefix, tmpl_suffixes in cls.doc().items():
-            if tmpl_prefix in TMPL_DYNAMIC_PREFIXES:
-                continue
+        doc = cls.doc()
+        placeholders = compile_template(text).placeholders
 
-            for tmpl_suffix in tmpl_suffixes:
-                template = f"{TMPL_SEP_LEFT}{tmpl_prefix}.{tmpl_suffix}{TMPL_SEP_RIGHT}"
-                if template in text:
-                    return True
+        for prefix, suffix, _raw in placeholders:
+            if prefix not in TMPL_DYNAMIC_PREFIXES and suffix in doc.get(prefix, {}):
+                return True
 
-        for tmpl_prefix in TMPL_DYNAMIC_PREFIXES:
-            sep = f"{TMPL_SEP_LEFT}{tmpl_prefix}."
-            tmpl_suffix = [*text.split(sep, 1), ""][1].split(TMPL_SEP_RIGHT, 1)[0]
-            if tmpl_suffix:
-                validate_slug(tmpl_suffix)
+        for placeholder in placeholders:
+            if placeholder.prefix in TMPL_DYNAMIC_PREFIXES:
+                validate_slug(placeholder.suffix)
                 return True
 
         if TMPL_SEP_LEFT in text or TMPL_SEP_RIGHT in text:
@@ -0,0 +1,65 @@
+"""Message templates, parsed once into literal and placeholder segments, rendered in one pass."""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.conf import settings
+
+TMPL_SEP_LEFT = "{"
+TMPL_SEP_RIGHT = "}"
+PLACEHOLDER_REGEX = re.compile(
+    re.escape(TMPL_SEP_LEFT) + r"(\w+)\.([^{}\s]+)" + re.escape(TMPL_SEP_RIGHT)
+)
+
+
+class Placeholder(NamedTuple):
+    """A template variable, such as `{field_value.my_field}`."""
+
+    prefix: str
+    suffix: str
+    raw: str
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split into a sequence of literal strings and placeholders."""
+
+    source: str
+    segments: tuple[str | Placeholder, ...]
+    placeholders: tuple[Placeholder, ...]
+
+    def render(self, resolve: Callable[[Placeholder], str | None]) -> str:
+        """Render the template, leaving as is the placeholders that can not be resolved."""
+        if not self.placeholders:
+            return self.source
+
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            else:
+                value = resolve(segment)
+                parts.append(segment.raw if value is None else value)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=getattr(settings, "FORMS_TEMPLATE_CACHE_SIZE", 512))
+def compile_template(template: str) -> CompiledTemplate:
+    """Parse the template in a single pass. Compiled templates are cached by template string."""
+    segments: list[str | Placeholder] = []
+    position = 0
+
+    for match in PLACEHOLDER_REGEX.finditer(template):
+        if match.start() > position:
+            segments.append(template[position : match.start()])
+        segments.append(Placeholder(match.group(1), match.group(2), match.group(0)))
+        position = match.end()
+
+    if position < len(template):
+        segments.append(template[position:])
+
+    placeholders = tuple(segment for segment in segments if isinstance(segment, Placeholder))
+    return CompiledTemplate(template, tuple(segments), placeholders)
@@ -7,6 +7,7 @@ from typing import Any, ClassVar
 
 from django.conf import settings
 from django.contrib import messages
+from django.core.exceptions import PermissionDenied
 from django.core.mail import EmailMultiAlternatives
 from django.db import models
 from django.forms import BaseForm, EmailField, Form
@@ -19,7 +20,11 @@ from wagtail.models import Page
 
 from wagtail_form_plugins.streamfield.dicts import SubmissionData
 from wagtail_form_plugins.streamfield.models import StreamFieldFormPage, StreamFieldFormSubmission
-from wagtail_form_plugins.utils import build_email
+from wagtail_form_plugins.utils import (
+    EmailConnectionProvider,
+    build_email,
+    default_email_connection_provider,
+)
 
 
 class ValidationForm(Form):
@@ -66,7 +71,7 @@ class ValidationFormSubmission(StreamFieldFormSubmission):
             data["email"] = self.email
         return data
 
-    class Meta:
+    class Meta(StreamFieldFormSubmission.Meta):
         abstract = True
 
 
@@ -79,6 +84,7 @@ class ValidationFormPage(StreamFieldFormPage):
     token_validation_from_email = ""
     token_validation_reply_to: ClassVar = []
     token_validation_expiration_delay = 60
+    email_connection_provider: EmailConnectionProvider = default_email_connection_provider
 
     validation_title = models.CharField(
         verbose_name=_("E-mail title"),
@@ -112,6 +118,17 @@ class ValidationFormPage(StreamFieldFormPage):
 
         return submission_data
 
+    def check_form_access(self, request: HttpRequest) -> None:
+        """Raise PermissionDenied if an anonymous user did not give a valid token."""
+        super().check_form_access(request)
+        if not request.user.is_anonymous:
+            return
+
+        self.flush()
+        token_value = request.POST.get("wfp_token")
+        if not ValidationToken.objects.filter(page=self, token_value=token_value).exists():
+            raise PermissionDenied(_("This token is not valid."))
+
     def serve(self, request: HttpRequest, *args, **kwargs) -> TemplateResponse:
         """Serve the form page."""
         # super should not be called at first to prevent submission of an empty form
@@ -126,9 +143,10 @@ class ValidationFormPage(StreamFieldFormPage):
 
                 if form.is_valid():
                     validation_email = form.cleaned_data["validation_email"]
-                    token_value = ValidationToken.create(self, validation_email)
-                    email = self.build_validation_email(validation_email, token_value)
-                    self.send_validation_email(email)
+                    with self.email_connection_provider.atomic():
+                        token_value = ValidationToken.create(self, validation_email)
+                        email = self.build_validation_email(validation_email, token_value)
+                        self.send_validation_email(email)
 
                     msg_str = _(
                         "We just send you an e-mail. Please click on the link to continue the form submission.",  # noqa: E501
@@ -189,7 +207,7 @@ class ValidationFormPage(StreamFieldFormPage):
 
     def send_validation_email(self, email: EmailMultiAlternatives) -> None:
         """Send the validation e-mail."""
-        email.send()
+        self.email_connection_provider.send_messages([email])
 
     class Meta:
         abstract = True
@@ -1,14 +1,31 @@
 """Base classes for plugins, uses Wagtail Streamfields."""
 
+from .analytics import FormAnalytics
 from .blocks import StreamFieldFormBlock
+from .context import FormContext
 from .dicts import StreamFieldDataDict, StreamFieldValueDict, SubmissionData
 from .form_field import StreamFieldFormField
 from .forms import StreamFieldFormBuilder
 from .models import StreamFieldFormPage, StreamFieldFormSubmission
 from .plugin import WagtailFormPlugin
-from .views import StreamFieldSubmissionsListView
+from .schema import FormSchema, FormSchemaCache, form_schema_cache
+from .views import (
+    AnswerAnalyticsJsonView,
+    AnswerStatisticsJsonView,
+    AnswerStatisticsView,
+    StreamFieldSubmissionsListView,
+    register_statistics_urls,
+    serve_fields_validation,
+)
 
 __all__ = [
+    "AnswerAnalyticsJsonView",
+    "AnswerStatisticsJsonView",
+    "AnswerStatisticsView",
+    "FormAnalytics",
+    "FormContext",
+    "FormSchema",
+    "FormSchemaCache",
     "StreamFieldDataDict",
     "StreamFieldFormBlock",
     "StreamFieldFormBuilder",
@@ -19,4 +36,7 @@ __all__ = [
     "StreamFieldValueDict",
     "SubmissionData",
     "WagtailFormPlugin",
+    "form_schema_cache",
+    "register_statistics_urls",
+    "serve_fields_validation",
 ]
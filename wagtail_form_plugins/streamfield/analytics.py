@@ -0,0 +1,388 @@
+"""Analytics of the number and temporal answers, computed on contiguous columns of values."""
+
+import math
+import mmap
+import os
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date, datetime, time, timedelta, timezone
+from functools import cached_property
+from importlib.util import find_spec
+from pathlib import Path
+from tempfile import NamedTemporaryFile, mkdtemp
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.db.models import Count, Max, QuerySet
+
+from wagtail_form_plugins.utils import parse_temporal_value, to_float, to_utc
+
+from .form_field import StreamFieldFormField
+
+if TYPE_CHECKING:
+    from .models import StreamFieldFormPage
+
+NUMPY_AVAILABLE = find_spec("numpy") is not None
+
+ANALYTIC_FIELD_TYPES = ("number", "date", "time", "datetime")
+SUBMIT_TIME = "submit_time"
+DAY = 86400
+HOUR = 3600
+
+Column = Sequence[float]
+ColumnToken = tuple[int | None, str, int | None, int]
+
+
+def date_to_seconds(value: Any) -> float | None:  # noqa: ANN401
+    """Return a date value as the POSIX timestamp of its midnight, in UTC."""
+    parsed_value = parse_temporal_value(date, value)
+    return None if parsed_value is None else (parsed_value - date(1970, 1, 1)).days * float(DAY)
+
+
+def time_to_seconds(value: Any) -> float | None:  # noqa: ANN401
+    """Return a time value as the amount of seconds since midnight."""
+    parsed_value = parse_temporal_value(time, value)
+    if parsed_value is None:
+        return None
+    return parsed_value.hour * HOUR + parsed_value.minute * 60 + parsed_value.second
+
+
+def datetime_to_seconds(value: Any) -> float | None:  # noqa: ANN401
+    """Return a datetime value as a POSIX timestamp."""
+    parsed_value = to_utc(value)
+    return None if parsed_value is None else parsed_value.timestamp()
+
+
+COLUMN_CONVERTERS: dict[str, Callable[[Any], float | None]] = {
+    "number": to_float,
+    "date": date_to_seconds,
+    "time": time_to_seconds,
+    "datetime": datetime_to_seconds,
+}
+
+
+def format_value(kind: str, value: float) -> float | str:
+    """Return a column value as a number, or as an ISO string for the temporal columns."""
+    if kind == "date":
+        return (date(1970, 1, 1) + timedelta(days=math.floor(value / DAY))).isoformat()
+    if kind == "time":
+        hours, seconds = divmod(round(value), HOUR)
+        return time(hours % 24, *divmod(seconds, 60)).isoformat()
+    if kind == "datetime":
+        return datetime.fromtimestamp(value, timezone.utc).isoformat()
+    return value
+
+
+class ArrayBackend:
+    """Compute the aggregates on `array` columns, using the builtin functions."""
+
+    @staticmethod
+    def from_buffer(values: array) -> Column:
+        """Return the column of a buffer of doubles."""
+        return values
+
+    @staticmethod
+    def load(path: Path) -> Column:
+        """Return the column of a file of doubles, memory-mapped."""
+        with path.open("rb") as column_file:
+            if os.fstat(column_file.fileno()).st_size == 0:
+                return array("d")
+            return memoryview(mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)).cast("d")
+
+    @staticmethod
+    def sort(values: Column) -> Column:
+        """Return the sorted values."""
+        return array("d", sorted(values))
+
+    @staticmethod
+    def mean(values: Column) -> float:
+        """Return the mean of the values."""
+        return math.fsum(values) / len(values)
+
+    @staticmethod
+    def percentiles(sorted_values: Column, ranks: Sequence[float]) -> list[float]:
+        """Return the percentiles of the sorted values, linearly interpolated."""
+        last = len(sorted_values) - 1
+        results = []
+        for rank in ranks:
+            position = rank / 100 * last
+            low = math.floor(position)
+            high = min(low + 1, last)
+            delta = sorted_values[high] - sorted_values[low]
+            results.append(sorted_values[low] + delta * (position - low))
+        return results
+
+    @staticmethod
+    def histogram(values: Column, bins: int) -> tuple[list[int], list[float]]:
+        """Return the counts and edges of a histogram with evenly spaced bins."""
+        low, high = min(values), max(values)
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        width = (high - low) / bins
+        indexes = Counter(min(int((val - low) / width), bins - 1) for val in values)
+        counts = [indexes[idx] for idx in range(bins)]
+        return counts, [low + idx * width for idx in range(bins + 1)]
+
+    @staticmethod
+    def series(values: Column, period: int) -> dict[float, int]:
+        """Return the amount of values per period, indexed by the period start."""
+        periods = Counter(val // period for val in values)
+        return {start * period: periods[start] for start in sorted(periods)}
+
+
+class NumpyBackend:
+    """Compute the aggregates on NumPy columns, vectorized."""
+
+    @staticmethod
+    def from_buffer(values: array) -> Column:
+        """Return the column of a buffer of doubles, without copying it."""
+        import numpy as np  # noqa: PLC0415
+
+        return np.frombuffer(values, dtype=np.float64)
+
+    @staticmethod
+    def load(path: Path) -> Column:
+        """Return the column of a file of doubles, memory-mapped."""
+        import numpy as np  # noqa: PLC0415
+
+        if path.stat().st_size == 0:
+            return np.empty(0, dtype=np.float64)
+        return np.memmap(path, dtype=np.float64, mode="r")
+
+    @staticmethod
+    def sort(values: Column) -> Column:
+        """Return the sorted values."""
+        import numpy as np  # noqa: PLC0415
+
+        return np.sort(values)
+
+    @staticmethod
+    def mean(values: Column) -> float:
+        """Return the mean of the values."""
+        return float(values.mean())  # ty: ignore unresolved-attribute
+
+    @staticmethod
+    def percentiles(sorted_values: Column, ranks: Sequence[float]) -> list[float]:
+        """Return the percentiles of the sorted values, linearly interpolated."""
+        import numpy as np  # noqa: PLC0415
+
+        return np.percentile(sorted_values, ranks).tolist()
+
+    @staticmethod
+    def histogram(values: Column, bins: int) -> tuple[list[int], list[float]]:
+        """Return the counts and edges of a histogram with evenly spaced bins."""
+        import numpy as np  # noqa: PLC0415
+
+        counts, edges = np.histogram(values, bins=bins)
+        return counts.tolist(), edges.tolist()
+
+    @staticmethod
+    def series(values: Column, period: int) -> dict[float, int]:
+        """Return the amount of values per period, indexed by the period start."""
+        import numpy as np  # noqa: PLC0415
+
+        starts, counts = np.unique(np.floor_divide(values, period), return_counts=True)
+        return dict(zip((starts * period).tolist(), counts.tolist(), strict=True))
+
+
+backend = NumpyBackend() if NUMPY_AVAILABLE else ArrayBackend()
+
+
+class ColumnCache:
+    """
+    An on-disk cache of the submission columns, memory-mapped when loaded.
+
+    A file stores the values of a column as contiguous doubles. Its name contains the token of the
+    submissions it was built from, so the files of outdated tokens are never read.
+
+    The directory is read from the `FORMS_ANALYTICS_CACHE_DIR` setting on each access. It defaults
+    to a subdirectory of the file-based Django cache, or else to a private temporary directory
+    created for the process.
+    """
+
+    directory_name = "wagtail_form_plugins_analytics"
+
+    @cached_property
+    def private_directory(self) -> Path:
+        """Return a temporary directory only readable by the current user, created once."""
+        return Path(mkdtemp(prefix=f"{self.directory_name}_"))
+
+    @property
+    def directory(self) -> Path:
+        """Return the directory of the column files."""
+        directory = getattr(settings, "FORMS_ANALYTICS_CACHE_DIR", None)
+        if directory is not None:
+            return Path(directory)
+
+        cache_settings = settings.CACHES.get(DEFAULT_CACHE_ALIAS, {})
+        if cache_settings.get("BACKEND") == "django.core.cache.backends.filebased.FileBasedCache":
+            return Path(cache_settings["LOCATION"]) / self.directory_name
+        return self.private_directory
+
+    def get_path(self, page_id: int, token: ColumnToken, name: str) -> Path:
+        """Return the path of the file storing a column."""
+        return self.directory / f"{page_id}-{'-'.join(map(str, token))}-{name}.f64"
+
+    def load(self, page_id: int, token: ColumnToken, names: Iterable[str]) -> dict[str, Column]:
+        """Return the cached columns, or an empty dict if one of them is missing."""
+        paths = {name: self.get_path(page_id, token, name) for name in names}
+        try:
+            return {name: backend.load(path) for name, path in paths.items()}
+        except FileNotFoundError:
+            return {}
+
+    def store(self, page_id: int, token: ColumnToken, columns: dict[str, array]) -> None:
+        """Write the columns to disk, replacing the columns of the other tokens."""
+        self.clear(page_id)
+        directory = self.directory
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        for name, values in columns.items():
+            # a unique temporary file, so concurrent workers don't write to the same one
+            with NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as column_file:
+                values.tofile(column_file)
+            Path(column_file.name).replace(self.get_path(page_id, token, name))
+
+    def clear(self, page_id: int) -> None:
+        """Remove the cached columns of a form page."""
+        for path in self.directory.glob(f"{page_id}-*.f64"):
+            path.unlink(missing_ok=True)
+
+
+column_cache = ColumnCache()
+
+
+class FormAnalytics:
+    """
+    Analytics of the number, date, time and datetime answers of a form page.
+
+    The columns are loaded once from the database, then from the on-disk cache; the results are
+    cached until the form is published, a submission is added or removed, or the analytics are
+    invalidated. The cached entries are versioned, so each host ignores its outdated columns.
+    """
+
+    percentile_ranks = (10, 25, 50, 75, 90)
+    histogram_bins = 10
+
+    def __init__(self, page: "StreamFieldFormPage") -> None:
+        self.page = page
+
+    @property
+    def cache_key(self) -> str:
+        """Return the key of the cached results."""
+        return f"wagtail_form_plugins:analytics:{self.page.pk}"
+
+    @property
+    def version_key(self) -> str:
+        """Return the key of the version of the cached entries."""
+        return f"wagtail_form_plugins:analytics_version:{self.page.pk}"
+
+    def get_version(self) -> str:
+        """Return the version of the cached entries, shared by the hosts through the cache."""
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get_fields(self) -> list[StreamFieldFormField]:
+        """Return the form fields having analytics."""
+        return [fld for fld in self.page.get_form_fields() if fld.type in ANALYTIC_FIELD_TYPES]
+
+    def get_submissions(self) -> QuerySet:
+        """Return the submissions of the form page."""
+        return self.page.get_submissions()
+
+    def get_token(self) -> ColumnToken:
+        """Return the state of the submissions: revision, version, last submission and amount."""
+        aggregates = self.get_submissions().aggregate(last_id=Max("pk"), amount=Count("pk"))
+        schema_key = self.page.get_form_schema().key
+        revision = schema_key[1] if schema_key else None
+        return (revision, self.get_version(), aggregates["last_id"], aggregates["amount"])
+
+    def read_columns(self, form_fields: list[StreamFieldFormField]) -> dict[str, array]:
+        """Read the columns from the database in a single query, converting the values once."""
+        columns = {name: array("d") for name in [SUBMIT_TIME, *(fld.slug for fld in form_fields)]}
+        converters = [datetime_to_seconds, *(COLUMN_CONVERTERS[fld.type] for fld in form_fields)]
+        lookups = [f"form_data__{fld.slug}" for fld in form_fields]
+
+        rows = self.get_submissions().values_list(SUBMIT_TIME, *lookups)
+        appenders = [column.append for column in columns.values()]
+        for row in rows.iterator(chunk_size=2000):
+            for value, convert, append in zip(row, converters, appenders, strict=True):
+                converted_value = convert(value)
+                if converted_value is not None:
+                    append(converted_value)
+        return columns
+
+    def get_columns(self, token: ColumnToken) -> dict[str, Column]:
+        """Return the columns from the on-disk cache, reading them from the database if missing."""
+        form_fields = self.get_fields()
+        names = [SUBMIT_TIME, *(fld.slug for fld in form_fields)]
+        columns = column_cache.load(self.page.pk, token, names)
+        if columns:
+            return columns
+
+        buffers = self.read_columns(form_fields)
+        column_cache.store(self.page.pk, token, buffers)
+        return {name: backend.from_buffer(values) for name, values in buffers.items()}
+
+    def summarize_column(self, kind: str, values: Column) -> dict[str, Any]:
+        """Return the aggregates of a column: bounds, mean, percentiles, histogram and series."""
+        summary: dict[str, Any] = {"count": len(values)}
+        if not len(values):
+            return summary
+
+        sorted_values = backend.sort(values)
+        counts, edges = backend.histogram(sorted_values, self.histogram_bins)
+        percentiles = backend.percentiles(sorted_values, self.percentile_ranks)
+        summary |= {
+            "minimum": format_value(kind, sorted_values[0]),
+            "maximum": format_value(kind, sorted_values[-1]),
+            "mean": format_value(kind, backend.mean(sorted_values)),
+            "percentiles": {
+                str(rank): format_value(kind, value)
+                for rank, value in zip(self.percentile_ranks, percentiles, strict=True)
+            },
+            "histogram": {
+                "edges": [format_value(kind, edge) for edge in edges],
+                "counts": counts,
+            },
+        }
+        if kind in ["date", "datetime"]:
+            summary["series"] = {
+                format_value("date", start): amount
+                for start, amount in backend.series(sorted_values, DAY).items()
+            }
+        return summary
+
+    def compute(self, token: ColumnToken) -> dict[str, Any]:
+        """Compute the analytics of all the columns."""
+        columns = self.get_columns(token)
+        fields = {
+            fld.slug: {"label": fld.label, "type": fld.type}
+            | self.summarize_column(fld.type, columns[fld.slug])
+            for fld in self.get_fields()
+        }
+        submissions_per_hour = {
+            format_value("datetime", start): amount
+            for start, amount in backend.series(columns[SUBMIT_TIME], HOUR).items()
+        }
+        return {"submissions_per_hour": submissions_per_hour, "fields": fields}
+
+    def get_results(self) -> dict[str, Any]:
+        """Return the analytics, from the cache if no submission was added or removed since."""
+        token = self.get_token()
+        cached = cache.get(self.cache_key)
+        if cached is not None and cached["token"] == token:
+            return cached["results"]
+
+        results = self.compute(token)
+        cache.set(self.cache_key, {"token": token, "results": results}, None)
+        return results
+
+    def invalidate(self) -> None:
+        """Change the version of the cached analytics and columns, such as after an edit."""
+        cache.set(self.version_key, uuid4().hex, None)
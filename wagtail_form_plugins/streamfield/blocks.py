@@ -379,9 +379,9 @@ class StreamFieldFormBlock(BaseFormBlock):
                 duplicates[slug] = [*duplicates.get(slug, []), idx]
         return {k: v for k, v in duplicates.items() if len(v) > 1}
 
-    def clean(self, value: StreamValue, ignore_required_constraints: bool = False) -> StreamValue:  # noqa: FBT001, FBT002
+    def clean(self, value: StreamValue, *args, **kwargs) -> StreamValue:
         """Add duplicates attribute in the block class."""
-        cleaned = super().clean(value, ignore_required_constraints)
+        cleaned = super().clean(value, *args, **kwargs)
 
         if len(value) > 0:
             block = value[0].block.child_blocks.get("slug", None)
@@ -0,0 +1,105 @@
+"""Typed columns used to export the form submissions in a columnar format, such as Parquet."""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, time
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
+
+from django.utils.encoding import force_str
+
+from wagtail_form_plugins.utils import parse_temporal_value, to_float, to_utc
+
+from .form_field import StreamFieldFormField
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+PARQUET_AVAILABLE = find_spec("pyarrow") is not None
+
+ValueConverter = Callable[[Any], Any]
+
+
+def to_str(value: Any) -> str | None:  # noqa: ANN401
+    """Return the value as a string, or None."""
+    return None if value is None else force_str(value)
+
+
+TYPED_COLUMNS: dict[str, tuple[str, ValueConverter]] = {
+    "number": ("float", to_float),
+    "checkbox": ("bool", lambda value: None if value is None else bool(value)),
+    "date": ("date", lambda value: parse_temporal_value(date, value)),
+    "time": ("time", lambda value: parse_temporal_value(time, value)),
+    "datetime": ("timestamp", to_utc),
+}
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """
+    A typed export column, converting the submission values of a field.
+
+    Choices are dictionary-encoded with a fixed dictionary, so their indexes are the same in all
+    the row groups.
+    """
+
+    name: str
+    kind: str
+    convert: ValueConverter
+    dictionary: tuple[str, ...] = ()
+
+    def get_type(self) -> "pa.DataType":
+        """Return the arrow type of the column."""
+        import pyarrow as pa  # noqa: PLC0415
+
+        types = {
+            "float": pa.float64,
+            "bool": pa.bool_,
+            "date": pa.date32,
+            "time": lambda: pa.time64("us"),
+            "timestamp": lambda: pa.timestamp("us", tz="UTC"),
+            "category": lambda: pa.dictionary(pa.int32(), pa.string()),
+            "list": lambda: pa.list_(pa.string()),
+        }
+        return types.get(self.kind, pa.string)()
+
+    def build_array(self, values: Sequence[Any]) -> "pa.Array":
+        """Return an arrow array from the converted values of a batch of submissions."""
+        import pyarrow as pa  # noqa: PLC0415
+
+        if self.kind == "category":
+            indices = pa.array(values, type=pa.int32())
+            return pa.DictionaryArray.from_arrays(indices, pa.array(self.dictionary, pa.string()))
+        return pa.array(values, type=self.get_type())
+
+
+def get_field_export_column(form_field: StreamFieldFormField) -> ExportColumn:
+    """Return the export column of a form field, typed according to the field type."""
+    slug = form_field.slug
+
+    if form_field.type in ["dropdown", "radio"]:
+        indexes = {key: idx for idx, (key, _label) in enumerate(form_field.choices)}
+        labels = tuple(label for _key, label in form_field.choices)
+        return ExportColumn(slug, "category", indexes.get, labels)
+
+    if form_field.type in ["checkboxes", "multiselect"]:
+        labels_dict = dict(form_field.choices)
+
+        def convert_choices(value: Any) -> list[str] | None:  # noqa: ANN401
+            if not isinstance(value, list):
+                return None
+            return [labels_dict[key] for key in value if key in labels_dict]
+
+        return ExportColumn(slug, "list", convert_choices)
+
+    kind, convert = TYPED_COLUMNS.get(form_field.type, ("string", to_str))
+    return ExportColumn(slug, kind, convert)
+
+
+def get_export_column(name: str, form_field: StreamFieldFormField | None) -> ExportColumn:
+    """Return the export column of a form field, or of a submission attribute."""
+    if form_field is not None:
+        return get_field_export_column(form_field)
+    if name == "submit_time":
+        return ExportColumn(name, "timestamp", to_utc)
+    return ExportColumn(name, "string", to_str)
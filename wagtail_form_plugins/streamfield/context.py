@@ -0,0 +1,54 @@
+"""Request-scoped context used to share values computed by the plugins while serving a form."""
+
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def freeze(value: Any) -> Hashable:  # noqa: ANN401
+    """Return a hashable representation of a value, such as form data, to use it as a key."""
+    if isinstance(value, dict):
+        return tuple((key, freeze(sub_value)) for key, sub_value in value.items())
+    if isinstance(value, list | tuple | set | frozenset):
+        return tuple(freeze(sub_value) for sub_value in value)
+    return value
+
+
+class FormContext:
+    """
+    A store used to memoize values derived from a form page during a request.
+
+    Plugins read and store intermediate results with `get`, `set` and `get_or_compute`, so each
+    value is computed only once per request, regardless of the amount of plugins.
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[Hashable, Any] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if a value is stored with the given key."""
+        return key in self.values
+
+    def get(self, key: Hashable, default: Any = None) -> Any:  # noqa: ANN401
+        """Return the value stored with the given key, or the default value if there is none."""
+        return self.values.get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        """Store a value with the given key."""
+        self.values[key] = value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the value stored with the given key, computing and storing it if missing."""
+        try:
+            if key in self.values:
+                return self.values[key]
+        except TypeError:  # the key contains unhashable values: don't memoize
+            return compute()
+
+        value = self.values[key] = compute()
+        return value
+
+    def clear(self) -> None:
+        """Remove all the stored values."""
+        self.values.clear()
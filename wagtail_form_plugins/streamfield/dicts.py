@@ -8,6 +8,8 @@ from wagtail.contrib.forms.models import FormSubmission
 from wagtail.contrib.forms.views import SubmissionsListView
 from wagtail.models import Page
 
+from typing_extensions import NotRequired
+
 
 class SubmissionData(TypedDict):
     """A typed dict that holds submision data, typically returned by pre_process_form_submission."""
@@ -60,3 +62,31 @@ class StreamFieldDataDict(TypedDict):
     id: str
     value: StreamFieldValueDict
     type: str
+
+
+class ChoiceStatisticsDict(TypedDict):
+    """A typed dict that holds the amount of answers of a choice."""
+
+    id: str
+    label: str
+    count: int
+
+
+class FieldStatisticsDict(TypedDict):
+    """A typed dict that holds the answer statistics of a form field."""
+
+    label: str
+    type: str
+    answers: int
+    choices: NotRequired[list[ChoiceStatisticsDict]]
+    total: NotRequired[float]
+    minimum: NotRequired[float | None]
+    maximum: NotRequired[float | None]
+    mean: NotRequired[float | None]
+
+
+class AnswerStatisticsDict(TypedDict):
+    """A typed dict that holds the answer statistics of a form page."""
+
+    submissions: int
+    fields: dict[str, FieldStatisticsDict]
@@ -1,18 +1,173 @@
 """Form-related classes for the plugins."""
 
-from typing import Any
+from collections import Counter
+from typing import TYPE_CHECKING, Any
 
 from django import forms
+from django.core.exceptions import ValidationError
 from django.forms import widgets
 
-from wagtail.contrib.forms.forms import FormBuilder
+from wagtail.contrib.forms.forms import BaseForm, FormBuilder
 
 from .form_field import StreamFieldFormField
 
+if TYPE_CHECKING:
+    from .models import StreamFieldFormPage
+
+
+class StreamFieldForm(BaseForm):
+    """
+    A form validated in a single pass.
+
+    The enabled fields are computed first from the raw input, then each enabled field is cleaned
+    exactly once, while disabled fields are not validated and set to None.
+    """
+
+    page: "StreamFieldFormPage | None"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clean_counter: Counter[str] = Counter()
+        self.field_results: dict[str, Any] = {}
+
+    def get_raw_value(self, field_slug: str) -> Any:  # noqa: ANN401
+        """Return the raw value of a field: its bound data, or its initial value if disabled."""
+        bound_field = self[field_slug]
+        return bound_field.initial if bound_field.field.disabled else bound_field.data
+
+    def clean_field(self, field_slug: str) -> Any:  # noqa: ANN401
+        """Clean the field with the given slug once per validation pass and return its value."""
+        if field_slug not in self.field_results:
+            self.clean_counter[field_slug] += 1
+            field = self.fields[field_slug]
+            value = self.get_raw_value(field_slug)
+            try:
+                if isinstance(field, forms.FileField):
+                    value = field.clean(value, self[field_slug].initial)
+                else:
+                    value = field.clean(value)
+                if hasattr(self, f"clean_{field_slug}"):
+                    self.cleaned_data[field_slug] = value
+                    value = getattr(self, f"clean_{field_slug}")()
+                self.field_results[field_slug] = value
+            except ValidationError as err:
+                self.field_results[field_slug] = err
+
+        result = self.field_results[field_slug]
+        if isinstance(result, ValidationError):
+            raise result
+        return result
+
+    def get_rule_value(self, field_slug: str) -> Any:  # noqa: ANN401
+        """
+        Return the value of a field used to compute the enabled fields.
+
+        The field is enabled when its raw value is given, whether it is valid or not: its cleaned
+        value is used if valid, otherwise its raw value, and its error is reported when cleaning it.
+        """
+        raw_value = self.get_raw_value(field_slug)
+        if raw_value is None:
+            return None
+        try:
+            value = self.clean_field(field_slug)
+        except ValidationError:
+            return raw_value
+        return raw_value if value is None else value
+
+    def get_enabled_fields(
+        self,
+        previous_enabled_fields: list[str] | None = None,
+        changed_fields: list[str] | None = None,
+    ) -> list[str]:
+        """
+        Return the enabled fields, only cleaning the fields they depend on.
+
+        When the enabled fields before a change on some fields are given, only the fields affected
+        by the change are evaluated again.
+        """
+        if self.page is None:
+            return list(self.fields)
+
+        dependencies = self.page.get_enabled_fields_dependencies()
+        form_data = {
+            field_slug: (
+                self.get_rule_value(field_slug)
+                if field_slug in dependencies
+                else self.get_raw_value(field_slug)
+            )
+            for field_slug in self.fields
+        }
+        if previous_enabled_fields is None:
+            return self.page.get_enabled_fields(form_data)
+        return self.page.update_enabled_fields(
+            form_data, previous_enabled_fields, changed_fields or []
+        )
+
+    def validate_fields(
+        self, field_slugs: list[str], previous_enabled_fields: list[str] | None = None
+    ) -> dict[str, list[str]]:
+        """Clean the given fields if they are enabled, and return the error messages by field."""
+        self.cleaned_data = {}
+        self.field_results = {}
+        enabled_fields = set(self.get_enabled_fields(previous_enabled_fields, field_slugs))
+
+        errors = {}
+        for field_slug in field_slugs:
+            if field_slug in self.fields and field_slug in enabled_fields:
+                try:
+                    self.clean_field(field_slug)
+                except ValidationError as err:
+                    errors[field_slug] = err.messages
+        return errors
+
+    def _clean_fields(self) -> None:
+        """Clean the enabled fields and set disabled fields to None."""
+        self.field_results = {}
+        enabled_fields = set(self.get_enabled_fields())
+
+        for field_slug in self.fields:
+            if field_slug not in enabled_fields:
+                self.cleaned_data[field_slug] = None
+                continue
+
+            try:
+                self.cleaned_data[field_slug] = self.clean_field(field_slug)
+            except ValidationError as err:
+                self.add_error(field_slug, err)
+
+
+class DateInput(widgets.DateInput):
+    """A date widget using the html date input type."""
+
+    input_type = "date"
+
+
+class TimeInput(widgets.TimeInput):
+    """A time widget using the html time input type."""
+
+    input_type = "time"
+
+
+class DateTimeInput(widgets.DateTimeInput):
+    """A datetime widget using the html datetime-local input type."""
+
+    input_type = "datetime-local"
+
+    def format_value(self, value: str) -> str | None:
+        """Remove the trailing timezone designator, not supported by datetime-local inputs."""
+        fmt_value = super().format_value(value)
+        return fmt_value.rstrip("Z") if fmt_value else None
+
 
 class StreamFieldFormBuilder(FormBuilder):
     """Form builder mixin that use streamfields to define form fields in form admin page."""
 
+    form_class = StreamFieldForm
+
+    def get_form_class(self) -> type[StreamFieldForm]:
+        """Return the form class, based on the form_class attribute."""
+        return type("WagtailForm", (self.form_class,), self.formfields)
+
     def create_singleline_field(  # ty: ignore invalid-method-override
         self,
         _form_field: StreamFieldFormField,
@@ -37,10 +192,6 @@ class StreamFieldFormBuilder(FormBuilder):
         options: dict[str, Any],
     ) -> forms.DateField:
         """Create a date form field."""
-
-        class DateInput(widgets.DateInput):
-            input_type = "date"
-
         widget_attrs = options.pop("widget_attrs")
         return forms.DateField(widget=DateInput(attrs=widget_attrs), **options)
 
@@ -50,10 +201,6 @@ class StreamFieldFormBuilder(FormBuilder):
         options: dict[str, Any],
     ) -> forms.TimeField:
         """Create a time form field."""
-
-        class TimeInput(widgets.TimeInput):
-            input_type = "time"
-
         widget_attrs = options.pop("widget_attrs")
         return forms.TimeField(widget=TimeInput(attrs=widget_attrs), **options)
 
@@ -63,14 +210,6 @@ class StreamFieldFormBuilder(FormBuilder):
         options: dict[str, Any],
     ) -> forms.DateTimeField:
         """Create a datetime form field."""
-
-        class DateTimeInput(widgets.DateTimeInput):
-            input_type = "datetime-local"
-
-            def format_value(self, value: str) -> str | None:
-                fmt_value = super().format_value(value)
-                return fmt_value.rstrip("Z") if fmt_value else None
-
         widget_attrs = options.pop("widget_attrs")
         return forms.DateTimeField(widget=DateTimeInput(attrs=widget_attrs), **options)
 
@@ -1,11 +1,14 @@
 """Models definition for the Streamfield form plugin."""
 
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import date, datetime, time
 from typing import Any
 
 from django.contrib.auth.models import User
-from django.forms import BaseForm
-from django.http import HttpRequest
+from django.db import models, transaction
+from django.forms import BaseForm, Field
+from django.http import HttpRequest, JsonResponse
 from django.template.response import TemplateResponse
 from django.utils.html import format_html
 
@@ -14,10 +17,30 @@ from wagtail.contrib.forms.models import AbstractFormSubmission, FormMixin
 from wagtail.contrib.forms.views import SubmissionsListView
 from wagtail.models import Page
 
-from wagtail_form_plugins.utils import create_links, format_list, multiline_to_html
+from wagtail_form_plugins.utils import (
+    create_links,
+    format_list,
+    multiline_to_html,
+    parse_temporal_value,
+)
 
+from .analytics import FormAnalytics
+from .context import FormContext, freeze
 from .dicts import SubmissionData
-from .forms import StreamFieldFormBuilder, StreamFieldFormField
+from .forms import StreamFieldForm, StreamFieldFormBuilder, StreamFieldFormField
+from .schema import FormSchema, SchemaKey, form_schema_cache
+from .search import SubmissionText
+from .side_tables import sync_side_tables
+from .statistics import AnswerStatistic
+from .values import SubmissionValue
+
+FieldValueFormatter = Callable[[Any], str | None]
+
+TEMPORAL_FORMATS: dict[str, tuple[type[date | time | datetime], str]] = {
+    "datetime": (datetime, "%d/%m/%Y, %H:%M"),
+    "date": (date, "%d/%m/%Y"),
+    "time": (time, "%H:%M"),
+}
 
 
 class StreamFieldFormSubmission(AbstractFormSubmission):
@@ -25,6 +48,7 @@ class StreamFieldFormSubmission(AbstractFormSubmission):
 
     class Meta:
         abstract = True
+        indexes = (models.Index(fields=["page", "submit_time", "id"]),)
 
 
 class StreamFieldFormPage(FormMixin, Page):
@@ -36,6 +60,12 @@ class StreamFieldFormPage(FormMixin, Page):
     submissions_list_view_class = SubmissionsListView
 
     fields_field_attr_name = "form_fields"
+    fields_validation_param = "validate"
+    enabled_fields_param = "enabled"
+    index_submission_values = False
+    index_submission_text = False
+    collect_answer_statistics = False
+    active_form_context: FormContext | None = None
 
     @property
     def form_builder(self) -> type[StreamFieldFormBuilder]:
@@ -48,24 +78,165 @@ class StreamFieldFormPage(FormMixin, Page):
 
     def serve_preview(self, request: HttpRequest, mode_name: str) -> TemplateResponse | None:
         """Fix typing: FormMixin.serve_preview and Page.serve_preview return types are different."""
+        self.is_previewed = True
         return super().serve_preview(request, mode_name)
 
-    def get_form_fields(self) -> list[StreamFieldFormField]:
-        """Return the form fields based on streamfield data."""
+    def serve(self, request: HttpRequest, *args, **kwargs) -> TemplateResponse:
+        """Serve the form page in a form context, discarded once the response is rendered."""
+        with self.use_form_context():
+            response = super().serve(request, *args, **kwargs)
+            if isinstance(response, TemplateResponse):
+                response.render()
+            return response
+
+    def serve_fields_validation(self, request: HttpRequest) -> JsonResponse:
+        """
+        Validate the fields listed in the query string against the posted data, without submitting.
+
+        Return the error messages of these fields and the enabled state of the fields depending on
+        them, used to give inline feedback while filling the form. The access checks of the plugins
+        are applied first, since their serve methods are bypassed.
+        """
+        self.check_form_access(request)
+        with self.use_form_context():
+            return self.get_fields_validation(request)
+
+    def get_fields_validation(self, request: HttpRequest) -> JsonResponse:
+        """Return the fields validation response, computed in the form context of the request."""
+        field_slugs = [
+            field_slug
+            for param_value in request.GET.getlist(self.fields_validation_param)
+            for field_slug in param_value.split(",")
+            if field_slug
+        ]
+
+        previous_enabled_fields = (
+            request.GET[self.enabled_fields_param].split(",")
+            if self.enabled_fields_param in request.GET
+            else None
+        )
+
+        form: StreamFieldForm = self.get_form(
+            request.POST, request.FILES, page=self, user=request.user
+        )
+        errors = form.validate_fields(field_slugs, previous_enabled_fields)
+        enabled_fields = set(form.get_enabled_fields(previous_enabled_fields, field_slugs))
+        dependent_fields = self.get_dependent_fields(field_slugs)
+
+        return JsonResponse(
+            {
+                "errors": errors,
+                "enabled_fields": [slug for slug in dependent_fields if slug in enabled_fields],
+                "disabled_fields": [
+                    slug for slug in dependent_fields if slug not in enabled_fields
+                ],
+            }
+        )
+
+    def check_form_access(self, request: HttpRequest) -> None:
+        """Raise PermissionDenied if the user may not fill in the form. Extended by plugins."""
+
+    @property
+    def form_context(self) -> FormContext:
+        """
+        Return the context used to memoize values derived from the form during an operation.
+
+        Outside of `use_form_context`, a new empty context is returned, so nothing is memoized on
+        the page instance.
+        """
+        if self.active_form_context is None:
+            return FormContext()
+        return self.active_form_context
+
+    @contextmanager
+    def use_form_context(self) -> Iterator[FormContext]:
+        """Memoize the values derived from the form until the end of the operation (ie. request)."""
+        if self.active_form_context is not None:
+            yield self.active_form_context
+            return
+
+        self.active_form_context = FormContext()
+        try:
+            yield self.active_form_context
+        finally:
+            self.active_form_context = None
+
+    def get_form_schema_key(self) -> SchemaKey | None:
+        """
+        Return the key used to share the form schema between requests, or None to not share it.
+
+        The schema is keyed on the live revision, which is served even when a draft is pending.
+        Previewed pages and pages that were never published are not shared, because their form
+        fields may not match the live revision.
+        """
+        if self.pk is None or self.live_revision_id is None or getattr(self, "is_previewed", False):
+            return None
+        return (self.pk, self.live_revision_id)
+
+    def build_form_schema(self, key: SchemaKey | None) -> FormSchema:
+        """Build the form schema by parsing the streamfield data."""
         steamchild = getattr(self, self.fields_field_attr_name)
-        return [
+        fields = [
             self.form_field_class.from_streamfield_data(field_data)
             for field_data in steamchild.raw_data
         ]
+        return FormSchema.from_fields(key, fields)
+
+    def get_form_schema(self) -> FormSchema:
+        """Return the form schema, from the form context or the schema cache when possible."""
+
+        def get_schema() -> FormSchema:
+            key = self.get_form_schema_key()
+            if key is None:
+                return self.build_form_schema(None)
+            return form_schema_cache.get_or_build(key, lambda: self.build_form_schema(key))
+
+        return self.form_context.get_or_compute("form_schema", get_schema)
+
+    def get_form_fields(self) -> list[StreamFieldFormField]:
+        """Return the form fields based on streamfield data."""
+        return list(self.get_form_schema().fields)
 
     def get_form_fields_dict(self) -> dict[str, StreamFieldFormField]:
         """Return a field_slug:field dictionnary of all form fields."""
-        return {field.slug: field for field in self.get_form_fields()}
+        return self.form_context.get_or_compute(
+            "form_fields_dict",
+            lambda: dict(self.get_form_schema().fields_dict),
+        )
 
     def get_enabled_fields(self, form_data: dict[str, Any]) -> list[str]:
-        """Return a list of slugs corresponding to enabled fields (usually via a condition)."""
+        """
+        Return a list of slugs corresponding to enabled fields (usually via a condition).
+
+        The result is memoized in the form context for the given form data: plugins should extend
+        `compute_enabled_fields` instead.
+        """
+        return self.form_context.get_or_compute(
+            ("enabled_fields", freeze(form_data)),
+            lambda: self.compute_enabled_fields(form_data),
+        )
+
+    def compute_enabled_fields(self, form_data: dict[str, Any]) -> list[str]:
+        """Compute the list of slugs corresponding to enabled fields."""
         return [slug for slug, field_data in form_data.items() if field_data is not None]
 
+    def update_enabled_fields(
+        self,
+        form_data: dict[str, Any],
+        enabled_fields: list[str],  # noqa: ARG002
+        changed_fields: list[str],  # noqa: ARG002
+    ) -> list[str]:
+        """Return the enabled fields after a change on the given fields, given the previous ones."""
+        return self.get_enabled_fields(form_data)
+
+    def get_enabled_fields_dependencies(self) -> set[str]:
+        """Return the slugs of the fields whose cleaned value is used to compute enabled fields."""
+        return set()
+
+    def get_dependent_fields(self, field_slugs: list[str]) -> list[str]:  # noqa: ARG002
+        """Return the slugs of the fields whose enabled state depends on the given fields."""
+        return []
+
     def pre_process_form_submission(self, form: BaseForm) -> SubmissionData:
         """Pre-processing step before to create the form submission object."""
         return {
@@ -81,9 +252,57 @@ class StreamFieldFormPage(FormMixin, Page):
         instantiating the submission object.
         """
         submission_data = self.pre_process_form_submission(form)
-        return self.form_submission_class.objects.create(**submission_data)
-
-    def format_field_value(  # noqa: C901, PLR0912
+        with transaction.atomic():
+            submission = self.form_submission_class.objects.create(**submission_data)
+            sync_side_tables(self, submission, None)
+        return submission
+
+    def update_submission_values(self, submission: StreamFieldFormSubmission) -> None:
+        """Write the typed values of a submission to the values table, if enabled on the page."""
+        if not self.index_submission_values:
+            return
+
+        values = SubmissionValue.from_form_data(
+            self.pk, submission.pk, self.get_form_fields(), submission.form_data
+        )
+        with transaction.atomic():
+            SubmissionValue.objects.filter(page_id=self.pk, submission_id=submission.pk).delete()
+            SubmissionValue.objects.bulk_create(values)
+
+    def update_submission_text(self, submission: StreamFieldFormSubmission) -> None:
+        """Write the text answers of a submission to the search index, if enabled on the page."""
+        if not self.index_submission_text:
+            return
+
+        content = SubmissionText.get_content(
+            self.get_form_fields(),
+            self.get_field_value_formatters(in_html=False),
+            submission.form_data,
+        )
+        SubmissionText.objects.update_or_create(
+            page_id=self.pk, submission_id=submission.pk, defaults={"content": content}
+        )
+
+    def get_analytics(self) -> FormAnalytics:
+        """Return the analytics of the number and temporal answers of the form."""
+        return FormAnalytics(self)
+
+    def update_answer_statistics(
+        self, submission: StreamFieldFormSubmission, old_form_data: dict[str, Any] | None
+    ) -> None:
+        """Count the answers of a new or edited submission in the statistics, if enabled."""
+        if not self.collect_answer_statistics:
+            return
+
+        AnswerStatistic.update_answers(
+            self.pk,
+            self.get_form_fields(),
+            old_form_data,
+            submission.form_data,
+            self.get_submissions(),
+        )
+
+    def format_field_value(
         self,
         form_field: StreamFieldFormField,
         value: str | list | date | time | datetime | None,
@@ -95,51 +314,10 @@ class StreamFieldFormPage(FormMixin, Page):
 
         Used to display user-friendly values in result table and emails.
         """
-        fmt_value = value
-
-        if value is None:
-            fmt_value = None
-
-        elif form_field.type in ["checkboxes", "multiselect"] and isinstance(value, list):
-            fmt_value = format_list(
-                [v for k, v in form_field.choices if k in value],
-                "  •",
-                in_html=in_html,
-            )
-
-        elif form_field.type in ["dropdown", "radio"] and isinstance(value, str):
-            fmt_value = dict(form_field.choices).get(value, "-")
-
-        elif form_field.type == "multiline" and isinstance(value, str):
-            fmt_value = (
-                format_html("<br/>{value}", value=multiline_to_html(value))
-                if in_html
-                else f"\n{value.strip()}"
-            )
-
-        elif form_field.type == "datetime":
-            if isinstance(value, str):
-                value = datetime.fromisoformat(value.replace("Z", "+00:00"))
-            if isinstance(value, datetime):
-                fmt_value = value.strftime("%d/%m/%Y, %H:%M")
-
-        elif form_field.type == "date":
-            if isinstance(value, str):
-                value = date.fromisoformat(value)
-            if isinstance(value, date):
-                fmt_value = value.strftime("%d/%m/%Y")
-
-        elif form_field.type == "time":
-            if isinstance(value, str):
-                value = time.fromisoformat(value)
-            if isinstance(value, time):
-                fmt_value = value.strftime("%H:%M")
-
-        elif form_field.type == "number":
-            fmt_value = str(value)
-
-        elif form_field.type == "checkbox":
-            fmt_value = "✔" if value else "✘"
+        formatter = self.get_field_value_formatters(in_html=in_html).get(form_field.slug)
+        if formatter is None:
+            formatter = self.get_field_value_formatter(form_field, in_html=in_html)
+        fmt_value = formatter(value)
 
         if not isinstance(fmt_value, str | None):
             msg = f"col_value '{fmt_value}' is of type {type(fmt_value)} instead of str or None."
@@ -147,35 +325,98 @@ class StreamFieldFormPage(FormMixin, Page):
 
         return fmt_value
 
-    def get_form(self, *args, page: "StreamFieldFormPage", user: User, **kwargs) -> BaseForm:
-        """Build and return the form instance."""
-        form = super().get_form(*args, page=page, user=user, **kwargs)
+    def get_field_value_formatters(self, *, in_html: bool) -> dict[str, FieldValueFormatter]:
+        """Return the value formatter of each form field, built once per form schema."""
+        schema = self.get_form_schema()
+        return schema.derive(
+            "html_value_formatters" if in_html else "text_value_formatters",
+            lambda: {
+                field.slug: self.get_field_value_formatter(field, in_html=in_html)
+                for field in schema.fields
+            },
+        )
+
+    def get_field_value_formatter(  # noqa: C901
+        self,
+        form_field: StreamFieldFormField,
+        *,
+        in_html: bool,
+    ) -> FieldValueFormatter:
+        """
+        Return a function formatting the values of a form field, specialized for its type.
+
+        The choices and formats are resolved once, when building the function. Since formatters
+        are shared between requests, they must not depend on the page instance or the request.
+        """
+        format_value: FieldValueFormatter
+
+        if form_field.type in ["checkboxes", "multiselect"]:
+            choices = form_field.choices
 
-        form_fields = self.get_form_fields_dict()
+            def format_value(value: Any) -> Any:  # noqa: ANN401
+                if not isinstance(value, list):
+                    return value
+                return format_list([v for k, v in choices if k in value], "  •", in_html=in_html)
 
-        for field_slug, field_value in form.fields.items():
-            form_field = form_fields[field_slug]
-            field_value.widget.attrs["id"] = form_field.block_id
-            field_value.widget.attrs["data-label"] = form_field.label
-            field_value.widget.attrs["data-type"] = form_field.type
+        elif form_field.type in ["dropdown", "radio"]:
+            labels = dict(form_field.choices)
 
-            if field_value.help_text:
-                field_value.help_text = create_links(str(field_value.help_text)).replace("\n", "")
+            def format_value(value: Any) -> Any:  # noqa: ANN401
+                return labels.get(value, "-") if isinstance(value, str) else value
+
+        elif form_field.type == "multiline":
+
+            def format_value(value: Any) -> Any:  # noqa: ANN401
+                if not isinstance(value, str):
+                    return value
+                if in_html:
+                    return format_html("<br/>{value}", value=multiline_to_html(value))
+                return f"\n{value.strip()}"
+
+        elif form_field.type in TEMPORAL_FORMATS:
+            value_type, str_format = TEMPORAL_FORMATS[form_field.type]
+
+            def format_value(value: Any) -> Any:  # noqa: ANN401
+                parsed_value = parse_temporal_value(value_type, value)
+                return parsed_value.strftime(str_format) if parsed_value is not None else value
+
+        elif form_field.type == "number":
+            format_value = str
+
+        elif form_field.type == "checkbox":
+
+            def format_value(value: Any) -> str:  # noqa: ANN401
+                return "✔" if value else "✘"
+
+        else:
+
+            def format_value(value: Any) -> Any:  # noqa: ANN401
+                return value
+
+        return lambda value: None if value is None else format_value(value)
+
+    def get_form_class(self) -> type[BaseForm]:
+        """Return the form class, built once per form schema."""
+        return self.get_form_schema().derive("form_class", self.build_form_class)
+
+    def build_form_class(self) -> type[BaseForm]:
+        """Build the form class, then prepare its fields so it is ready to be instantiated."""
+        form_class: type[BaseForm] = super().get_form_class()
+        form_fields = self.get_form_fields_dict()
 
-        if args:
-            form.full_clean()
+        for field_slug, field in form_class.base_fields.items():
+            self.prepare_form_field(form_fields[field_slug], field)
 
-            for k, v in form_fields.items():
-                if k not in form.cleaned_data and v.field_type in ["radio", "checkboxes"]:
-                    form.cleaned_data[k] = None
+        return form_class
 
-            enabled_fields = self.get_enabled_fields(form.cleaned_data)
-            for field_value in form.fields.values():
-                if field_value.widget.attrs.get("data-slug", None) not in enabled_fields:
-                    field_value.required = False
+    def prepare_form_field(self, form_field: StreamFieldFormField, field: Field) -> None:
+        """Set the widget attributes and help text of a field of the form class."""
+        field.widget.attrs["id"] = form_field.block_id
+        field.widget.attrs["data-label"] = form_field.label
+        field.widget.attrs["data-type"] = form_field.type
 
-        form.full_clean()
-        return form
+        if field.help_text:
+            field.help_text = create_links(str(field.help_text)).replace("\n", "")
 
     class Meta:
         abstract = True
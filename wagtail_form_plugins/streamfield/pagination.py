@@ -0,0 +1,146 @@
+"""Keyset pagination, seeking the pages from a cursor instead of skipping the previous rows."""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Field, Model, Q, QuerySet
+from django.utils.functional import cached_property
+
+from wagtail.admin.paginator import WagtailPaginator
+
+from typing_extensions import Self
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """A position in an ordered queryset: the ordering values of a row, and the seek direction."""
+
+    values: tuple[Any, ...]
+    backward: bool = False
+
+    def encode(self) -> str:
+        """Return the cursor as an URL-safe string, keeping the datetimes microseconds."""
+        values = [val.isoformat() if isinstance(val, datetime) else val for val in self.values]
+        data = json.dumps([self.backward, *values]).encode()
+        return urlsafe_b64encode(data).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str, fields: list[Field]) -> Self | None:
+        """Return the cursor encoded in the given string, or None if it is invalid."""
+        try:
+            backward, *values = json.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            return cls(
+                tuple(fld.to_python(val) for fld, val in zip(fields, values, strict=True)),
+                backward=bool(backward),
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+
+class KeysetPage:
+    """A page of a keyset paginator, linked to the previous and next pages with cursors."""
+
+    def __init__(
+        self,
+        object_list: list[Model],
+        paginator: "KeysetPaginator",
+        *,
+        has_previous: bool,
+        has_next: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.previous_cursor = paginator.get_cursor(next(iter(object_list), None), backward=True)
+        self.next_cursor = paginator.get_cursor(next(reversed(object_list), None), backward=False)
+        self._has_previous = has_previous and bool(object_list)
+        self._has_next = has_next and bool(object_list)
+
+    def __len__(self) -> int:
+        """Return the amount of objects in the page."""
+        return len(self.object_list)
+
+    def __iter__(self) -> Iterator[Model]:
+        """Iterate over the objects of the page."""
+        return iter(self.object_list)
+
+    def has_previous(self) -> bool:
+        """Return True if there are objects before this page."""
+        return self._has_previous
+
+    def has_next(self) -> bool:
+        """Return True if there are objects after this page."""
+        return self._has_next
+
+    def has_other_pages(self) -> bool:
+        """Return True if there are objects before or after this page."""
+        return self._has_previous or self._has_next
+
+
+class KeysetPaginator(WagtailPaginator):
+    """
+    A paginator seeking the rows after a cursor, so the deep pages cost the same as the first one.
+
+    The ordering must end with a unique field, and all its fields must have the same direction.
+    """
+
+    def __init__(self, object_list: QuerySet, per_page: int, ordering: tuple[str, ...]) -> None:
+        super().__init__(object_list, per_page)
+        self.ordering = ordering
+
+    @cached_property
+    def field_names(self) -> tuple[str, ...]:
+        """Return the names of the fields used in the ordering."""
+        return tuple(name.lstrip("-") for name in self.ordering)
+
+    @cached_property
+    def fields(self) -> list[Field]:
+        """Return the model fields used in the ordering."""
+        return [
+            self.object_list.model._meta.get_field(name)  # noqa: SLF001
+            for name in self.field_names
+        ]
+
+    @cached_property
+    def descending(self) -> bool:
+        """Return True if the ordering is descending."""
+        return self.ordering[0].startswith("-")
+
+    def get_cursor(self, obj: Model | None, *, backward: bool) -> str | None:
+        """Return the encoded cursor seeking the rows before or after the given object."""
+        if obj is None:
+            return None
+        return Cursor(tuple(getattr(obj, name) for name in self.field_names), backward).encode()
+
+    def get_seek_filter(self, cursor: Cursor) -> Q:
+        """Return the filter selecting the rows after the cursor, or before if it is backward."""
+        lookup = "lt" if self.descending != cursor.backward else "gt"
+        seek_filter = Q()
+        for idx, name in enumerate(self.field_names):
+            equal_values = dict(zip(self.field_names[:idx], cursor.values, strict=False))
+            seek_filter |= Q(**equal_values, **{f"{name}__{lookup}": cursor.values[idx]})
+        return seek_filter
+
+    def get_keyset_page(self, token: str | None) -> KeysetPage:
+        """Return the page following the encoded cursor, or the first page if there is none."""
+        cursor = Cursor.decode(token, self.fields) if token else None
+        queryset = self.object_list
+        ordering = self.ordering
+
+        if cursor is not None:
+            queryset = queryset.filter(self.get_seek_filter(cursor))
+            if cursor.backward:
+                ordering = tuple(name[1:] if self.descending else f"-{name}" for name in ordering)
+
+        rows = list(queryset.order_by(*ordering)[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if cursor is not None and cursor.backward:
+            rows.reverse()
+            return KeysetPage(rows, self, has_previous=has_more, has_next=True)
+        return KeysetPage(rows, self, has_previous=cursor is not None, has_next=has_more)
@@ -0,0 +1,97 @@
+"""Compiled form schema, built once per page revision and shared between requests."""
+
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, TypeVar
+
+from django.conf import settings
+
+from wagtail.models import Page
+from wagtail.signals import page_published
+
+from .form_field import StreamFieldFormField
+
+SchemaKey = tuple[int, int]
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FormSchema:
+    """An immutable representation of the form fields of a page revision."""
+
+    key: SchemaKey | None
+    fields: tuple[StreamFieldFormField, ...]
+    fields_dict: Mapping[str, StreamFieldFormField]
+    fields_by_block_id: Mapping[str, StreamFieldFormField]
+    derived: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_fields(cls, key: SchemaKey | None, fields: list[StreamFieldFormField]) -> "FormSchema":
+        """Build a schema from a list of form fields, indexing them by slug and block id."""
+        return cls(
+            key=key,
+            fields=tuple(fields),
+            fields_dict=MappingProxyType({fld.slug: fld for fld in fields}),
+            fields_by_block_id=MappingProxyType({fld.block_id: fld for fld in fields}),
+        )
+
+    def derive(self, name: str, builder: Callable[[], T]) -> T:
+        """Return a value computed from the schema, building it on first access."""
+        if name not in self.derived:
+            self.derived[name] = builder()
+        return self.derived[name]
+
+
+class FormSchemaCache:
+    """A thread-safe bounded LRU cache of form schemas, keyed by page id and revision id."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.schemas: OrderedDict[SchemaKey, FormSchema] = OrderedDict()
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the amount of cached schemas."""
+        return len(self.schemas)
+
+    def get_or_build(self, key: SchemaKey, builder: Callable[[], FormSchema]) -> FormSchema:
+        """Return the schema stored with the given key, building and storing it if missing."""
+        with self.lock:
+            if key in self.schemas:
+                self.schemas.move_to_end(key)
+                return self.schemas[key]
+
+        schema = builder()
+
+        with self.lock:
+            self.schemas[key] = schema
+            self.schemas.move_to_end(key)
+            while len(self.schemas) > self.max_size:
+                self.schemas.popitem(last=False)
+
+        return schema
+
+    def invalidate(self, page_id: int) -> None:
+        """Remove all the schemas related to the given page."""
+        with self.lock:
+            for key in [key for key in self.schemas if key[0] == page_id]:
+                del self.schemas[key]
+
+    def clear(self) -> None:
+        """Remove all the schemas."""
+        with self.lock:
+            self.schemas.clear()
+
+
+form_schema_cache = FormSchemaCache(getattr(settings, "FORMS_SCHEMA_CACHE_SIZE", 256))
+
+
+def invalidate_form_schema(instance: Page, **_kwargs) -> None:
+    """Remove the cached schemas of a page when it is published."""
+    form_schema_cache.invalidate(instance.pk)
+
+
+page_published.connect(invalidate_form_schema, dispatch_uid="wagtail_form_plugins_form_schema")
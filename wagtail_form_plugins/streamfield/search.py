@@ -0,0 +1,100 @@
+"""Full-text search index over the text answers of the submissions."""
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from django.db import connection, models
+from django.db.models import BooleanField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.translation import gettext_lazy as _
+
+from wagtail.contrib.forms.models import AbstractFormSubmission
+from wagtail.models import Page
+
+from .form_field import StreamFieldFormField
+from .side_tables import register_side_table
+
+if TYPE_CHECKING:
+    from .models import StreamFieldFormPage
+
+SEARCHABLE_FIELD_TYPES = ("singleline", "multiline", "email", "url", "hidden")
+
+FTS_TABLE = "wagtail_form_plugins_submissiontext_fts"
+
+# The search condition of each database backend, using the index created by the migrations.
+SEARCH_CONDITIONS = {
+    "sqlite": f"id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",  # noqa: S608
+    "postgresql": "to_tsvector('simple', content) @@ websearch_to_tsquery('simple', %s)",
+}
+
+
+def to_fts5_query(query: str) -> str:
+    """Return the terms of a search query as FTS5 strings, so their characters are not operators."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+class SubmissionText(models.Model):
+    """The formatted text answers of a form submission, indexed for full-text search."""
+
+    page = models.ForeignKey(Page, on_delete=models.CASCADE)
+    submission_id = models.PositiveBigIntegerField()
+    content = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = _("submission text")
+        constraints = (
+            models.UniqueConstraint(
+                fields=["page", "submission_id"], name="unique_submission_text"
+            ),
+        )
+
+    def __str__(self) -> str:
+        """Return the string representation of the submission text."""
+        return f"text of submission {self.submission_id}"
+
+    @staticmethod
+    def get_content(
+        form_fields: Iterable[StreamFieldFormField],
+        formatters: Mapping[str, Callable[[Any], str | None]],
+        form_data: Mapping[str, Any],
+    ) -> str:
+        """Return the searchable content of a submission: its formatted text answers."""
+        values = (
+            formatters[fld.slug](form_data.get(fld.slug))
+            for fld in form_fields
+            if fld.type in SEARCHABLE_FIELD_TYPES and form_data.get(fld.slug)
+        )
+        return "\n".join(value for value in values if value)
+
+    @classmethod
+    def search(cls, page_id: int, query: str) -> QuerySet["SubmissionText"]:
+        """Return the texts of a form page matching a search query, using the full-text index."""
+        texts = cls.objects.filter(page_id=page_id)
+        condition = SEARCH_CONDITIONS.get(connection.vendor)
+
+        if condition is None:
+            terms = Q(*(Q(content__icontains=term) for term in query.split()))
+            return texts.filter(terms)
+
+        if connection.vendor == "sqlite":
+            query = to_fts5_query(query)
+        if not query.strip():
+            return texts.none()
+        return texts.filter(RawSQL(condition, [query], output_field=BooleanField()))  # noqa: S611
+
+
+def delete_submission_text(instance: AbstractFormSubmission, **_kwargs) -> None:
+    """Remove the text of a form submission from the search index when it is deleted."""
+    SubmissionText.objects.filter(page_id=instance.page_id, submission_id=instance.pk).delete()
+
+
+def sync_submission_text(
+    page: "StreamFieldFormPage",
+    submission: AbstractFormSubmission,
+    _old_form_data: dict[str, Any] | None,
+) -> None:
+    """Write the text of a saved form submission to the search index."""
+    page.update_submission_text(submission)
+
+
+register_side_table(sync_submission_text, delete_submission_text)
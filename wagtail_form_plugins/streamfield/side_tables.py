@@ -0,0 +1,54 @@
+"""Side tables derived from the submissions, kept in sync when a submission is saved or deleted."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from django.db import models
+from django.db.models.signals import class_prepared, post_delete
+
+from wagtail.contrib.forms.models import AbstractFormSubmission
+
+if TYPE_CHECKING:
+    from .models import StreamFieldFormPage
+
+SyncCallback = Callable[
+    ["StreamFieldFormPage", AbstractFormSubmission, dict[str, Any] | None], None
+]
+CleanupCallback = Callable[..., None]
+
+
+@dataclass(frozen=True)
+class SideTable:
+    """The callbacks of a side table: `sync` for a saved submission, `cleanup` for a deleted one."""
+
+    sync: SyncCallback
+    cleanup: CleanupCallback
+
+
+side_tables: list[SideTable] = []
+
+
+def register_side_table(sync: SyncCallback, cleanup: CleanupCallback) -> None:
+    """Register the callbacks keeping a side table in sync with the submissions."""
+    side_tables.append(SideTable(sync, cleanup))
+
+
+def sync_side_tables(
+    page: "StreamFieldFormPage",
+    submission: AbstractFormSubmission,
+    old_form_data: dict[str, Any] | None,
+) -> None:
+    """Update the side tables after a submission is created, or edited from the old form data."""
+    for side_table in side_tables:
+        side_table.sync(page, submission, old_form_data)
+
+
+def connect_submission_model(sender: type[models.Model], **_kwargs) -> None:
+    """Clean up the side tables on deletion, only for the submission models."""
+    if issubclass(sender, AbstractFormSubmission) and not sender._meta.abstract:  # noqa: SLF001
+        for side_table in side_tables:
+            post_delete.connect(side_table.cleanup, sender=sender)
+
+
+class_prepared.connect(connect_submission_model, dispatch_uid="wagtail_form_plugins_side_tables")
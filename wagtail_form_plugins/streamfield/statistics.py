@@ -0,0 +1,348 @@
+"""Answer statistics of the form fields, updated with each submission instead of computed later."""
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from threading import local
+from typing import TYPE_CHECKING, Any
+
+from django.db import models, transaction
+from django.db.models import F, QuerySet, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils.translation import gettext_lazy as _
+
+from wagtail.contrib.forms.models import AbstractFormSubmission
+from wagtail.models import Page
+
+from wagtail_form_plugins.utils import to_float
+
+from .dicts import AnswerStatisticsDict, ChoiceStatisticsDict, FieldStatisticsDict
+from .form_field import StreamFieldFormField
+from .side_tables import register_side_table
+
+if TYPE_CHECKING:
+    from .models import StreamFieldFormPage
+
+STATISTIC_FIELD_TYPES = ("number", "checkbox", "dropdown", "radio", "checkboxes", "multiselect")
+
+# The key of the rows counting the answers of a field, or the submissions when the slug is empty.
+TOTAL_KEY = ""
+
+CHECKBOX_CHOICES = (("true", _("Yes")), ("false", _("No")))
+
+
+def get_answer_keys(form_field: StreamFieldFormField, value: Any) -> list[str]:  # noqa: ANN401
+    """Return the statistic keys of an answer: the ids of its choices, or the total key."""
+    if value is None or value == "":
+        return []
+    if form_field.type == "number":
+        return [] if to_float(value) is None else [TOTAL_KEY]
+    if form_field.type == "checkbox":
+        return ["true" if value else "false"]
+
+    choice_ids = {key for key, _label in form_field.choices}
+    return [key for key in (value if isinstance(value, list) else [value]) if key in choice_ids]
+
+
+@dataclass
+class StatisticDelta:
+    """The changes to apply to a statistic row, after adding or removing answers."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float | None = None
+    maximum: float | None = None
+    removed: list[float] = field(default_factory=list)
+
+    def add_number(self, number: float) -> None:
+        """Add a number answer, cancelling a removal of the same number."""
+        self.total += number
+        if number in self.removed:
+            self.removed.remove(number)
+            return
+        self.minimum = number if self.minimum is None else min(self.minimum, number)
+        self.maximum = number if self.maximum is None else max(self.maximum, number)
+
+    def remove_number(self, number: float) -> None:
+        """Remove a number answer."""
+        self.total -= number
+        self.removed.append(number)
+
+    def get_updates(self) -> dict[str, Any]:
+        """Return the expressions updating a statistic row in the database, without reading it."""
+        updates: dict[str, Any] = {}
+        if self.count:
+            updates["count"] = F("count") + self.count
+        if self.total:
+            updates["total"] = F("total") + self.total
+        if self.minimum is not None:
+            minimum = Value(self.minimum)
+            updates["minimum"] = Least(Coalesce("minimum", minimum), minimum)
+        if self.maximum is not None:
+            maximum = Value(self.maximum)
+            updates["maximum"] = Greatest(Coalesce("maximum", maximum), maximum)
+        return updates
+
+
+StatisticDeltas = defaultdict[tuple[str, str], StatisticDelta]
+
+
+def collect_deltas(
+    deltas: StatisticDeltas,
+    form_fields: Iterable[StreamFieldFormField],
+    form_data: Mapping[str, Any],
+    *,
+    sign: int,
+) -> None:
+    """Collect the changes of the statistic rows when adding (sign=1) or removing a submission."""
+    deltas[("", TOTAL_KEY)].count += sign
+
+    for form_field in form_fields:
+        value = form_data.get(form_field.slug)
+        keys = (
+            get_answer_keys(form_field, value) if form_field.type in STATISTIC_FIELD_TYPES else []
+        )
+        if not keys:
+            continue
+
+        deltas[(form_field.slug, TOTAL_KEY)].count += sign
+        for key in keys:
+            if key != TOTAL_KEY:
+                deltas[(form_field.slug, key)].count += sign
+
+        if form_field.type == "number":
+            number = to_float(value)
+            delta = deltas[(form_field.slug, TOTAL_KEY)]
+            if sign > 0:
+                delta.add_number(number)
+            else:
+                delta.remove_number(number)
+
+
+class AnswerStatistic(models.Model):
+    """The answers count of a form field, per choice, or with the sum and bounds of numbers."""
+
+    page = models.ForeignKey(Page, on_delete=models.CASCADE)
+    slug = models.CharField(max_length=255, blank=True)
+    key = models.CharField(max_length=32, blank=True)
+    count = models.BigIntegerField(default=0)
+    total = models.FloatField(default=0)
+    minimum = models.FloatField(null=True)
+    maximum = models.FloatField(null=True)
+
+    class Meta:
+        verbose_name = _("answer statistic")
+        constraints = (
+            models.UniqueConstraint(fields=["page", "slug", "key"], name="unique_answer_statistic"),
+        )
+
+    def __str__(self) -> str:
+        """Return the string representation of the answer statistic."""
+        return f"{self.slug}:{self.key} ({self.count})"
+
+    @classmethod
+    def update_answers(  # noqa: PLR0913
+        cls,
+        page_id: int,
+        form_fields: Iterable[StreamFieldFormField],
+        old_data: Mapping[str, Any] | None,
+        new_data: Mapping[str, Any] | None,
+        submissions: QuerySet,
+        *,
+        refreshed: set[str] | None = None,
+    ) -> None:
+        """
+        Update the statistics of a form page when a submission is created, edited or deleted.
+
+        The counters are incremented in the database, so concurrent submissions don't override
+        each other. The bounds of a number field are only computed from the submissions when one of
+        them is removed, and not again for the slugs in `refreshed`, updated with the new ones.
+        """
+        form_fields = list(form_fields)
+        deltas: StatisticDeltas = defaultdict(StatisticDelta)
+        if old_data is not None:
+            collect_deltas(deltas, form_fields, old_data, sign=-1)
+        if new_data is not None:
+            collect_deltas(deltas, form_fields, new_data, sign=1)
+
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                [cls(page_id=page_id, slug=slug, key=key) for slug, key in deltas],
+                ignore_conflicts=True,
+            )
+            for (slug, key), delta in deltas.items():
+                if updates := delta.get_updates():
+                    cls.objects.filter(page_id=page_id, slug=slug, key=key).update(**updates)
+
+            refreshed = set() if refreshed is None else refreshed
+            for (slug, _key), delta in deltas.items():
+                if (
+                    delta.removed
+                    and slug not in refreshed
+                    and cls.refresh_bounds(page_id, slug, delta.removed, submissions)
+                ):
+                    refreshed.add(slug)
+
+    @classmethod
+    def refresh_bounds(
+        cls, page_id: int, slug: str, removed: list[float], submissions: QuerySet
+    ) -> bool:
+        """Compute again the bounds of a number field if one was removed, return True if so."""
+        statistic = cls.objects.get(page_id=page_id, slug=slug, key=TOTAL_KEY)
+        if (
+            statistic.minimum is not None
+            and statistic.maximum is not None
+            and all(statistic.minimum < number < statistic.maximum for number in removed)
+        ):
+            return False
+
+        values = submissions.values_list(f"form_data__{slug}", flat=True)
+        numbers = [num for num in map(to_float, values.iterator()) if num is not None]
+        statistic.minimum = min(numbers, default=None)
+        statistic.maximum = max(numbers, default=None)
+        statistic.save(update_fields=["minimum", "maximum"])
+        return True
+
+    @classmethod
+    def rebuild(
+        cls,
+        page_id: int,
+        form_fields: Iterable[StreamFieldFormField],
+        submissions: QuerySet,
+        batch_size: int,
+    ) -> int:
+        """Compute the statistics of a form page from all its submissions, return their amount."""
+        form_fields = list(form_fields)
+        deltas: StatisticDeltas = defaultdict(StatisticDelta)
+        for form_data in submissions.values_list("form_data", flat=True).iterator(
+            chunk_size=batch_size
+        ):
+            collect_deltas(deltas, form_fields, form_data, sign=1)
+
+        with transaction.atomic():
+            cls.objects.filter(page_id=page_id).delete()
+            cls.objects.bulk_create(
+                cls(
+                    page_id=page_id,
+                    slug=slug,
+                    key=key,
+                    count=delta.count,
+                    total=delta.total,
+                    minimum=delta.minimum,
+                    maximum=delta.maximum,
+                )
+                for (slug, key), delta in deltas.items()
+            )
+        return deltas[("", TOTAL_KEY)].count
+
+    @classmethod
+    def get_summary(
+        cls, page_id: int, form_fields: Iterable[StreamFieldFormField]
+    ) -> AnswerStatisticsDict:
+        """Return the answer statistics of a form page, read from a row per choice."""
+        rows = {(row.slug, row.key): row for row in cls.objects.filter(page_id=page_id)}
+        empty = cls(page_id=page_id)
+
+        fields: dict[str, FieldStatisticsDict] = {}
+        for form_field in form_fields:
+            if form_field.type not in STATISTIC_FIELD_TYPES:
+                continue
+
+            answers = rows.get((form_field.slug, TOTAL_KEY), empty)
+            summary: FieldStatisticsDict = {
+                "label": form_field.label,
+                "type": form_field.type,
+                "answers": answers.count,
+            }
+            if form_field.type == "number":
+                summary["total"] = answers.total
+                summary["minimum"] = answers.minimum
+                summary["maximum"] = answers.maximum
+                summary["mean"] = answers.total / answers.count if answers.count else None
+            else:
+                choices = CHECKBOX_CHOICES if form_field.type == "checkbox" else form_field.choices
+                summary["choices"] = [
+                    ChoiceStatisticsDict(
+                        id=key,
+                        label=str(label),
+                        count=rows.get((form_field.slug, key), empty).count,
+                    )
+                    for key, label in choices
+                ]
+            fields[form_field.slug] = summary
+
+        return {"submissions": rows.get(("", TOTAL_KEY), empty).count, "fields": fields}
+
+
+@dataclass
+class DeletionBatch:
+    """
+    The form pages of the submissions removed by a single deletion, identified by its origin.
+
+    Django deletes all the submissions of a batch before sending their `post_delete` signals, so
+    the bounds of a number field computed from the remaining submissions are final for the batch.
+    """
+
+    origin: Any
+    pages: dict[int, "StreamFieldFormPage | None"] = field(default_factory=dict)
+    refreshed: defaultdict[int, set[str]] = field(default_factory=lambda: defaultdict(set))
+
+    @property
+    def deletes_pages(self) -> bool:
+        """Return True if the deletion removes pages, so their statistics are deleted with them."""
+        if isinstance(self.origin, QuerySet):
+            return issubclass(self.origin.model, Page)
+        return isinstance(self.origin, Page)
+
+    def get_page(self, page_id: int) -> "StreamFieldFormPage | None":
+        """Return the form page collecting answer statistics, queried once per batch, or None."""
+        if self.deletes_pages:
+            return None
+        if page_id not in self.pages:
+            page = Page.objects.filter(pk=page_id).first()
+            page = page.specific if page is not None else None
+            collected = getattr(page, "collect_answer_statistics", False)
+            self.pages[page_id] = page if collected else None
+        return self.pages[page_id]
+
+
+deletion = local()
+
+
+def get_deletion_batch(origin: Any) -> DeletionBatch:  # noqa: ANN401
+    """Return the batch of the deletion started from the given origin, in the current thread."""
+    batch = getattr(deletion, "batch", None)
+    if batch is None or batch.origin is not origin:
+        batch = deletion.batch = DeletionBatch(origin)
+    return batch
+
+
+def remove_submission_answers(
+    instance: AbstractFormSubmission,
+    origin: Any = None,  # noqa: ANN401
+    **_kwargs,
+) -> None:
+    """Remove the answers of a form submission from the statistics when it is deleted."""
+    batch = get_deletion_batch(origin if origin is not None else instance)
+    page = batch.get_page(instance.page_id)
+    if page is not None:
+        AnswerStatistic.update_answers(
+            page.pk,
+            page.get_form_fields(),
+            instance.form_data,
+            None,
+            page.get_submissions(),
+            refreshed=batch.refreshed[page.pk],
+        )
+
+
+def sync_submission_answers(
+    page: "StreamFieldFormPage",
+    submission: AbstractFormSubmission,
+    old_form_data: dict[str, Any] | None,
+) -> None:
+    """Count the answers of a saved form submission in the statistics."""
+    page.update_answer_statistics(submission, old_form_data)
+
+
+register_side_table(sync_submission_answers, remove_submission_answers)
@@ -0,0 +1,149 @@
+"""Typed submission values, stored in a side table to filter and sort the submissions."""
+
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from django.db import models
+from django.utils.timezone import make_aware
+from django.utils.translation import gettext_lazy as _
+
+from wagtail.contrib.forms.models import AbstractFormSubmission
+from wagtail.models import Page
+
+from wagtail_form_plugins.utils import parse_temporal_value, to_float, to_utc
+
+from .form_field import StreamFieldFormField
+from .side_tables import register_side_table
+
+if TYPE_CHECKING:
+    from .models import StreamFieldFormPage
+
+TEXT_MAX_LENGTH = 255
+
+VALUE_COLUMNS = {
+    "number": "number",
+    "checkbox": "number",
+    "date": "date",
+    "datetime": "date",
+    "dropdown": "choice",
+    "radio": "choice",
+    "checkboxes": "choice",
+    "multiselect": "choice",
+}
+
+VALUE_LOOKUPS = {
+    "number": ("exact", "lt", "lte", "gt", "gte"),
+    "date": ("exact", "lt", "lte", "gt", "gte"),
+    "choice": ("exact",),
+    "text": ("exact", "lt", "lte", "gt", "gte", "icontains"),
+}
+
+FALSE_VALUES = ("", "0", "false", "no", "off")
+
+
+def get_value_column(form_field: StreamFieldFormField) -> str:
+    """Return the name of the column storing the values of a form field."""
+    return VALUE_COLUMNS.get(form_field.type, "text")
+
+
+def to_date(value: Any) -> datetime | None:  # noqa: ANN401
+    """Return a date value as an aware datetime, at midnight in the current time zone."""
+    parsed_value = parse_temporal_value(date, value)
+    return None if parsed_value is None else make_aware(datetime.combine(parsed_value, time.min))
+
+
+def to_column_values(form_field: StreamFieldFormField, value: Any) -> list[Any]:  # noqa: ANN401
+    """Return the values to store in the column of a form field, one per value row."""
+    if value is None:
+        return []
+    if form_field.type == "checkbox":
+        return [1.0 if value else 0.0]
+    if form_field.type in ["checkboxes", "multiselect"]:
+        return [key for key in value if isinstance(key, str)] if isinstance(value, list) else []
+    if form_field.type in ["dropdown", "radio"]:
+        return [value] if isinstance(value, str) and value else []
+
+    column_value = {
+        "number": to_float,
+        "date": to_date,
+        "datetime": to_utc,
+    }.get(form_field.type, lambda val: str(val)[:TEXT_MAX_LENGTH] if val != "" else None)(value)
+    return [] if column_value is None else [column_value]
+
+
+def parse_filter_value(form_field: StreamFieldFormField, value: str) -> Any:  # noqa: ANN401
+    """Return the filter value given in the query string, typed like the stored values."""
+    if form_field.type == "checkbox":
+        return 0.0 if value.lower() in FALSE_VALUES else 1.0
+    if get_value_column(form_field) == "choice":
+        return next((key for key, label in form_field.choices if value in (key, label)), None)
+
+    try:
+        column_values = to_column_values(form_field, value)
+    except ValueError:
+        return None
+    return column_values[0] if column_values else None
+
+
+class SubmissionValue(models.Model):
+    """The typed value of a field of a form submission, with a row per selected choice."""
+
+    page = models.ForeignKey(Page, on_delete=models.CASCADE)
+    submission_id = models.PositiveBigIntegerField()
+    slug = models.CharField(max_length=255)
+    number = models.FloatField(null=True)
+    date = models.DateTimeField(null=True)
+    text = models.CharField(max_length=TEXT_MAX_LENGTH, blank=True)
+    choice = models.CharField(max_length=32, blank=True)
+
+    class Meta:
+        verbose_name = _("submission value")
+        indexes: ClassVar = [
+            models.Index(fields=["page", "submission_id"]),
+            *(
+                models.Index(fields=["page", "slug", column, "submission_id"])
+                for column in ["number", "date", "text", "choice"]
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return the string representation of the submission value."""
+        return f"{self.slug} of submission {self.submission_id}"
+
+    @classmethod
+    def from_form_data(
+        cls,
+        page_id: int,
+        submission_id: int,
+        form_fields: Iterable[StreamFieldFormField],
+        form_data: Mapping[str, Any],
+    ) -> list["SubmissionValue"]:
+        """Return the value rows of a submission, given its form data."""
+        return [
+            cls(
+                page_id=page_id,
+                submission_id=submission_id,
+                slug=fld.slug,
+                **{get_value_column(fld): value},
+            )
+            for fld in form_fields
+            for value in to_column_values(fld, form_data.get(fld.slug))
+        ]
+
+
+def delete_submission_values(instance: AbstractFormSubmission, **_kwargs) -> None:
+    """Remove the values of a form submission when it is deleted."""
+    SubmissionValue.objects.filter(page_id=instance.page_id, submission_id=instance.pk).delete()
+
+
+def sync_submission_values(
+    page: "StreamFieldFormPage",
+    submission: AbstractFormSubmission,
+    _old_form_data: dict[str, Any] | None,
+) -> None:
+    """Write the values of a saved form submission."""
+    page.update_submission_values(submission)
+
+
+register_side_table(sync_submission_values, delete_submission_values)
@@ -1,20 +1,93 @@
 """View classes for the plugins."""
 
-from collections import OrderedDict
+from collections.abc import Callable, Iterator
 from datetime import datetime
+from tempfile import TemporaryFile
 from typing import Any
 
+from django.core.exceptions import PermissionDenied
+from django.db.models import F, Model, OuterRef, QuerySet, Subquery
+from django.http import FileResponse, HttpRequest, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import URLResolver, include, path, reverse
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from django.views.generic import TemplateView
+
+from wagtail.admin.views.generic.base import WagtailAdminTemplateMixin
+from wagtail.admin.widgets.button import Button
 from wagtail.contrib.forms.models import FormSubmission
+from wagtail.contrib.forms.utils import get_forms_for_user
 from wagtail.contrib.forms.views import SubmissionsListView
+from wagtail.models import Page
 
-from .dicts import SubmissionContextData
+from .columnar import PARQUET_AVAILABLE, ExportColumn, get_export_column
+from .dicts import AnswerStatisticsDict, SubmissionContextData, SubmissionContextDataHeading
+from .form_field import StreamFieldFormField
 from .models import StreamFieldFormPage
+from .pagination import KeysetPage, KeysetPaginator
+from .search import SubmissionText
+from .statistics import AnswerStatistic
+from .values import VALUE_LOOKUPS, SubmissionValue, get_value_column, parse_filter_value
+
+ColumnFormatter = Callable[[FormSubmission, Any], Any]
+ServeCallback = Callable[[Page, HttpRequest, tuple, dict], HttpResponse]
+
+
+def serve_fields_validation(serve_chain: ServeCallback) -> ServeCallback:
+    """
+    Serve the fields validation endpoint of the form pages, to register as an on_serve_page hook.
+
+    Registered after the Wagtail hooks, the page view restrictions apply to the endpoint. The
+    plugins serve methods are bypassed, so validating fields has no side effects on the form, but
+    their access checks are applied by the page.
+    """
+
+    def serve(page: Page, request: HttpRequest, args: tuple, kwargs: dict) -> HttpResponse:
+        if (
+            isinstance(page, StreamFieldFormPage)
+            and request.method == "POST"
+            and page.fields_validation_param in request.GET
+        ):
+            return page.serve_fields_validation(request)
+        return serve_chain(page, request, args, kwargs)
+
+    return serve
+
+
+class StreamedQuerySet:
+    """A queryset wrapper iterating over the results by chunks, without caching them."""
+
+    def __init__(self, queryset: QuerySet, chunk_size: int) -> None:
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+
+    @property
+    def model(self) -> type[Model]:
+        """Return the model of the wrapped queryset, used to get the export headings."""
+        return self.queryset.model
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the results using a server-side cursor when the database supports it."""
+        return self.queryset.iterator(chunk_size=self.chunk_size)
 
 
 class StreamFieldSubmissionsListView(SubmissionsListView):
     """Customize lists submissions view, such as displaying `-` when a value is set to None."""
 
     form_page: StreamFieldFormPage
+    results_template_name = "wagtail_form_plugins/list_submissions.html"
+    export_chunk_size = 2000
+    keyset_pagination = True
+    cursor_kwarg = "cursor"
+    value_filter_prefix = "value."
+
+    FORMAT_PARQUET = "parquet"
+    FORMATS = (
+        (*SubmissionsListView.FORMATS, FORMAT_PARQUET)
+        if PARQUET_AVAILABLE
+        else SubmissionsListView.FORMATS
+    )
 
     def get_header(self, context_data: SubmissionContextData) -> list[str]:
         """Return slugs of context data header entries."""
@@ -24,49 +97,393 @@ class StreamFieldSubmissionsListView(SubmissionsListView):
         """Return a dictionnary containing context data submissions."""
         return {s.pk: s for s in context_data["submissions"]}
 
+    def get_select_related(self) -> list[str]:
+        """Return the submission relations fetched with the submissions. Extended by plugins."""
+        return []
+
+    def get_prefetch_related(self) -> list[str]:
+        """Return the submission relations prefetched with the submissions. Extended by plugins."""
+        return []
+
+    def get_base_queryset(self) -> QuerySet:
+        """Return the form submissions, along with the relations used to display them."""
+        queryset = super().get_base_queryset()
+        if select_related := self.get_select_related():
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related := self.get_prefetch_related():
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    @cached_property
+    def form_page_url(self) -> str:
+        """Return the url of the form page, computed once per request."""
+        return self.form_page.url
+
+    def get_value_fields(self) -> dict[str, StreamFieldFormField]:
+        """Return the form fields that can be filtered and sorted using the submission values."""
+        if not self.form_page.index_submission_values:
+            return {}
+        return self.form_page.get_form_fields_dict()
+
+    @property
+    def is_searchable(self) -> bool:  # ty: ignore invalid-method-override
+        """Return True if the answers of the form submissions are indexed for full-text search."""
+        return self.form_page.index_submission_text
+
+    def search_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Search the submissions in the full-text index of their text answers."""
+        if not self.is_searching:
+            return queryset
+        texts = SubmissionText.search(self.form_page.pk, self.search_query)
+        return queryset.filter(pk__in=texts.values("submission_id"))
+
+    @property
+    def orderable_fields(self) -> tuple[str, ...]:  # ty: ignore invalid-method-override
+        """Return the fields allowed in the ordering, including the indexed form fields."""
+        return (*SubmissionsListView.orderable_fields, *self.get_value_fields())
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        """
+        Filter the submissions with the query string parameters such as `value.age__gt=18`.
+
+        Each filter selects the submission ids in the values table, using its indexes.
+        """
+        queryset = super().filter_queryset(queryset)
+        value_fields = self.get_value_fields()
+
+        for param, param_value in self.request.GET.items():
+            if not param.startswith(self.value_filter_prefix):
+                continue
+            slug, _sep, lookup = param.removeprefix(self.value_filter_prefix).partition("__")
+            form_field = value_fields.get(slug)
+            if form_field is None:
+                continue
+
+            column = get_value_column(form_field)
+            value = parse_filter_value(form_field, param_value)
+            if value is None or (lookup or "exact") not in VALUE_LOOKUPS[column]:
+                return queryset.none()
+
+            values = SubmissionValue.objects.filter(
+                page_id=self.form_page.pk, slug=slug, **{f"{column}__{lookup or 'exact'}": value}
+            )
+            queryset = queryset.filter(pk__in=values.values("submission_id"))
+
+        return queryset
+
+    def order_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Order the submissions, sorting the indexed form fields by their submission values."""
+        value_fields = self.get_value_fields()
+        value_ordering = [
+            order
+            for order in self.ordering
+            if order.removeprefix("-") in value_fields
+            and order.removeprefix("-") not in SubmissionsListView.orderable_fields
+        ]
+        if not value_ordering:
+            return super().order_queryset(queryset)
+
+        order_by = []
+        for order in self.ordering:
+            if order not in value_ordering:
+                order_by.append(order)
+                continue
+            slug = order.removeprefix("-")
+            column = get_value_column(value_fields[slug])
+            values = SubmissionValue.objects.filter(
+                page_id=OuterRef("page_id"), submission_id=OuterRef("pk"), slug=slug
+            )
+            annotation = f"sort_value_{len(order_by)}"
+            queryset = queryset.annotate(
+                **{annotation: Subquery(values.order_by(column).values(column)[:1])}
+            )
+            expression = F(annotation)
+            descending = order.startswith("-")
+            order_by.append(
+                expression.desc(nulls_last=True) if descending else expression.asc(nulls_last=True)
+            )
+
+        return queryset.order_by(*order_by, "-id" if self.ordering[0].startswith("-") else "id")
+
+    def get_keyset_ordering(self) -> tuple[str, ...] | None:
+        """Return the ordering used to seek the pages, or None to fall back on offsets."""
+        if not self.keyset_pagination or len(self.ordering) != 1:
+            return None
+        field_name = self.ordering[0].removeprefix("-")
+        if field_name not in SubmissionsListView.orderable_fields:
+            return None
+        prefix = "-" if self.ordering[0].startswith("-") else ""
+        return tuple(prefix + name for name in dict.fromkeys([field_name, "id"]))
+
+    def paginate_queryset(
+        self, queryset: QuerySet, page_size: int
+    ) -> tuple[KeysetPaginator, KeysetPage, list[FormSubmission], bool]:
+        """Paginate the submissions with a cursor on the ordering and id, when possible."""
+        ordering = self.get_keyset_ordering()
+        if ordering is None:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, ordering)
+        page = paginator.get_keyset_page(self.request.GET.get(self.cursor_kwarg))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
     def to_row_dict(self, item: FormSubmission) -> dict[str, Any]:
         """Convert a form submission to a dict, overrided to format cells."""
-        row_dict = super().to_row_dict(item)
+        data = item.get_data()
+        row_dict = {field: data.get(field) for field in self.list_export}
         return self.format_row_dict(item, row_dict, in_html=False)
 
+    def as_spreadsheet(self, queryset: QuerySet, spreadsheet_format: str) -> HttpResponse:
+        """Export the submissions row by row, so the memory usage doesn't grow with their amount."""
+        if isinstance(queryset, QuerySet):
+            queryset = StreamedQuerySet(queryset, self.export_chunk_size)
+        if spreadsheet_format == self.FORMAT_PARQUET:
+            return self.write_parquet_response(queryset)
+        return super().as_spreadsheet(queryset, spreadsheet_format)
+
+    def write_xlsx_response(self, queryset: QuerySet) -> FileResponse:
+        """Write the xlsx file to a temporary file instead of memory, then stream it."""
+        output = TemporaryFile()  # noqa: SIM115 (closed by the response)
+        self.write_xlsx(queryset, output)
+        output.seek(0)
+
+        return FileResponse(
+            output,
+            as_attachment=True,
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename=f"{self.get_filename()}.xlsx",
+        )
+
+    def get_export_columns(self) -> list[ExportColumn]:
+        """Return the typed columns of the columnar exports, built once per form schema."""
+        schema = self.form_page.get_form_schema()
+        fields_columns: dict[str, ExportColumn] = schema.derive(
+            "export_columns",
+            lambda: {fld.slug: get_export_column(fld.slug, fld) for fld in schema.fields},
+        )
+        return [
+            fields_columns.get(column) or get_export_column(column, None)
+            for column in self.list_export
+        ]
+
+    def write_parquet(self, queryset: QuerySet, output: Any) -> None:  # noqa: ANN401
+        """Write a parquet file from a queryset, with a row group per chunk of submissions."""
+        import pyarrow as pa  # noqa: PLC0415
+        from pyarrow import parquet  # noqa: PLC0415
+
+        columns = self.get_export_columns()
+        schema = pa.schema(
+            pa.field(
+                col.name, col.get_type(), metadata={"label": self.get_heading(queryset, col.name)}
+            )
+            for col in columns
+        )
+
+        def write_batch(batch: list[list[Any]]) -> None:
+            arrays = [col.build_array(values) for col, values in zip(columns, batch, strict=True)]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+
+        with parquet.ParquetWriter(output, schema) as writer:
+            batch: list[list[Any]] = [[] for _col in columns]
+            for item in queryset:
+                data = item.get_data()
+                for col, values in zip(columns, batch, strict=True):
+                    values.append(col.convert(data.get(col.name)))
+                if len(batch[0]) >= self.export_chunk_size:
+                    write_batch(batch)
+                    batch = [[] for _col in columns]
+            if batch[0] or not columns:
+                write_batch(batch)
+
+    def write_parquet_response(self, queryset: QuerySet) -> FileResponse:
+        """Write a parquet file to a temporary file, then stream it."""
+        output = TemporaryFile()  # noqa: SIM115 (closed by the response)
+        self.write_parquet(queryset, output)
+        output.seek(0)
+
+        return FileResponse(
+            output,
+            as_attachment=True,
+            content_type="application/vnd.apache.parquet",
+            filename=f"{self.get_filename()}.parquet",
+        )
+
+    @cached_property
+    def header_more_buttons(self) -> list[Button]:
+        """Return the header buttons, with a parquet export button if pyarrow is installed."""
+        buttons = super().header_more_buttons
+        if self.show_export_buttons and self.FORMAT_PARQUET in self.FORMATS:
+            buttons.append(
+                Button(
+                    _("Download Parquet"),
+                    url=self.get_export_url(self.FORMAT_PARQUET),
+                    icon_name="download",
+                    priority=110,
+                )
+            )
+        if self.form_page.collect_answer_statistics:
+            buttons.append(
+                Button(
+                    _("Answer statistics"),
+                    url=reverse("wagtail_form_plugins:statistics", args=[self.form_page.pk]),
+                    icon_name="table",
+                    priority=120,
+                )
+            )
+        return buttons
+
     def format_row_dict(
         self, submission: FormSubmission, row_dict: dict[str, Any], *, in_html: bool
     ) -> dict:
         """Format row cells for both csv/xslx exports and web table."""
-        fields = self.form_page.get_form_fields_dict()
+        formatters = self.get_column_formatters(tuple(row_dict), in_html=in_html)
+        for (cell_key, cell_value), formatter in zip(row_dict.items(), formatters, strict=True):
+            row_dict[cell_key] = formatter(submission, cell_value) or "-"
+        return row_dict
 
-        for cell_key, cell_value in row_dict.items():
-            if cell_key in fields:
-                fmt_value = self.form_page.format_field_value(
-                    fields[cell_key], submission.form_data.get(cell_key, None), in_html=in_html
-                )
-            elif cell_key == "submit_time" and isinstance(cell_value, datetime):
-                fmt_value = cell_value.strftime("%d/%m/%Y, %H:%M")
-            else:
-                fmt_value = cell_value
+    def get_column_formatters(
+        self, columns: tuple[str, ...], *, in_html: bool
+    ) -> tuple[ColumnFormatter, ...]:
+        """Return the formatter of each column, built once per request for the given columns."""
+        key = (columns, in_html)
+        if key not in self.column_formatters:
+            self.column_formatters[key] = tuple(
+                self.get_column_formatter(column, in_html=in_html) for column in columns
+            )
+        return self.column_formatters[key]
 
-            row_dict[cell_key] = fmt_value or "-"
-        return row_dict
+    def get_column_formatter(self, column: str, *, in_html: bool) -> ColumnFormatter:
+        """Return a function formatting the cells of a column, given the row submission."""
+        value_formatter = self.form_page.get_field_value_formatters(in_html=in_html).get(column)
+
+        if value_formatter is not None:
+            return lambda submission, _cell_value: value_formatter(
+                submission.form_data.get(column, None)
+            )
+
+        if column == "submit_time":
+            return lambda _submission, cell_value: (
+                cell_value.strftime("%d/%m/%Y, %H:%M")
+                if isinstance(cell_value, datetime)
+                else cell_value
+            )
+
+        return lambda _submission, cell_value: cell_value
+
+    @cached_property
+    def column_formatters(self) -> dict[tuple[tuple[str, ...], bool], tuple[ColumnFormatter, ...]]:
+        """Return the column formatters built during the request, indexed by columns."""
+        return {}
+
+    def is_column_hidden(self, column: str) -> bool:  # noqa: ARG002
+        """Return True if the column should not be displayed nor exported. Extended by plugins."""
+        return False
+
+    def get_added_columns(self) -> list[tuple[SubmissionContextDataHeading, ColumnFormatter]]:
+        """Return the columns added to the web table, along with their cell formatter."""
+        return []
 
     def get_context_data(self, **kwargs) -> SubmissionContextData:  # ty: ignore invalid-method-override
-        """Alter submission context data to format results."""
+        """
+        Alter submission context data to format results.
+
+        The columns declared by the plugins are removed, formatted and added in a single pass over
+        the rows.
+        """
         context_data: SubmissionContextData = super().get_context_data(**kwargs)
 
         if self.is_export:
+            self.list_export = [col for col in self.list_export if not self.is_column_hidden(col)]
             return context_data
 
         header = self.get_header(context_data)
-        submissions = self.get_submissions(context_data)
+        formatters = self.get_column_formatters(tuple(header), in_html=True)
+        kept_columns = [
+            (col_idx, formatters[col_idx])
+            for col_idx, column in enumerate(header)
+            if not self.is_column_hidden(column)
+        ]
+        added_columns = self.get_added_columns()
 
-        for row_idx, row in enumerate(context_data["data_rows"]):
-            submission = submissions[row["model_id"]]
-            row_items = [
-                (header[col_idx], context_data["data_rows"][row_idx]["fields"][col_idx])
-                for col_idx, col_value in enumerate(row["fields"])
-            ]
-            row_dict = self.format_row_dict(submission, OrderedDict(row_items), in_html=True)
+        context_data["data_headings"] = [
+            context_data["data_headings"][col_idx] for col_idx, _formatter in kept_columns
+        ] + [heading for heading, _formatter in added_columns]
 
-            for cell_idx, cell_value in enumerate(row_dict.values()):
-                context_data["data_rows"][row_idx]["fields"][cell_idx] = cell_value
+        submissions = self.get_submissions(context_data)
+        for row in context_data["data_rows"]:
+            submission = submissions[row["model_id"]]
+            cells = row["fields"]
+            row["fields"] = [
+                formatter(submission, cells[col_idx]) or "-" for col_idx, formatter in kept_columns
+            ] + [formatter(submission, None) for _heading, formatter in added_columns]
 
         return context_data
+
+
+class AnswerStatisticsView(WagtailAdminTemplateMixin, TemplateView):
+    """Display the answer statistics of a form page, read from its counters, not its submissions."""
+
+    template_name = "wagtail_form_plugins/answer_statistics.html"
+    page_title = _("Answer statistics")
+    header_icon = "form"
+    form_page: StreamFieldFormPage
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Check permissions and set the form page."""
+        forms = get_forms_for_user(request.user).filter(pk=kwargs["page_id"])
+        form_page = get_object_or_404(forms).specific
+        if not isinstance(form_page, StreamFieldFormPage) or not self.is_enabled(form_page):
+            raise PermissionDenied
+        self.form_page = form_page
+        return super().dispatch(request, *args, **kwargs)
+
+    def is_enabled(self, form_page: StreamFieldFormPage) -> bool:
+        """Return True if the form page collects the data served by the view."""
+        return form_page.collect_answer_statistics
+
+    def get_page_subtitle(self) -> str:
+        """Return the title of the form page."""
+        return self.form_page.title
+
+    def get_statistics(self) -> AnswerStatisticsDict:
+        """Return the answer statistics of the form page."""
+        return AnswerStatistic.get_summary(self.form_page.pk, self.form_page.get_form_fields())
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        """Add the form page and its statistics to the context."""
+        return {
+            **super().get_context_data(**kwargs),
+            "form_page": self.form_page,
+            "statistics": self.get_statistics(),
+            "json_url": reverse("wagtail_form_plugins:statistics_json", args=[self.form_page.pk]),
+        }
+
+
+class AnswerStatisticsJsonView(AnswerStatisticsView):
+    """Serve the answer statistics of a form page as JSON."""
+
+    def get(self, _request: HttpRequest, *_args, **_kwargs) -> JsonResponse:
+        """Return the answer statistics of the form page."""
+        return JsonResponse(self.get_statistics())
+
+
+class AnswerAnalyticsJsonView(AnswerStatisticsView):
+    """Serve the percentiles, histograms and series of the number and temporal answers as JSON."""
+
+    def is_enabled(self, _form_page: StreamFieldFormPage) -> bool:
+        """Return True, since the analytics are computed from the submissions."""
+        return True
+
+    def get(self, _request: HttpRequest, *_args, **_kwargs) -> JsonResponse:
+        """Return the analytics of the form page."""
+        return JsonResponse(self.form_page.get_analytics().get_results())
+
+
+def register_statistics_urls() -> list[URLResolver]:
+    """Return the statistics views url patterns, to register as a register_admin_urls hook."""
+    urls = [
+        path("<int:page_id>/", AnswerStatisticsView.as_view(), name="statistics"),
+        path("<int:page_id>/json/", AnswerStatisticsJsonView.as_view(), name="statistics_json"),
+        path("<int:page_id>/analytics/", AnswerAnalyticsJsonView.as_view(), name="analytics_json"),
+    ]
+    return [path("form-statistics/", include((urls, "wagtail_form_plugins")))]
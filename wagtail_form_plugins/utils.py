@@ -2,15 +2,24 @@
 
 import logging
 import re
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext, suppress
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
 from html import unescape
+from threading import BoundedSemaphore, Lock
+from time import monotonic
 from typing import Any
 from urllib.parse import quote
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.core.mail import EmailAlternative, EmailMultiAlternatives
+from django.core.mail import EmailAlternative, EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
 from django.utils.html import format_html, format_html_join, strip_tags
 from django.utils.safestring import SafeString
+from django.utils.timezone import is_naive, make_aware
 from django.utils.translation import gettext_lazy as _
 
 from wagtail.contrib.forms.utils import get_field_clean_name
@@ -28,36 +37,94 @@ def get_logger(file_name: str) -> logging.Logger:
 LOGGER = get_logger(__file__)
 
 
-url_regex = (
-    r"(https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}"
-    r"\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*))"
-)
-email_regex = r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
-pattern = re.compile(rf"(?P<url>{url_regex})|(?P<email>{email_regex})")
+# The linkifier scans the text once: anchors are searched with a constant-size pattern, then links
+# are extended over runs of allowed characters, so each character is read a bounded number of times.
+LINK_ANCHOR_REGEX = re.compile(r"https?://|@")
+URL_HOST_CHARS_REGEX = re.compile(r"[-a-zA-Z0-9@:%_+.~=]{0,256}")
+URL_CHARS_REGEX = re.compile(r"[-a-zA-Z0-9()@:%_+.~#?&/=]*")
+EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+EMAIL_DOMAIN_CHARS_REGEX = re.compile(r"[a-zA-Z0-9.-]*")
+URL_TRAILING_CHARS = ".,:;!?"
+EMAIL_MAX_LOCAL_LENGTH = 64
+
+
+def get_linkify_max_length() -> int:
+    """Return the maximum length of a text to linkify, longer texts are left as is."""
+    return getattr(settings, "FORMS_LINKIFY_MAX_LENGTH", 100_000)
+
+
+def find_url_end(text: str, start: int) -> int:
+    """Return the end index of the url starting at the given index, or -1 if it is not valid."""
+    host_start = text.index("//", start) + 2
+    host_end = URL_HOST_CHARS_REGEX.match(text, host_start).end()  # ty: ignore possibly-missing-attribute
+    host = text[host_start:host_end].rstrip(URL_TRAILING_CHARS)
+    domain, _, tld = host.rsplit("@", 1)[-1].split(":", 1)[0].rpartition(".")
+
+    if not domain or not 0 < len(tld) <= 6 or not tld.isalnum():  # noqa: PLR2004
+        return -1
+
+    # the host is valid, so the path is scanned only once
+    end = URL_CHARS_REGEX.match(text, host_end).end()  # ty: ignore possibly-missing-attribute
+    min_end = host_start + len(host)
+    while end > min_end and text[end - 1] in URL_TRAILING_CHARS:
+        end -= 1
+    # keep the closing parentheses that are part of the url, such as in wikipedia links
+    unbalanced = text.count(")", start, end) - text.count("(", start, end)
+    while unbalanced > 0 and end > min_end and text[end - 1] == ")":
+        end -= 1
+        unbalanced -= 1
+    return end
+
+
+def find_email_bounds(text: str, at_index: int, min_start: int) -> tuple[int, int] | None:
+    """Return the bounds of the email address around the given `@`, or None if it is not valid."""
+    start = at_index
+    lower_bound = max(min_start, at_index - EMAIL_MAX_LOCAL_LENGTH)
+    while start > lower_bound and text[start - 1] in EMAIL_LOCAL_CHARS:
+        start -= 1
+
+    end = EMAIL_DOMAIN_CHARS_REGEX.match(text, at_index + 1).end()  # ty: ignore possibly-missing-attribute
+    domain = text[at_index + 1 : end].rstrip(".-")
+    _, dot, tld = domain.rpartition(".")
+
+    if start == at_index or not dot or len(tld) < 2 or not tld.isalpha():  # noqa: PLR2004
+        return None
+    return start, at_index + 1 + len(domain)
 
 
 def create_links(html_message: str) -> SafeString:
-    """Detect and convert urls into html links."""
+    """Detect and convert urls and email addresses into html links, in linear time."""
+    if len(html_message) > get_linkify_max_length() or (
+        "@" not in html_message and "http" not in html_message
+    ):
+        return format_html("{}", unescape(html_message))
+
     parts = []
     last_end = 0
+    position = 0
 
-    for match in pattern.finditer(html_message):
-        start, end = match.span()
+    while match := LINK_ANCHOR_REGEX.search(html_message, position):
+        start = match.start()
+        position = start + 1
+
+        if match.group() == "@":
+            bounds = find_email_bounds(html_message, start, last_end)
+            if bounds is None:
+                continue
+            start, end = bounds
+            mail = unescape(html_message[start:end])
+            link = format_html('<a href="mailto:{mail}">{mail}</a>', mail=mail)
+        else:
+            end = find_url_end(html_message, start)
+            if end == -1:
+                continue
+            url = unescape(html_message[start:end])
+            link = format_html('<a href="{url}">{link}</a>', url=quote(url, safe="/:?&#"), link=url)
 
         if start > last_end:
             parts.append(unescape(html_message[last_end:start]))
-
-        if match.group("url"):
-            url = unescape(match.group("url"))
-            parts.append(
-                format_html('<a href="{url}">{link}</a>', url=quote(url, safe="/:?&#"), link=url),
-            )
-
-        elif match.group("email"):
-            mail = unescape(match.group("email"))
-            parts.append(format_html('<a href="mailto:{mail}">{mail}</a>', mail=mail))
-
-        last_end = end
+        parts.append(link)
+        last_end = position = end
 
     if last_end < len(html_message):
         parts.append(unescape(html_message[last_end:]))
@@ -79,6 +146,36 @@ def format_list(items: Sequence[str | SafeString], bullet: str, *, in_html: bool
     return "".join([f"\n{bullet} {c}" for c in items])
 
 
+def parse_temporal_value(
+    value_type: type[date | time | datetime],
+    value: Any,  # noqa: ANN401
+) -> date | time | datetime | None:
+    """Return the value as a date, time or datetime, parsing it if serialized, or None."""
+    if isinstance(value, str):
+        value = value_type.fromisoformat(value.replace("Z", "+00:00"))
+    return value if isinstance(value, value_type) else None
+
+
+def to_float(value: Any) -> float | None:  # noqa: ANN401
+    """Return the value as a float, such as a serialized number field value, or None."""
+    if isinstance(value, bool) or value is None or value == "":
+        return None
+    try:
+        return float(value if isinstance(value, int | float | Decimal) else str(value))
+    except ValueError:
+        return None
+
+
+def to_utc(value: Any) -> datetime | None:  # noqa: ANN401
+    """Return the value as an UTC datetime, considering naive values in the current time zone."""
+    parsed_value = parse_temporal_value(datetime, value)
+    if parsed_value is None:
+        return None
+    if is_naive(parsed_value):
+        parsed_value = make_aware(parsed_value)
+    return parsed_value.astimezone(timezone.utc)
+
+
 def validate_slug(slug: str) -> None:
     """Validate a slug."""
     if slug != get_field_clean_name(slug):
@@ -93,7 +190,9 @@ def build_email(  # noqa:  PLR0913
     from_email: str,
     recipient_list: str | list[str],
     reply_to: str | list[str] | None,
+    *,
     html_message: str | None = None,
+    text_message: str | None = None,
 ) -> EmailMultiAlternatives:
     """Build an email as a EmailMultiAlternatives object."""
     if isinstance(recipient_list, str):
@@ -104,7 +203,7 @@ def build_email(  # noqa:  PLR0913
     html_message = html_message or message
     return EmailMultiAlternatives(
         subject=subject,
-        body=strip_tags(message.replace("</p>", "\n")),
+        body=strip_tags(message.replace("</p>", "\n")) if text_message is None else text_message,
         from_email=from_email,
         to=recipient_list,
         alternatives=[EmailAlternative(html_message, "text/html")],
@@ -112,6 +211,100 @@ def build_email(  # noqa:  PLR0913
     )
 
 
+class EmailConnectionProvider:
+    """Provide connections to the email backend, opening a new connection for each batch."""
+
+    # whether the emails are stored in the database, and should be saved with the submission
+    transactional = False
+
+    def __init__(self, **backend_kwargs) -> None:
+        self.backend_kwargs = backend_kwargs
+
+    def open_connection(self) -> BaseEmailBackend:
+        """Open a new connection to the email backend."""
+        connection = get_connection(**self.backend_kwargs)
+        connection.open()
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[BaseEmailBackend]:
+        """Yield an open connection to the email backend, closed afterwards."""
+        connection = self.open_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def atomic(self) -> AbstractContextManager:
+        """Return a context wrapping in a transaction the saving of data related to the emails."""
+        return transaction.atomic() if self.transactional else nullcontext()
+
+    def send_messages(self, emails: Sequence[EmailMessage]) -> int:
+        """Send the emails through a single connection and return the amount of sent emails."""
+        if not emails:
+            return 0
+
+        with self.connection() as connection:
+            return connection.send_messages(list(emails)) or 0
+
+
+class PooledEmailConnectionProvider(EmailConnectionProvider):
+    """
+    Provide connections to the email backend, kept open between batches.
+
+    Used by long-lived processes such as workers: idle connections are reused until they exceed
+    the maximum idle time, and a connection that failed is discarded.
+    """
+
+    def __init__(self, max_connections: int = 1, max_idle_time: float = 30, **backend_kwargs):
+        super().__init__(**backend_kwargs)
+        self.max_idle_time = max_idle_time
+        self.slots = BoundedSemaphore(max_connections)
+        self.lock = Lock()
+        self.idle_connections: list[tuple[BaseEmailBackend, float]] = []
+
+    def acquire(self) -> BaseEmailBackend:
+        """Return the most recently used idle connection if still fresh, or open a new one."""
+        with self.lock:
+            while self.idle_connections:
+                connection, last_used = self.idle_connections.pop()
+                if monotonic() - last_used <= self.max_idle_time:
+                    return connection
+                self.discard(connection)
+        return self.open_connection()
+
+    def release(self, connection: BaseEmailBackend) -> None:
+        """Put back the connection in the pool."""
+        with self.lock:
+            self.idle_connections.append((connection, monotonic()))
+
+    def discard(self, connection: BaseEmailBackend) -> None:
+        """Close the connection, ignoring errors since it may already be broken."""
+        with suppress(Exception):
+            connection.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[BaseEmailBackend]:
+        """Yield a pooled connection to the email backend."""
+        with self.slots:
+            connection = self.acquire()
+            try:
+                yield connection
+            except Exception:
+                self.discard(connection)
+                raise
+            self.release(connection)
+
+    def close(self) -> None:
+        """Close all the idle connections."""
+        with self.lock:
+            while self.idle_connections:
+                self.discard(self.idle_connections.pop()[0])
+
+
+default_email_connection_provider = EmailConnectionProvider()
+
+
 def print_email(email: EmailMultiAlternatives) -> None:
     """Print an email to the logger - useful for developping."""
     LOGGER.info("=== sending e-mail ===")